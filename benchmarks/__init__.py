@@ -0,0 +1 @@
+# Benchmark tools for the sales pipeline
\ No newline at end of file
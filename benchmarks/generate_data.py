@@ -0,0 +1,122 @@
+# benchmarks/generate_data.py
+import os
+import random
+import argparse
+
+# ==========================================
+# Synthetic Sales Data Generator
+# ==========================================
+
+HEADER = "TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region"
+
+# Product ID -> (name, typical unit price), modelled on data/sales_data.txt
+PRODUCTS = {
+    'P101': ('Laptop', 45000),
+    'P102': ('Mouse', 500),
+    'P103': ('Keyboard,Mechanical', 2500),
+    'P104': ('Monitor', 18000),
+    'P105': ('Webcam', 3500),
+    'P106': ('Headphones', 2800),
+    'P107': ('USB Cable', 250),
+    'P108': ('External Hard Drive,1TB', 3500),
+    'P109': ('Wireless Mouse', 700),
+    'P110': ('Laptop Charger', 1900),
+}
+
+REGIONS = ['North', 'South', 'East', 'West']
+
+def _format_price(price, rng):
+    """Plain integer, or with a thousands comma ("1,916") like the sample file."""
+    if price >= 1000 and rng.random() < 0.3:
+        return f"{price:,}"
+    return str(price)
+
+def _dirty(fields, rng):
+    """Applies one of the defects seen in the sample data."""
+    kind = rng.randrange(6)
+    if kind == 0:
+        fields[4] = '0' # zero quantity
+    elif kind == 1:
+        fields[0] = 'X' + fields[0][1:] # bad TransactionID prefix
+    elif kind == 2:
+        fields[2] = 'Q' + fields[2][1:] # bad ProductID prefix
+    elif kind == 3:
+        fields[6] = 'X' + fields[6][1:] # bad CustomerID prefix
+    elif kind == 4:
+        del fields[rng.randrange(len(fields))] # too few fields
+    else:
+        fields.append('extra') # too many fields
+    return fields
+
+def iter_sales_rows(n_rows, seed=42, dirty_rate=0.1, n_customers=1000, days=31):
+    """Yields n_rows deterministic pipe-delimited rows (no header)."""
+    rng = random.Random(seed)
+    product_ids = list(PRODUCTS)
+
+    for i in range(n_rows):
+        product_id = rng.choice(product_ids)
+        name, base_price = PRODUCTS[product_id]
+        price = max(1, int(base_price * rng.uniform(0.7, 1.3)))
+
+        fields = [
+            f"T{i + 1:03d}",
+            f"2024-12-{rng.randrange(days) + 1:02d}",
+            product_id,
+            name,
+            str(rng.randint(1, 10)),
+            _format_price(price, rng),
+            f"C{rng.randrange(n_customers) + 1:03d}",
+            rng.choice(REGIONS)
+        ]
+        if rng.random() < dirty_rate:
+            fields = _dirty(fields, rng)
+
+        yield '|'.join(fields)
+
+def generate_sales_file(filename, n_rows, seed=42, dirty_rate=0.1, n_customers=1000, chunk_rows=100000):
+    """
+    Writes an N-row sales file in the exact data/sales_data.txt format
+    (header, pipe-delimited, CRLF line endings), streaming in chunks so
+    very large files do not need to fit in memory.
+    """
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        f.write(HEADER)
+        chunk = []
+        for row in iter_sales_rows(n_rows, seed, dirty_rate, n_customers):
+            chunk.append(row)
+            if len(chunk) >= chunk_rows:
+                f.write('\r\n' + '\r\n'.join(chunk))
+                chunk = []
+        if chunk:
+            f.write('\r\n' + '\r\n'.join(chunk))
+
+    return filename
+
+def generate_catalog(n_products=100, seed=42):
+    """Mock DummyJSON product list (ids from 101) for create_product_mapping."""
+    rng = random.Random(seed)
+    categories = ['laptops', 'accessories', 'mobile-accessories', 'tablets']
+    return [
+        {
+            'id': 101 + i,
+            'title': f"Product {101 + i}",
+            'category': rng.choice(categories),
+            'brand': f"Brand{rng.randrange(20)}",
+            'rating': round(rng.uniform(1, 5), 2)
+        }
+        for i in range(n_products)
+    ]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic sales data file")
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--out', default='data/synthetic_sales_data.txt')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--dirty-rate', type=float, default=0.1)
+    parser.add_argument('--customers', type=int, default=1000)
+    args = parser.parse_args()
+
+    generate_sales_file(args.out, args.rows, args.seed, args.dirty_rate, args.customers)
+    print(f"Wrote {args.rows} rows to {args.out}")
@@ -0,0 +1,144 @@
+# benchmarks/run_benchmarks.py
+import io
+import os
+import gc
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+
+from benchmarks.generate_data import generate_sales_file, generate_catalog
+from utils.file_handler import read_sales_data, parse_transactions, validate_and_filter
+from utils import data_processor
+from utils.api_handler import create_product_mapping, enrich_sales_data, save_enriched_data
+
+# ==========================================
+# Pipeline Benchmark Harness
+# ==========================================
+
+def _measure(func, memory):
+    """
+    Runs func once for wall time and, if memory is set, once more under
+    tracemalloc for peak allocated bytes. stdout from the pipeline is muted.
+    Returns: (result, seconds, peak_bytes or None)
+    """
+    gc.collect()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        del result
+        gc.collect()
+        tracemalloc.start()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return result, seconds, peak
+
+def benchmark_size(n_rows, work_dir, seed=42, memory=True):
+    """Benchmarks every pipeline stage on a generated file of n_rows."""
+    data_file = os.path.join(work_dir, f"sales_{n_rows}.txt")
+    generate_sales_file(data_file, n_rows, seed=seed)
+    mapping = create_product_mapping(generate_catalog())
+    results = []
+
+    def record(stage, func, rows_in):
+        result, seconds, peak = _measure(func, memory)
+        results.append({
+            'rows': n_rows,
+            'stage': stage,
+            'rows_in': rows_in,
+            'seconds': round(seconds, 6),
+            'rows_per_sec': round(rows_in / seconds, 1) if seconds > 0 else None,
+            'peak_bytes': peak
+        })
+        print(f"  {stage:<28} {seconds:>10.4f}s" + (f"  peak {peak / 1e6:,.1f} MB" if peak is not None else ""))
+        return result
+
+    print(f"\n{n_rows:,} rows")
+    raw = record('read_sales_data', lambda: read_sales_data(data_file), n_rows)
+    parsed = record('parse_transactions', lambda: parse_transactions(raw), len(raw))
+    valid = record('validate_and_filter', lambda: validate_and_filter(parsed)[0], len(parsed))
+
+    for name in ['calculate_total_revenue', 'region_wise_sales', 'top_selling_products',
+                 'customer_analysis', 'daily_sales_trend', 'find_peak_sales_day',
+                 'low_performing_products']:
+        func = getattr(data_processor, name)
+        record(name, lambda func=func: func(valid), len(valid))
+
+    record('SalesAggregator (all)', lambda: data_processor.build_aggregates(valid), len(valid))
+    enriched = record('enrich_sales_data', lambda: enrich_sales_data(valid, mapping), len(valid))
+
+    out_file = os.path.join(work_dir, f"enriched_{n_rows}.txt")
+    record('save_enriched_data', lambda: save_enriched_data(enriched, out_file), len(enriched))
+
+    return results
+
+def load_baseline(baseline_path):
+    """Reads an earlier results JSON. Returns: dict keyed by (rows, stage)."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        return {(r['rows'], r['stage']): r for r in json.load(f)['results']}
+
+def compare(results, baseline, threshold=1.2):
+    """
+    Prints stages that got slower than threshold x the baseline run
+    (a load_baseline dict). Returns: regression count.
+    """
+    regressions = 0
+    for r in results:
+        old = baseline.get((r['rows'], r['stage']))
+        if not old or not old['seconds']:
+            continue
+        ratio = r['seconds'] / old['seconds']
+        if ratio > threshold:
+            regressions += 1
+            print(f"REGRESSION {r['stage']} @ {r['rows']:,} rows: {old['seconds']:.4f}s -> {r['seconds']:.4f}s ({ratio:.2f}x)")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sales analytics pipeline")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000],
+                        help="Dataset sizes (e.g. 10000 100000 1000000)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="Earlier results JSON to check for regressions")
+    parser.add_argument('--threshold', type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    # Read the baseline before anything is written: --output may name the same file
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for n_rows in args.rows:
+            results.extend(benchmark_size(n_rows, work_dir, args.seed, not args.no_memory))
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'seed': args.seed
+        },
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if baseline is not None:
+        return 1 if compare(results, baseline, args.threshold) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
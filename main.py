@@ -1,34 +1,107 @@
 #!/usr/bin/env python3
 import sys
-from utils.file_handler import read_sales_data, parse_transactions, validate_and_filter
-from utils.data_processor import calculate_total_revenue
-from utils.api_handler import fetch_all_products, create_product_mapping, enrich_sales_data, save_enriched_data
+import argparse
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from utils.file_handler import (
+    read_sales_data, iter_transactions, validate_and_filter,
+    new_filter_options, track_filter_options
+)
+from utils.batch_runner import (
+    load_variants, normalize_variant, run_filter_variants, unique_variant_names, write_variant_reports
+)
+from utils.data_processor import SalesAggregator
+from utils.api_handler import ProductLookup, collect_product_ids, enrich_sales_data_shared
+from utils.enriched_io import save_enriched_data_bulk
+from utils.catalog_cache import fetch_catalog_cached
 from utils.report_generator import generate_sales_report
+from utils.instrumentation import PipelineMetrics, set_active_metrics
+from utils.pipeline import run_pipeline
+from utils.rollup_cube import RollupCube, build_cube
+from utils.shards import is_sharded_input, iter_input_lines, iter_sharded_lines
+
+# Per-row functions timed by PipelineMetrics.instrument when --profile is on
+HOT_FUNCTIONS = (
+    'utils.file_handler.parse_line',
+    'utils.file_handler.is_valid_transaction',
+    'utils.api_handler.product_enrichment',
+    'utils.enriched_io.format_enriched_line',
+)
+
+class DeferredLog:
+    """
+    Message sink for background work started before the prompts: messages
+    are held until flush(), then printed in order; later ones print directly.
+    """
+
+    def __init__(self):
+        self.messages = []
+        self.flushed = False
+        self.lock = threading.Lock()
+
+    def __call__(self, message):
+        with self.lock:
+            if not self.flushed:
+                self.messages.append(message)
+                return
+        print(message)
+
+    def flush(self):
+        with self.lock:
+            messages, self.messages, self.flushed = self.messages, [], True
+        for message in messages:
+            print(message)
+
+def main(input_file='data/sales_data.txt', metrics=None, report_formats=('txt',), cube_file=None,
+         on_demand=False, exact=False):
+    # Stage timings are always collected; exporting them is up to the caller
+    metrics = metrics or PipelineMetrics()
+    set_active_metrics(metrics)
 
-def main():
     print("=" * 40)
     print(f"{'SALES ANALYTICS SYSTEM':^40}")
     print("=" * 40 + "\n")
 
+    # Start the catalog fetch now so the network wait overlaps reading and parsing.
+    # In on-demand mode only the products the data references are looked up, after parsing.
+    # Its messages are held back so they do not land in the middle of the filter prompts.
+    fetcher = ThreadPoolExecutor(max_workers=1)
+    catalog_log = DeferredLog()
+    catalog_future = None if on_demand else fetcher.submit(fetch_catalog_cached, log=catalog_log)
+    product_ids = set() if on_demand else None
+
     try:
         # [1/10] Reading sales data
         print("[1/10] Reading sales data...")
-        raw_data = read_sales_data('sales_data.txt')
+        with metrics.stage('read') as stage:
+            if is_sharded_input(input_file):
+                # Directory / glob / compressed shards, decompressed concurrently in memory
+                raw_data = list(iter_sharded_lines(input_file))
+            else:
+                raw_data = read_sales_data(input_file)
+            stage['rows_out'] = len(raw_data)
         print(f"✓ Successfully read {len(raw_data)} transactions\n")
 
         # [2/10] Parsing and cleaning data
         print("[2/10] Parsing and cleaning data...")
-        parsed_data = parse_transactions(raw_data)
+        # Region set and amount range are recorded while parsing; compact records keep memory down
+        filter_options = new_filter_options()
+        with metrics.stage('parse', rows_in=len(raw_data)) as stage:
+            parsed = iter_transactions(raw_data, compact=True)
+            if on_demand:
+                parsed = collect_product_ids(parsed, product_ids)
+            parsed_data = list(track_filter_options(parsed, filter_options))
+            stage['rows_out'] = len(parsed_data)
         print(f"✓ Parsed {len(parsed_data)} records\n")
 
         # [3/10] Filter Options Available
         print("[3/10] Filter Options Available:")
         
-        # Calculate available options dynamically
-        regions = sorted(list(set(t['Region'] for t in parsed_data if t.get('Region'))))
-        amounts = [t['Quantity'] * t['UnitPrice'] for t in parsed_data]
-        min_amt = min(amounts) if amounts else 0
-        max_amt = max(amounts) if amounts else 0
+        # Options were collected during parsing
+        regions = sorted(filter_options['regions'])
+        min_amt = filter_options['min_amount'] or 0
+        max_amt = filter_options['max_amount'] or 0
         
         print(f"   Regions: {', '.join(regions)}")
         print(f"   Amount Range: ₹{min_amt:,.0f} - ₹{max_amt:,.0f}\n")
@@ -67,37 +140,52 @@ def main():
 
         # [4/10] Validating transactions
         print("[4/10] Validating transactions...")
-        valid_data, invalid_count, summary = validate_and_filter(
-            parsed_data, 
-            region=selected_region, 
-            min_amount=min_val, 
-            max_amount=max_val
-        )
+        with metrics.stage('validate', rows_in=len(parsed_data)) as stage:
+            valid_data, invalid_count, summary = validate_and_filter(
+                parsed_data, 
+                region=selected_region, 
+                min_amount=min_val, 
+                max_amount=max_val,
+                filter_options=filter_options,
+                exact=exact
+            )
+            stage['rows_out'] = len(valid_data)
         print(f"✓ Valid: {len(valid_data)} | Invalid/Filtered Out: {len(parsed_data) - len(valid_data)}\n")
 
         if not valid_data:
             print("Error: No valid data found after filtering. Exiting.")
-            sys.exit()
+            return 1
 
         # [5/10] Analyzing sales data
         print("[5/10] Analyzing sales data...")
-        # (The actual deep analysis happens inside the report generator, 
-        # but we can do a quick check here to simulate the step)
-        total_rev = calculate_total_revenue(valid_data)
+        # One pass builds every summary; the report generator reuses it
+        with metrics.stage('analyze', rows_in=len(valid_data)):
+            aggregator = SalesAggregator(exact).consume(valid_data)
+            total_rev = aggregator.calculate_total_revenue()
         print(f"✓ Analysis complete (Current Revenue: ₹{total_rev:,.2f})\n")
 
         # [6/10] Fetching product data from API
         print("[6/10] Fetching product data from API...")
-        api_products = fetch_all_products()
-        if api_products:
-            print(f"✓ Fetched {len(api_products)} products\n")
+        # Served from the on-disk catalog cache when it is fresh; started at startup
+        with metrics.stage('fetch_catalog') as stage:
+            if on_demand:
+                with ProductLookup() as lookup:
+                    mapping = lookup.resolve(product_ids)
+            else:
+                catalog = catalog_future.result()
+                catalog_log.flush()
+                mapping = catalog['mapping'] if catalog else {}
+            stage['rows_out'] = len(mapping)
+        if mapping:
+            print(f"✓ Fetched {len(mapping)} products\n")
         else:
             print("! Warning: API fetch failed. Proceeding without enrichment.\n")
 
         # [7/10] Enriching sales data
         print("[7/10] Enriching sales data...")
-        mapping = create_product_mapping(api_products)
-        enriched_data = enrich_sales_data(valid_data, mapping)
+        with metrics.stage('enrich', rows_in=len(valid_data)) as stage:
+            enriched_data = enrich_sales_data_shared(valid_data, mapping)
+            stage['rows_out'] = len(enriched_data)
         
         match_count = sum(1 for t in enriched_data if t.get('API_Match'))
         match_pct = (match_count / len(enriched_data) * 100) if enriched_data else 0
@@ -105,24 +193,180 @@ def main():
 
         # [8/10] Saving enriched data
         print("[8/10] Saving enriched data...")
-        save_enriched_data(enriched_data, 'data/enriched_sales_data.txt')
+        with metrics.stage('save', rows_in=len(enriched_data)):
+            save_enriched_data_bulk(enriched_data, 'data/enriched_sales_data.txt')
         print("✓ Saved to: data/enriched_sales_data.txt\n")
 
+        if cube_file:
+            with metrics.stage('cube', rows_in=len(enriched_data)) as stage:
+                cube = build_cube(enriched_data, include_category=True)
+                cube.save(cube_file)
+                stage['rows_out'] = len(cube.cells)
+            print(f"✓ Rollup cube ({len(cube.cells)} cells) saved to: {cube_file}\n")
+
         # [9/10] Generating report
         print("[9/10] Generating report...")
-        generate_sales_report(valid_data, enriched_data, 'output/sales_report.txt')
-        print("✓ Report saved to: output/sales_report.txt\n")
+        with metrics.stage('report', rows_in=len(enriched_data)):
+            report_files = generate_sales_report(valid_data, enriched_data, 'output/sales_report.txt',
+                                                 formats=report_formats, aggregator=aggregator)
+        print(f"✓ Report saved to: {', '.join(report_files)}\n")
 
         # [10/10] Process Complete
         print("[10/10] Process Complete!")
+        for s in metrics.stages:
+            print(f"   {s['stage']:<14} {s['wall_seconds']:>9.3f}s")
         print("=" * 40)
+        return 0
 
     except Exception as e:
+        failed = [s['stage'] for s in metrics.stages if s['status'] != 'ok']
         print("\n!!! CRITICAL SYSTEM ERROR !!!")
-        print(f"An unexpected error occurred: {e}")
+        if failed:
+            print(f"Stage '{failed[-1]}' failed.")
+        print(f"An unexpected error occurred: {type(e).__name__}: {e}")
         print("Please check your data files and try again.")
         print("=" * 40)
+        return 1
+    finally:
+        catalog_log.flush()
+        fetcher.shutdown(wait=False)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sales Analytics System")
+    parser.add_argument('--batch', action='store_true',
+                        help="Run headless: no prompts, write JSON reports per filter variant")
+    parser.add_argument('--input', default='data/sales_data.txt',
+                        help="Sales data file, directory or glob of shards (.txt/.gz/.bz2/.zst)")
+    parser.add_argument('--region', help="Region filter (single variant)")
+    parser.add_argument('--min-amount', type=float, help="Minimum transaction amount (single variant)")
+    parser.add_argument('--max-amount', type=float, help="Maximum transaction amount (single variant)")
+    parser.add_argument('--config', help="JSON file with a list of filter variants")
+    parser.add_argument('--serve', action='store_true',
+                        help="Run as a local HTTP/JSON service that keeps the data in memory")
+    parser.add_argument('--host', default='127.0.0.1', help="Service bind address (with --serve)")
+    parser.add_argument('--port', type=int, default=8050, help="Service port (with --serve)")
+    parser.add_argument('--pipelined', action='store_true',
+                        help="Run without prompts, overlapping catalog fetch, parsing, enrichment and writing")
+    parser.add_argument('--output-dir', default='output/batch', help="Where batch reports are written")
+    parser.add_argument('--report-formats', default='txt',
+                        help="Comma-separated report formats: txt, json, csv (default: txt)")
+    parser.add_argument('--on-demand-catalog', action='store_true',
+                        help="Look up only the products the data references instead of loading the whole catalog")
+    parser.add_argument('--exact-money', action='store_true',
+                        help="Filter and aggregate amounts in integer paise (order-independent, exact sums)")
+    parser.add_argument('--cube-file', help="Build a date x region x product x category rollup cube and save it here")
+    parser.add_argument('--metrics-json', help="Write a JSON run summary (per-stage timings, rows, memory, API calls)")
+    parser.add_argument('--metrics-prom', help="Write Prometheus textfile-collector metrics to this path")
+    parser.add_argument('--profile', action='store_true',
+                        help="Capture cProfile stats per stage and per-call timings of the hot row functions")
+    parser.add_argument('--trace-memory', action='store_true', help="Capture tracemalloc peak per stage")
+    return parser.parse_args(argv)
+
+def report_formats(args):
+    return tuple(f.strip().lower() for f in args.report_formats.split(',') if f.strip())
+
+def export_metrics(metrics, args):
+    if args.metrics_json:
+        metrics.write_json(args.metrics_json)
+        print(f"Run summary written to {args.metrics_json}")
+    if args.metrics_prom:
+        metrics.write_prometheus(args.metrics_prom)
+
+def run_batch(args, metrics=None):
+    """Headless mode: one pass over the data serves every filter variant."""
+    metrics = metrics or PipelineMetrics(run_name='sales_batch')
+    set_active_metrics(metrics)
+
+    if args.config:
+        try:
+            variants = load_variants(args.config)
+        except (OSError, ValueError) as e: # json.JSONDecodeError is a ValueError
+            print(f"Error: Could not load config '{args.config}': {e}")
+            return 1
+    else:
+        variants = unique_variant_names([normalize_variant({
+            'region': args.region,
+            'min_amount': args.min_amount,
+            'max_amount': args.max_amount
+        })])
+
+    if not variants:
+        print("Error: No filter variants to run.")
+        return 1
+
+    print(f"Running {len(variants)} filter variant(s) over {args.input}")
+
+    # Stream the file once; filter options are gathered on the way through
+    filter_options = new_filter_options()
+    transactions = track_filter_options(iter_transactions(iter_input_lines(args.input)), filter_options)
+    with metrics.stage('aggregate_variants') as stage:
+        results = run_filter_variants(transactions, variants, exact=args.exact_money)
+        stage['rows_in'] = results[0][2]['total_input']
+
+    for variant, _, summary in results:
+        print(f"   {variant['name']}: {summary['final_count']} of {summary['total_input']} transactions")
+
+    with metrics.stage('write_reports', rows_in=len(results)) as stage:
+        written = write_variant_reports(results, args.output_dir, filter_options)
+        stage['rows_out'] = len(written)
+    print(f"✓ Wrote {len(written)} files to {args.output_dir}")
+    return 0
+
+def run_pipelined(args, metrics=None):
+    """Non-interactive full run using the overlapped pipeline; filters come from the command line."""
+    metrics = metrics or PipelineMetrics()
+    set_active_metrics(metrics)
+
+    print(f"Running pipelined analysis over {args.input}")
+    cube = RollupCube(include_category=True) if args.cube_file else None
+    with metrics.stage('pipeline') as stage:
+        result = run_pipeline(args.input, region=args.region, min_amount=args.min_amount,
+                              max_amount=args.max_amount, output_file='data/enriched_sales_data.txt',
+                              cube=cube, exact=args.exact_money)
+        stage['rows_in'] = result['summary']['total_input']
+        stage['rows_out'] = result['rows_written']
+
+    timings = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in result['timings'].items())
+    print(f"✓ Valid: {result['summary']['final_count']} | Enriched and saved: {result['rows_written']} ({timings})")
+
+    if not result['valid']:
+        print("Error: No valid data found after filtering.")
+        return 1
+
+    if cube is not None:
+        cube.save(args.cube_file)
+        print(f"✓ Rollup cube ({len(cube.cells)} cells) saved to: {args.cube_file}")
+
+    # The pipeline's aggregator is reused, so the report makes no extra pass over the rows
+    with metrics.stage('report', rows_in=len(result['enriched'])):
+        report_files = generate_sales_report(result['valid'], result['enriched'], 'output/sales_report.txt',
+                                             formats=report_formats(args), aggregator=result['aggregator'])
+    print(f"✓ Report saved to: {', '.join(report_files)}")
+    return 0
 
 if __name__ == "__main__":
 
-    main()
+    cli_args = parse_args()
+    if cli_args.serve:
+        from utils.service import serve # Service-only modules load on demand
+        sys.exit(serve(cli_args.input, cli_args.host, cli_args.port, exact=cli_args.exact_money))
+
+    run_metrics = PipelineMetrics(
+        run_name='sales_batch' if cli_args.batch else 'sales_pipeline',
+        profile=cli_args.profile,
+        trace_memory=cli_args.trace_memory
+    )
+    exit_code = 1
+    try:
+        with run_metrics.instrument(HOT_FUNCTIONS) if cli_args.profile else nullcontext():
+            if cli_args.batch:
+                exit_code = run_batch(cli_args, run_metrics)
+            elif cli_args.pipelined:
+                exit_code = run_pipelined(cli_args, run_metrics)
+            else:
+                exit_code = main(cli_args.input, run_metrics, report_formats(cli_args), cli_args.cube_file,
+                                 on_demand=cli_args.on_demand_catalog, exact=cli_args.exact_money)
+    finally:
+        # Exported even when the run stops early, so failures show up in monitoring
+        export_metrics(run_metrics, cli_args)
+    sys.exit(exit_code)
@@ -0,0 +1,133 @@
+# tests/conftest.py
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+HEADER = "TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region"
+
+SAMPLE_ROWS = [
+    "T001|2024-12-01|P101|Laptop|2|45,000|C001|North",
+    "T002|2024-12-01|P102|Mouse|5|500|C002|South",
+    "T003|2024-12-02|P101|Laptop|1|45000|C003|East",
+    "T004|2024-12-02|P103|Keyboard,Wireless|3|1,500|C001|North",
+    "T005|2024-12-03|P102|Mouse|0|500|C004|West",
+    "X006|2024-12-03|P104|Monitor|1|12000|C002|South",
+    "T007|2024-12-03|P104|Monitor|2|12000|C005|",
+    "T008|2024-12-04|P105|USB Cable|10|199|C003|East",
+    "T009|2024-12-04|P105|USB Cable|abc|199|C003|East",
+    "broken line",
+]
+
+
+@pytest.fixture
+def sample_lines():
+    """Raw data lines (no header), including dirty rows."""
+    return list(SAMPLE_ROWS)
+
+
+@pytest.fixture
+def sample_file(tmp_path):
+    """Sales file with header, no trailing newline (like data/sales_data.txt)."""
+    path = tmp_path / "sales.txt"
+    path.write_text("\n".join([HEADER] + SAMPLE_ROWS), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def repo_data_file():
+    return os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "sales_data.txt")
+
+
+@pytest.fixture
+def synthetic_file(tmp_path):
+    """2,000-row generated file with the usual share of dirty rows."""
+    from benchmarks.generate_data import generate_sales_file
+    return generate_sales_file(str(tmp_path / "synthetic.txt"), 2000, n_customers=50)
+
+
+@pytest.fixture
+def synthetic_valid(synthetic_file):
+    """Parsed and validated rows of synthetic_file."""
+    from utils.file_handler import parse_transactions, read_sales_data, validate_and_filter
+    valid, _, _ = validate_and_filter(parse_transactions(read_sales_data(synthetic_file)))
+    return valid
+
+
+class CatalogState:
+    """What the stand-in catalog server returns; tests change it between calls."""
+
+    def __init__(self, n_products=25):
+        self.products = [{'id': i, 'title': f"Product {i}", 'category': 'cat', 'brand': 'brand', 'rating': 4.0}
+                         for i in range(101, 101 + n_products)]
+        self.etag = '"v1"'
+        self.page_cap = None     # Server-side limit below the requested page size
+        self.later_cap = None    # Same, but only for pages after the first
+        self.status = 200        # Forced status code for every request
+        self.bad_json = 0        # Number of upcoming responses with a broken body
+        self.requests = []       # (path, query dict, headers dict) per request
+        self.lock = threading.Lock()
+
+
+def _catalog_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            with state.lock:
+                state.requests.append((url.path, query, dict(self.headers)))
+                bad_json = state.bad_json > 0
+                state.bad_json -= bad_json
+
+            if state.status != 200:
+                return self._send(state.status, b'{}')
+            if self.headers.get('If-None-Match') == state.etag:
+                return self._send(304, b'')
+            if bad_json:
+                return self._send(200, b'{"products": [')
+
+            product_id = url.path.rsplit('/', 1)[-1]
+            if product_id.isdigit():
+                found = [p for p in state.products if p['id'] == int(product_id)]
+                if not found:
+                    return self._send(404, b'{}')
+                return self._send(200, json.dumps(found[0]).encode('utf-8'))
+
+            skip = int(query.get('skip', 0))
+            limit = int(query.get('limit', len(state.products)))
+            if state.page_cap is not None:
+                limit = min(limit, state.page_cap)
+            if state.later_cap is not None and skip > 0:
+                limit = min(limit, state.later_cap)
+            body = {'products': state.products[skip:skip + limit], 'total': len(state.products),
+                    'skip': skip, 'limit': limit}
+            self._send(200, json.dumps(body).encode('utf-8'))
+
+        def _send(self, status, body):
+            self.send_response(status)
+            self.send_header('ETag', state.etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def catalog_server():
+    """Local stand-in for the products API. Yields (base_url, CatalogState)."""
+    state = CatalogState()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _catalog_handler(state))
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/products", state
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,89 @@
+# tests/test_api_handler.py
+import pytest
+
+from utils.api_handler import ProductLookup, collect_product_ids, enrich_on_demand, fetch_catalog_mapping
+
+
+def test_fetches_every_page(catalog_server):
+    url, state = catalog_server
+    mapping = fetch_catalog_mapping(url, page_size=10, max_workers=4, retries=0)
+    assert sorted(mapping) == [p['id'] for p in state.products]
+
+
+@pytest.mark.parametrize('cap', [3, 7])
+def test_server_page_cap_below_page_size(catalog_server, cap):
+    url, state = catalog_server
+    state.page_cap = cap
+    mapping = fetch_catalog_mapping(url, page_size=10, max_workers=4, retries=0)
+    assert sorted(mapping) == [p['id'] for p in state.products]
+    assert all(int(query['limit']) <= cap for _, query, _ in state.requests[1:])
+
+
+def test_short_pages_are_completed(catalog_server):
+    url, state = catalog_server
+    state.later_cap = 4
+    mapping = fetch_catalog_mapping(url, page_size=10, max_workers=4, retries=0)
+    assert sorted(mapping) == [p['id'] for p in state.products]
+
+
+def test_invalid_json_is_retried(catalog_server):
+    url, state = catalog_server
+    state.bad_json = 2
+    mapping = fetch_catalog_mapping(url, page_size=100, max_workers=2, retries=3)
+    assert len(mapping) == len(state.products)
+    assert len(state.requests) == 3
+
+
+def test_failure_returns_partial_mapping(catalog_server):
+    url, state = catalog_server
+    state.status = 404
+    assert fetch_catalog_mapping(url, page_size=10, retries=0) == {}
+
+
+def _rows(product_ids):
+    return [{'TransactionID': f"T{i}", 'ProductID': p_id, 'Quantity': 1} for i, p_id in enumerate(product_ids)]
+
+
+def test_enrich_on_demand_is_lazy_and_fetches_only_referenced(catalog_server):
+    url, state = catalog_server
+    consumed = []
+
+    def stream():
+        for row in _rows(['P101', 'P105', 'P101', 'P999', 'BAD']):
+            consumed.append(row)
+            yield row
+
+    with ProductLookup(url, max_workers=2, retries=0) as lookup:
+        enriched = enrich_on_demand(stream(), lookup, batch_size=2)
+        first = next(enriched)
+        assert len(consumed) == 2  # Only the first batch has been read
+        rest = list(enriched)
+
+    rows = [first] + rest
+    assert [r['API_Match'] for r in rows] == [True, True, True, False, False]
+    fetched = sorted(path for path, _, _ in state.requests)
+    assert fetched == ['/products/101', '/products/105', '/products/999']
+
+
+def test_enrich_on_demand_with_ids_collected_during_ingestion(catalog_server):
+    url, state = catalog_server
+    product_ids = set()
+    rows = list(collect_product_ids(_rows(['P102', 'P103', 'P102']), product_ids))
+    assert product_ids == {102, 103}
+
+    with ProductLookup(url, retries=0) as lookup:
+        enriched = list(enrich_on_demand(rows, lookup, product_ids))
+        assert len(state.requests) == 2
+        list(enrich_on_demand(rows, lookup, product_ids))
+        assert len(state.requests) == 2  # Served from the LRU
+    assert [r['API_Rating'] for r in enriched] == [4.0, 4.0, 4.0]
+    assert enriched[0]['TransactionID'] == 'T0'
+
+
+def test_invalid_product_body_is_unresolved_not_fatal(catalog_server):
+    url, state = catalog_server
+    state.bad_json = 2
+    with ProductLookup(url, retries=1) as lookup:
+        assert lookup.resolve([101]) == {}  # Both attempts got a broken body
+        assert 101 in lookup.resolve([101])  # Not cached as a miss, so retried
+    assert len(state.requests) == 3
@@ -0,0 +1,55 @@
+# tests/test_batch_runner.py
+import json
+import os
+
+import pytest
+
+from utils.batch_runner import load_variants, run_filter_variants, write_variant_reports
+from utils.data_processor import build_aggregates
+from utils.file_handler import parse_transactions, read_sales_data, validate_and_filter
+
+
+def write_config(tmp_path, variants):
+    path = tmp_path / "variants.json"
+    path.write_text(json.dumps({'variants': variants}), encoding='utf-8')
+    return str(path)
+
+
+def test_duplicate_names_get_suffixes(tmp_path):
+    variants = load_variants(write_config(tmp_path, [
+        {'name': 'north', 'region': 'North'},
+        {'name': 'north', 'region': 'North', 'min_amount': 1000},
+        {'name': 'North', 'region': 'North', 'max_amount': 1000},
+        {'name': 'index'},
+        {'region': 'South'},
+        {'region': 'South'},
+    ]))
+    assert [v['name'] for v in variants] == ['north', 'north_2', 'North_3', 'index_2', 'South', 'South_2']
+
+
+def test_every_variant_gets_its_own_report(tmp_path, synthetic_file):
+    variants = load_variants(write_config(tmp_path, [
+        {'name': 'east', 'region': 'East'},
+        {'name': 'east', 'region': 'East', 'min_amount': 5000},
+    ]))
+    results = run_filter_variants(parse_transactions(read_sales_data(synthetic_file)), variants)
+    written = write_variant_reports(results, str(tmp_path / "out"))
+
+    assert sorted(os.path.basename(p) for p in written) == ['east.json', 'east_2.json', 'index.json']
+    with open(os.path.join(tmp_path, "out", "east_2.json"), encoding='utf-8') as f:
+        assert json.load(f)['variant']['min_amount'] == 5000
+
+
+@pytest.mark.parametrize('exact', [False, True])
+def test_single_pass_matches_separate_filters(tmp_path, synthetic_file, exact):
+    parsed = parse_transactions(read_sales_data(synthetic_file))
+    variants = load_variants(write_config(tmp_path, [
+        {}, {'region': 'West'}, {'min_amount': 2000, 'max_amount': 20000},
+    ]))
+    for variant, aggregator, summary in run_filter_variants(parsed, variants, exact=exact):
+        valid, _, expected_summary = validate_and_filter(
+            parsed, variant['region'], variant['min_amount'], variant['max_amount'], exact=exact)
+        assert summary == expected_summary
+        expected = build_aggregates(valid, exact=exact)
+        assert aggregator.calculate_total_revenue() == pytest.approx(expected.calculate_total_revenue())
+        assert aggregator.transaction_count == len(valid)
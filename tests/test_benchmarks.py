@@ -0,0 +1,39 @@
+# tests/test_benchmarks.py
+import json
+
+from benchmarks import run_benchmarks
+from benchmarks.run_benchmarks import compare, load_baseline
+
+
+def write_results(path, seconds):
+    results = [{'rows': 100, 'stage': stage, 'seconds': s} for stage, s in seconds.items()]
+    path.write_text(json.dumps({'meta': {}, 'results': results}), encoding='utf-8')
+    return results
+
+
+def test_slower_stage_is_flagged(tmp_path):
+    write_results(tmp_path / "base.json", {'parse': 1.0, 'read': 1.0})
+    baseline = load_baseline(str(tmp_path / "base.json"))
+    current = [{'rows': 100, 'stage': 'parse', 'seconds': 1.5}, {'rows': 100, 'stage': 'read', 'seconds': 1.1}]
+    assert compare(current, baseline, threshold=1.2) == 1
+
+
+def test_compare_against_output_file_uses_previous_run(tmp_path, monkeypatch):
+    path = tmp_path / "bench.json"
+    write_results(path, {'parse': 1.0})
+    slower = [{'rows': 100, 'stage': 'parse', 'seconds': 2.0}]
+    monkeypatch.setattr(run_benchmarks, 'benchmark_size', lambda *args, **kwargs: slower)
+
+    exit_code = run_benchmarks.main(['--rows', '100', '--no-memory', '--output', str(path), '--compare', str(path)])
+
+    assert exit_code == 1
+    assert json.loads(path.read_text(encoding='utf-8'))['results'] == slower
+
+
+def test_no_regression(tmp_path, monkeypatch):
+    path = tmp_path / "base.json"
+    write_results(path, {'parse': 1.0})
+    monkeypatch.setattr(run_benchmarks, 'benchmark_size',
+                        lambda *args, **kwargs: [{'rows': 100, 'stage': 'parse', 'seconds': 0.9}])
+    assert run_benchmarks.main(['--rows', '100', '--output', str(tmp_path / "new.json"),
+                                '--compare', str(path)]) == 0
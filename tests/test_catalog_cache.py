@@ -0,0 +1,124 @@
+# tests/test_catalog_cache.py
+import os
+import time
+
+import pytest
+
+from utils import api_handler
+from utils.catalog_cache import _cache_path, fetch_catalog_cached, load_cache_entry, wait_for_refresh
+
+
+def test_fresh_entry_is_served_without_network(catalog_server, tmp_path):
+    url, state = catalog_server
+    first = fetch_catalog_cached(url, ttl=3600, cache_dir=str(tmp_path))
+    second = fetch_catalog_cached(url, ttl=3600, cache_dir=str(tmp_path))
+    assert len(state.requests) == 1
+    assert second['mapping'] == first['mapping']
+    assert 101 in first['mapping']
+
+
+def test_expired_entry_is_revalidated_with_etag(catalog_server, tmp_path):
+    url, state = catalog_server
+    first = fetch_catalog_cached(url, ttl=0, cache_dir=str(tmp_path))
+    time.sleep(0.01)
+    second = fetch_catalog_cached(url, ttl=0, cache_dir=str(tmp_path))
+
+    assert state.requests[1][2].get('If-None-Match') == '"v1"'
+    assert second['products'] == first['products']
+    assert second['fetched_at'] > first['fetched_at']
+
+
+def test_changed_catalog_replaces_entry(catalog_server, tmp_path):
+    url, state = catalog_server
+    fetch_catalog_cached(url, ttl=0, cache_dir=str(tmp_path))
+    state.etag = '"v2"'
+    state.products = state.products[:3]
+    entry = fetch_catalog_cached(url, ttl=0, cache_dir=str(tmp_path))
+    assert len(entry['mapping']) == 3
+    assert load_cache_entry(url, str(tmp_path))['etag'] == '"v2"'
+
+
+def test_stale_copy_is_used_when_fetch_fails(catalog_server, tmp_path):
+    url, state = catalog_server
+    cached = fetch_catalog_cached(url, ttl=0, cache_dir=str(tmp_path))
+    state.status = 503
+    assert fetch_catalog_cached(url, ttl=0, cache_dir=str(tmp_path), retries=0)['mapping'] == cached['mapping']
+
+
+def test_no_cache_and_failed_fetch_returns_none(catalog_server, tmp_path):
+    url, state = catalog_server
+    state.status = 500
+    assert fetch_catalog_cached(url, cache_dir=str(tmp_path), retries=0) is None
+
+
+def test_catalog_is_fetched_page_by_page(catalog_server, tmp_path):
+    url, state = catalog_server
+    state.page_cap = 10
+    entry = fetch_catalog_cached(url, cache_dir=str(tmp_path), retries=0)
+    assert sorted(entry['mapping']) == list(range(101, 126))
+    assert sorted(int(query['skip']) for _, query, _ in state.requests) == [0, 10, 20]
+    assert load_cache_entry(url, str(tmp_path))['mapping'] == entry['mapping']
+
+
+def test_not_modified_skips_the_remaining_pages(catalog_server, tmp_path):
+    url, state = catalog_server
+    state.page_cap = 10
+    fetch_catalog_cached(url, ttl=0, cache_dir=str(tmp_path), retries=0)
+    del state.requests[:]
+    entry = fetch_catalog_cached(url, ttl=0, cache_dir=str(tmp_path), retries=0)
+    assert len(state.requests) == 1 and len(entry['mapping']) == 25
+
+
+def test_partial_catalog_is_not_revalidated(catalog_server, tmp_path, monkeypatch):
+    url, state = catalog_server
+    state.page_cap = 10
+    fetch_page = api_handler._fetch_page
+    monkeypatch.setattr(api_handler, '_fetch_page',
+                        lambda session, base_url, skip, *args: None if skip else fetch_page(session, base_url, skip, *args))
+
+    entry = fetch_catalog_cached(url, ttl=0, cache_dir=str(tmp_path), retries=0)
+    assert len(entry['mapping']) == 10 and entry['etag'] is None
+
+    monkeypatch.setattr(api_handler, '_fetch_page', fetch_page)
+    entry = fetch_catalog_cached(url, ttl=0, cache_dir=str(tmp_path), retries=0)
+    assert len(entry['mapping']) == 25
+
+
+def test_stale_while_revalidate_refresh_completes(catalog_server, tmp_path):
+    url, state = catalog_server
+    fetch_catalog_cached(url, ttl=0, cache_dir=str(tmp_path))
+    state.etag = '"v2"'
+    state.products = state.products[:5]
+
+    served = fetch_catalog_cached(url, ttl=0, stale_while_revalidate=3600, cache_dir=str(tmp_path))
+    assert len(served['mapping']) == 25  # Stale copy returned straight away
+    assert wait_for_refresh(timeout=5)
+    assert len(load_cache_entry(url, str(tmp_path))['mapping']) == 5
+
+
+@pytest.mark.parametrize('content', [
+    b'\x80\x04\x95garbage',                # not text
+    b'{"url": "x", "products": [',           # truncated
+    b'[1, 2, 3]',                            # wrong shape
+    b'{"url": "%s", "fetched_at": "soon", "products": []}',
+    b'{"url": "%s", "fetched_at": 1.0, "products": [{"title": "no id"}]}',
+    b'[' * 100000,                           # nested too deep
+])
+def test_corrupt_cache_file_is_a_miss(catalog_server, tmp_path, content):
+    url, state = catalog_server
+    path = _cache_path(url, str(tmp_path))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content.replace(b'%s', url.encode('utf-8')))
+
+    assert load_cache_entry(url, str(tmp_path)) is None
+    entry = fetch_catalog_cached(url, cache_dir=str(tmp_path))
+    assert len(entry['mapping']) == 25 and len(state.requests) == 1
+
+
+def test_cache_is_stored_as_json(catalog_server, tmp_path):
+    url, _ = catalog_server
+    fetched = fetch_catalog_cached(url, cache_dir=str(tmp_path))
+    with open(_cache_path(url, str(tmp_path)), encoding='utf-8') as f:
+        assert f.read().startswith('{')
+    assert load_cache_entry(url, str(tmp_path))['mapping'] == fetched['mapping']
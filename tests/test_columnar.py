@@ -0,0 +1,76 @@
+# tests/test_columnar.py
+import pytest
+
+from utils import columnar
+from utils import data_processor as dp
+from utils.columnar import ColumnarTransactions
+from utils.file_handler import parse_transactions, read_sales_data, validate_and_filter
+
+
+@pytest.fixture
+def parsed(synthetic_file):
+    return parse_transactions(read_sales_data(synthetic_file))
+
+
+@pytest.fixture
+def store(synthetic_valid):
+    return ColumnarTransactions.from_transactions(synthetic_valid)
+
+
+@pytest.mark.parametrize('filters', [
+    {},
+    {'region': 'North'},
+    {'min_amount': 5000, 'max_amount': 50000},
+    {'region': 'Nowhere'},
+])
+def test_validate_and_filter_parity(parsed, filters):
+    rows, invalid, summary = validate_and_filter(parsed, **filters)
+    filtered, col_invalid, col_summary = columnar.validate_and_filter(
+        ColumnarTransactions.from_transactions(parsed), **filters)
+    assert (col_invalid, col_summary) == (invalid, summary)
+    assert filtered.to_transactions() == rows
+
+
+def test_round_trip(synthetic_valid, store):
+    assert len(store) == len(synthetic_valid)
+    assert store.to_transactions() == synthetic_valid
+
+
+def test_region_and_total_parity(synthetic_valid, store):
+    assert columnar.calculate_total_revenue(store) == pytest.approx(dp.calculate_total_revenue(synthetic_valid))
+    ref = dp.region_wise_sales(synthetic_valid)
+    got = columnar.region_wise_sales(store)
+    assert list(got) == list(ref)
+    for region, stats in ref.items():
+        assert got[region] == pytest.approx(stats)
+
+
+def test_product_parity(synthetic_valid, store):
+    for name in ('top_selling_products', 'low_performing_products'):
+        ref = getattr(dp, name)(synthetic_valid)
+        got = getattr(columnar, name)(store)
+        assert [row[:2] for row in got] == [row[:2] for row in ref]
+        assert [row[2] for row in got] == pytest.approx([row[2] for row in ref])
+
+
+def test_customer_and_daily_parity(synthetic_valid, store):
+    ref = dp.customer_analysis(synthetic_valid)
+    got = columnar.customer_analysis(store)
+    assert list(got) == list(ref)
+    for c_id, stats in ref.items():
+        assert sorted(got[c_id].pop('products_bought')) == sorted(stats.pop('products_bought'))
+        assert got[c_id] == pytest.approx(stats)
+
+    ref_daily = dp.daily_sales_trend(synthetic_valid)
+    got_daily = columnar.daily_sales_trend(store)
+    assert list(got_daily) == list(ref_daily)
+    for date, stats in ref_daily.items():
+        assert got_daily[date] == pytest.approx(stats)
+    assert columnar.find_peak_sales_day(store)[0] == dp.find_peak_sales_day(synthetic_valid)[0]
+
+
+def test_empty_store():
+    store = ColumnarTransactions.from_transactions([])
+    assert len(store) == 0
+    assert columnar.top_selling_products(store) == []
+    assert columnar.daily_sales_trend(store) == {}
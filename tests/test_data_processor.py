@@ -0,0 +1,77 @@
+# tests/test_data_processor.py
+import pytest
+
+from utils import data_processor as dp
+from utils.data_processor import SalesAggregator, build_aggregates
+
+
+def module_results(transactions):
+    return {
+        'total': dp.calculate_total_revenue(transactions),
+        'regions': dp.region_wise_sales(transactions),
+        'top': dp.top_selling_products(transactions, 5),
+        'customers': dp.customer_analysis(transactions),
+        'daily': dp.daily_sales_trend(transactions),
+        'peak': dp.find_peak_sales_day(transactions),
+        'low': dp.low_performing_products(transactions, 10),
+    }
+
+
+def aggregator_results(agg):
+    return {
+        'total': agg.calculate_total_revenue(),
+        'regions': agg.region_wise_sales(),
+        'top': agg.top_selling_products(5),
+        'customers': agg.customer_analysis(),
+        'daily': agg.daily_sales_trend(),
+        'peak': agg.find_peak_sales_day(),
+        'low': agg.low_performing_products(10),
+    }
+
+
+def normalized(results):
+    """products_bought comes from a set, so its order is not meaningful."""
+    results = dict(results)
+    results['customers'] = {
+        c_id: dict(stats, products_bought=sorted(stats['products_bought']))
+        for c_id, stats in results['customers'].items()
+    }
+    return results
+
+
+def test_aggregator_matches_module_functions(synthetic_valid):
+    agg = normalized(aggregator_results(build_aggregates(synthetic_valid)))
+    ref = normalized(module_results(synthetic_valid))
+    assert agg == ref
+
+
+def test_merge_of_partials_equals_single_pass(synthetic_valid):
+    half = len(synthetic_valid) // 2
+    merged = build_aggregates(synthetic_valid[:half], exact=True).merge(
+        build_aggregates(synthetic_valid[half:], exact=True))
+    whole = build_aggregates(synthetic_valid, exact=True)
+    assert normalized(aggregator_results(merged)) == normalized(aggregator_results(whole))
+
+
+def test_merge_order_does_not_matter_in_exact_mode(synthetic_valid):
+    parts = [synthetic_valid[i::3] for i in range(3)]
+    forward = SalesAggregator(True)
+    for part in parts:
+        forward.merge(build_aggregates(part, exact=True))
+    backward = SalesAggregator(True)
+    for part in reversed(parts):
+        backward.merge(build_aggregates(part, exact=True))
+    assert forward.calculate_total_revenue() == backward.calculate_total_revenue()
+    assert forward.region_wise_sales() == backward.region_wise_sales()
+
+
+def test_merge_rejects_mixed_modes():
+    with pytest.raises(ValueError):
+        SalesAggregator(exact=True).merge(SalesAggregator())
+
+
+def test_empty_aggregator():
+    agg = SalesAggregator()
+    assert agg.calculate_total_revenue() == 0
+    assert agg.region_wise_sales() == {}
+    assert agg.top_selling_products() == []
@@ -0,0 +1,63 @@
+# tests/test_db_backend.py
+import sqlite3
+
+import pytest
+
+from utils import data_processor as dp
+from utils.db_backend import SalesDatabase
+from utils.file_handler import validate_and_filter
+
+
+@pytest.fixture
+def db(synthetic_valid):
+    database = SalesDatabase.sqlite()
+    database.create_schema()
+    assert database.bulk_load(synthetic_valid, batch_size=300) == len(synthetic_valid)
+    return database
+
+
+def test_create_schema_is_idempotent(db):
+    db.create_schema()
+    names = {row[0] for row in db._query("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {'idx_sales_region', 'idx_sales_date', 'idx_sales_product', 'idx_sales_customer'} <= names
+
+
+def test_create_schema_reports_real_errors():
+    database = SalesDatabase.sqlite()
+    database._query("CREATE TABLE sales (row_id INTEGER PRIMARY KEY)")
+    with pytest.raises(sqlite3.Error):
+        database.create_schema()
+
+
+@pytest.mark.parametrize('filters', [{}, {'region': 'North'}, {'min_amount': 2000, 'max_amount': 40000}])
+def test_queries_match_in_memory_functions(db, synthetic_valid, filters):
+    rows, _, _ = validate_and_filter(synthetic_valid, **filters)
+
+    assert db.calculate_total_revenue(**filters) == pytest.approx(dp.calculate_total_revenue(rows))
+    regions, expected_regions = db.region_wise_sales(**filters), dp.region_wise_sales(rows)
+    assert list(regions) == list(expected_regions)
+    for region, stats in expected_regions.items():
+        assert regions[region] == pytest.approx(stats)
+    assert [p[:2] for p in db.top_selling_products(5, **filters)] == [p[:2] for p in dp.top_selling_products(rows, 5)]
+    assert [p[:2] for p in db.low_performing_products(50, **filters)] == \
+        [p[:2] for p in dp.low_performing_products(rows, 50)]
+    assert list(db.daily_sales_trend(**filters)) == list(dp.daily_sales_trend(rows))
+    assert db.find_peak_sales_day(**filters)[0] == dp.find_peak_sales_day(rows)[0]
+
+
+def test_customer_analysis_lists_distinct_products(db, synthetic_valid):
+    expected = dp.customer_analysis(synthetic_valid)
+    got = db.customer_analysis()
+    assert list(got) == list(expected)
+    for c_id, stats in expected.items():
+        assert sorted(got[c_id]['products_bought']) == sorted(stats['products_bought'])
+        assert got[c_id]['purchase_count'] == stats['purchase_count']
+        assert got[c_id]['total_spent'] == pytest.approx(stats['total_spent'])
+
+
+def test_empty_table():
+    database = SalesDatabase.sqlite()
+    database.create_schema()
+    assert database.calculate_total_revenue() == 0
+    assert database.customer_analysis() == {}
+    assert database.find_peak_sales_day() == (None, -1.0, 0)
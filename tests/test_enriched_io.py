@@ -0,0 +1,67 @@
+# tests/test_enriched_io.py
+import json
+import struct
+
+import pytest
+
+from utils import enriched_io
+from utils.api_handler import create_product_mapping, enrich_sales_data, save_enriched_data
+from utils.enriched_io import (
+    load_enriched_columnar, load_enriched_data, save_enriched_columnar, save_enriched_data_bulk,
+)
+from utils.file_handler import parse_transactions, validate_and_filter
+
+
+@pytest.fixture
+def enriched(sample_lines):
+    valid, _, _ = validate_and_filter(parse_transactions(sample_lines))
+    mapping = create_product_mapping([
+        {'id': 101, 'title': 'Laptop', 'category': 'laptops', 'brand': 'Acme', 'rating': 4.5},
+        {'id': 105, 'title': 'Cable', 'category': 'accessories', 'brand': None, 'rating': 0.0},
+    ])
+    return enrich_sales_data(valid, mapping)
+
+
+def test_bulk_writer_matches_row_writer(tmp_path, enriched):
+    save_enriched_data(enriched, str(tmp_path / "rows.txt"))
+    assert save_enriched_data_bulk(enriched, str(tmp_path / "bulk.txt"), batch_size=2) == len(enriched)
+    assert (tmp_path / "rows.txt").read_bytes() == (tmp_path / "bulk.txt").read_bytes()
+
+
+def test_text_load_keeps_missing_ratings_null(tmp_path, enriched):
+    path = str(tmp_path / "enriched.txt")
+    save_enriched_data_bulk(enriched, path)
+    loaded = load_enriched_data(path)
+    assert loaded == enriched
+    assert any(t['API_Match'] and t['API_Rating'] == 0.0 for t in loaded)
+    assert all(t['API_Rating'] is None for t in loaded if not t['API_Match'])
+
+
+def test_columnar_round_trip(tmp_path, enriched):
+    path = str(tmp_path / "enriched.col")
+    assert save_enriched_columnar(enriched, path, batch_size=3) == len(enriched)
+    assert load_enriched_columnar(path) == enriched
+
+
+def _first_row_group_meta(path):
+    with open(path, 'rb') as f:
+        f.read(len(enriched_io.COLUMNAR_MAGIC))
+        (meta_len,) = struct.unpack('<I', f.read(4))
+        return json.loads(f.read(meta_len))
+
+
+def test_transaction_ids_are_not_dictionary_encoded(tmp_path, enriched):
+    path = str(tmp_path / "enriched.col")
+    save_enriched_columnar(enriched, path)
+    columns = _first_row_group_meta(path)['columns']
+    assert 'values' not in columns['TransactionID']
+    assert columns['TransactionID']['nbytes'] == 4 * len(enriched)
+    assert 'values' in columns['Region']
+
+
+@pytest.mark.parametrize('content', [b"hello", b"SALESCOL1\n"])
+def test_rejects_other_files(tmp_path, content):
+    path = tmp_path / "not.col"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        load_enriched_columnar(str(path))
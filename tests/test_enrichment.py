@@ -0,0 +1,58 @@
+# tests/test_enrichment.py
+import pytest
+
+from utils.api_handler import (
+    EnrichedTransaction, create_product_mapping, enrich_sales_data, enrich_sales_data_shared,
+    iter_enriched, save_enriched_data,
+)
+from utils.file_handler import parse_transactions
+
+PRODUCTS = [
+    {'id': 101, 'title': 'Laptop', 'category': 'laptops', 'brand': 'Acme', 'rating': 4.5},
+    {'id': 102, 'title': 'Mouse', 'category': 'accessories', 'brand': None, 'rating': 3.9},
+]
+
+
+@pytest.fixture
+def mapping():
+    return create_product_mapping(PRODUCTS)
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_views_match_copied_dicts(sample_lines, mapping, compact):
+    rows = parse_transactions(sample_lines, compact=compact)
+    expected = enrich_sales_data(rows, mapping)
+    views = enrich_sales_data_shared(rows, mapping)
+    assert [v.to_dict() for v in views] == expected
+    for view, record in zip(views, expected):
+        assert list(view.keys()) == list(record.keys())
+        assert all(view[key] == record[key] for key in record)
+
+
+def test_rows_of_one_product_share_enrichment(sample_lines, mapping):
+    rows = parse_transactions(sample_lines)
+    views = list(iter_enriched(rows, mapping))
+    laptops = [v for v in views if v['ProductID'] == 'P101']
+    assert len(laptops) == 2
+    assert laptops[0].enrichment is laptops[1].enrichment
+    assert laptops[0].transaction is rows[0]
+
+
+def test_dictionary_reads(mapping):
+    row = parse_transactions(["T1|2024-12-01|P999|Cable|1|10|C1|East"])[0]
+    view = EnrichedTransaction(row, {'API_Match': False, 'API_Rating': None})
+    assert view['API_Match'] is False and view['Region'] == 'East'
+    assert view.get('API_Rating', 'x') is None and view.get('Nope', 'x') == 'x'
+    assert 'API_Match' in view and 'Nope' not in view
+    with pytest.raises(KeyError):
+        view['Nope']
+    copied = view.copy()
+    copied['Region'] = 'West'
+    assert row['Region'] == 'East'
+
+
+def test_saved_file_is_unchanged(tmp_path, sample_lines, mapping):
+    rows = parse_transactions(sample_lines)
+    save_enriched_data(enrich_sales_data(rows, mapping), str(tmp_path / "copies.txt"))
+    save_enriched_data(enrich_sales_data_shared(rows, mapping), str(tmp_path / "views.txt"))
+    assert (tmp_path / "copies.txt").read_bytes() == (tmp_path / "views.txt").read_bytes()
@@ -0,0 +1,62 @@
+# tests/test_fast_parser.py
+import pytest
+
+from utils import fast_parser
+from utils.fast_parser import iter_fast_transactions, parse_file_columnar
+from utils.file_handler import parse_transactions, read_sales_data
+
+HEADER = b"TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region"
+
+EDGE_ROWS = [
+    b'T001|2024-12-01|P101|"Laptop, Pro"|2|"45,000"|C001|North',   # Quoted commas
+    b'T002|2024-12-01|P102|Mouse, Wireless|1,0|1,500.50|C002|South', # Commas in numbers
+    b'T003|2024-12-01|P103|Keyboard|abc|500|C003|East',             # Bad quantity
+    b'T004|2024-12-01|P104|Monitor|2|12.5.0|C004|West',              # Bad price
+    b'T005|2024-12-01|P105|Cable| 3 | 99 |C005| North ',             # Padded fields
+    b'T006|2024-12-01|P106|Webcam|-2|1e3|C006|South',                # Sign and exponent
+    b'T007|2024-12-01|P107|Hub|2|0.1|C007',                          # Too few fields
+    b'T008|2024-12-01|P108|Hub|2|0.1|C008|East|extra',               # Too many fields
+    b'T009|2024-12-01|P109||0|0|C009|',                              # Empty fields
+    b'T010|2024-12-01|P110|Caf\xc3\xa9 Mug|1|250|C010|North',        # Non-ASCII
+    b'',                                                             # Blank line
+    b'T011|2024-12-01|P111|Speaker|1|   |C011|East',                 # Blank number
+    b'T012|2024-12-01|P112|Speaker|1|nan|C012|East',                 # Non-finite prices
+    b'T013|2024-12-01|P113|Speaker|1|-inf|C013|East',
+]
+
+
+def write(tmp_path, data):
+    path = tmp_path / "edge.txt"
+    path.write_bytes(data)
+    return str(path)
+
+
+def reference(path):
+    return parse_transactions(read_sales_data(path))
+
+
+def assert_parity(path):
+    assert list(iter_fast_transactions(path)) == reference(path)
+
+
+@pytest.mark.parametrize('newline', [b'\n', b'\r\n'])
+@pytest.mark.parametrize('bom', [b'', b'\xef\xbb\xbf'])
+@pytest.mark.parametrize('trailing', [True, False])
+def test_edge_rows_match_reference(tmp_path, newline, bom, trailing):
+    data = bom + newline.join([HEADER] + EDGE_ROWS) + (newline if trailing else b'')
+    assert_parity(write(tmp_path, data))
+
+
+def test_block_boundaries(tmp_path, monkeypatch):
+    monkeypatch.setattr(fast_parser, 'BLOCK_SIZE', 64)
+    assert_parity(write(tmp_path, b'\r\n'.join([HEADER] + EDGE_ROWS * 5)))
+
+
+def test_latin1_file(tmp_path):
+    assert_parity(write(tmp_path, HEADER + b'\nT001|2024-12-01|P101|Caf\xe9|1|250|C001|North\n'))
+
+
+def test_synthetic_file_and_columnar(synthetic_file):
+    assert_parity(synthetic_file)
+    store = parse_file_columnar(synthetic_file)
+    assert store.to_transactions() == reference(synthetic_file)
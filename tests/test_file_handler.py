@@ -0,0 +1,70 @@
+# tests/test_file_handler.py
+import io
+
+import pytest
+
+from utils.file_handler import (
+    decode_line, detect_encoding, iter_raw_lines, iter_sales_data, iter_transactions,
+    iter_valid_transactions, new_filter_summary, parse_transactions, read_sales_data, validate_and_filter,
+)
+
+
+def test_streaming_matches_batch_on_repo_data(repo_data_file):
+    assert list(iter_sales_data(repo_data_file)) == read_sales_data(repo_data_file)
+
+
+def test_streaming_validation_matches_batch(sample_file):
+    batch_valid, invalid_count, batch_summary = validate_and_filter(
+        parse_transactions(read_sales_data(sample_file)), min_amount=1000)
+
+    summary = new_filter_summary()
+    stream_valid = list(iter_valid_transactions(
+        iter_transactions(iter_sales_data(sample_file)), min_amount=1000, summary=summary))
+
+    assert stream_valid == batch_valid
+    assert summary == batch_summary
+    assert invalid_count == summary['invalid']
+
+
+def test_latin1_file_streams_like_batch(tmp_path):
+    path = tmp_path / "latin1.txt"
+    path.write_bytes("header\nT001|2024-12-01|P101|Caf\xe9 Mug|1|250|C001|North\n".encode('latin-1'))
+    assert detect_encoding(str(path)) == 'latin-1'
+    assert list(iter_sales_data(str(path))) == read_sales_data(str(path))
+
+
+def test_detect_encoding_reads_bounded_prefix(tmp_path):
+    path = tmp_path / "late.txt"
+    path.write_bytes(b"header\n" + b"T001|2024-12-01|P1|Mug|1|250|C001|North\n" * 100 + b"\xff\n")
+    assert detect_encoding(str(path), sample_size=64) == 'utf-8'
+    assert detect_encoding(str(path)) == 'latin-1'
+
+
+def test_undecodable_line_falls_back_instead_of_failing(tmp_path):
+    path = tmp_path / "mixed.txt"
+    path.write_bytes("header\nT001|2024-12-01|P1|Caf\xe9|1|250|C001|North\nT002|x\n".encode('latin-1'))
+    lines = list(iter_sales_data(str(path)))
+    assert lines[0] == "T001|2024-12-01|P1|Caf\xe9|1|250|C001|North"
+    assert len(lines) == 2
+
+
+def test_decode_line_fallback():
+    assert decode_line("é".encode('utf-8')) == "é"
+    assert decode_line(b"\xe9") == "\xe9"
+    assert decode_line(b"\xe9", 'latin-1') == "\xe9"
+
+
+@pytest.mark.parametrize('newline', ['\r', '\r\n', '\n'])
+def test_line_endings_stream_like_batch(tmp_path, sample_lines, newline):
+    path = tmp_path / "endings.txt"
+    path.write_bytes(newline.join(["header"] + sample_lines).encode('utf-8'))
+    expected = read_sales_data(str(path))
+    assert len(expected) == len(sample_lines)
+    assert list(iter_sales_data(str(path))) == expected
+
+
+def test_raw_lines_split_across_reads():
+    data = b"a\r\nbb\rccc\n\r\ndddd\r"
+    expected = [b"a", b"bb", b"ccc", b"", b"dddd"]
+    for block_size in range(1, len(data) + 1):
+        assert list(iter_raw_lines(io.BytesIO(data), block_size)) == expected
@@ -0,0 +1,111 @@
+# tests/test_incremental.py
+import pytest
+
+from utils.data_processor import build_aggregates
+from utils.file_handler import parse_transactions, read_sales_data, validate_and_filter
+from utils.incremental import load_state, update_incremental
+
+HEADER = "TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region\n"
+
+
+def row(i, region='North'):
+    return f"T{i:03d}|2024-12-{i % 28 + 1:02d}|P{100 + i % 7}|Item {i % 7}|{i % 5 + 1}|{100 + i}|C{i % 9:03d}|{region}\n"
+
+
+@pytest.fixture
+def paths(tmp_path):
+    data = tmp_path / "sales.txt"
+    data.write_text(HEADER + ''.join(row(i) for i in range(20)), encoding='utf-8')
+    return str(data), str(tmp_path / "state.pkl")
+
+
+def append(path, text):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(text)
+
+
+def full(path):
+    valid, _, _ = validate_and_filter(parse_transactions(read_sales_data(path)))
+    return build_aggregates(valid, exact=True)
+
+
+def test_appends_match_full_rebuild(paths):
+    data, state = paths
+    aggregator, info = update_incremental(data, state)
+    assert info['full_rebuild'] and info['rows_added'] == 20
+
+    append(data, ''.join(row(i, 'South') for i in range(20, 35)))
+    aggregator, info = update_incremental(data, state)
+    assert not info['full_rebuild'] and info['rows_added'] == 15
+    assert aggregator.region_wise_sales() == full(data).region_wise_sales()
+    assert aggregator.calculate_total_revenue() == full(data).calculate_total_revenue()
+    assert info['summary']['final_count'] == 35
+
+
+def test_unterminated_tail_is_reported_but_not_committed(paths):
+    data, state = paths
+    update_incremental(data, state)
+    committed = load_state(state)['offset']
+
+    append(data, row(20).rstrip('\n'))
+    aggregator, info = update_incremental(data, state)
+    assert info['rows_added'] == 1 and aggregator.transaction_count == 21
+    assert load_state(state)['offset'] == committed
+    assert load_state(state)['aggregator'].transaction_count == 20
+
+    append(data, "\n" + row(21))
+    aggregator, info = update_incremental(data, state)
+    assert info['rows_added'] == 2
+    assert aggregator.transaction_count == 22
+    assert aggregator.daily_sales_trend() == full(data).daily_sales_trend()
+
+
+def test_replayed_rows_are_skipped_and_not_counted(paths):
+    data, state = paths
+    update_incremental(data, state)
+    append(data, ''.join(row(i) for i in range(15, 25)))
+    aggregator, info = update_incremental(data, state)
+
+    assert info['duplicates_skipped'] == 5 and info['rows_added'] == 5
+    assert info['summary']['final_count'] == aggregator.transaction_count == 25
+
+
+def test_seen_ids_window_is_bounded(paths):
+    data, state = paths
+    update_incremental(data, state, dedup_window=8)
+    seen = load_state(state)['seen_ids']
+    assert list(seen) == [f"T{i:03d}" for i in range(12, 20)]
+
+
+def test_rewritten_file_triggers_rebuild(paths):
+    data, state = paths
+    update_incremental(data, state)
+    with open(data, 'w', encoding='utf-8') as f:
+        f.write(HEADER + ''.join(row(i, 'East') for i in range(30)))
+    aggregator, info = update_incremental(data, state)
+    assert info['full_rebuild']
+    assert aggregator.region_wise_sales() == full(data).region_wise_sales()
+
+
+@pytest.mark.parametrize('content', [
+    b'',
+    b'\x80\x04\x95garbage',
+    b'cnowhere\nThing\n.',           # class from a module that is gone
+    b'cbuiltins\nnothing_here\n.',   # attribute that is gone
+    b'not a pickle at all',
+])
+def test_corrupt_state_triggers_rebuild(paths, content):
+    data, state = paths
+    update_incremental(data, state)
+    with open(state, 'wb') as f:
+        f.write(content)
+
+    assert load_state(state) is None
+    aggregator, info = update_incremental(data, state)
+    assert info['full_rebuild'] and info['rows_added'] == 20
+    assert aggregator.region_wise_sales() == full(data).region_wise_sales()
+
+
+def test_missing_file(tmp_path):
+    aggregator, info = update_incremental(str(tmp_path / "none.txt"), str(tmp_path / "state.pkl"))
+    assert info == {} and aggregator.transaction_count == 0
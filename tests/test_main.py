@@ -0,0 +1,116 @@
+# tests/test_main.py
+import builtins
+import os
+import threading
+
+import pytest
+
+import main as cli
+from utils.api_handler import create_product_mapping
+from utils.instrumentation import PipelineMetrics
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Runs main() inside tmp_path with every prompt answered 'n' and no network."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(builtins, 'input', lambda prompt='': 'n')
+    products = [{'id': 101, 'title': 'Laptop', 'category': 'laptops', 'brand': 'Acme', 'rating': 4.5}]
+    monkeypatch.setattr(cli, 'fetch_catalog_cached',
+                        lambda **kwargs: {'products': products, 'mapping': create_product_mapping(products)})
+    return tmp_path
+
+
+def test_successful_run_returns_zero(workdir, sample_file):
+    metrics = PipelineMetrics()
+    assert cli.main(sample_file, metrics) == 0
+    assert os.path.exists(workdir / "output" / "sales_report.txt")
+    assert all(s['status'] == 'ok' for s in metrics.stages)
+
+
+def test_no_valid_data_returns_one(workdir, tmp_path):
+    empty = tmp_path / "empty.txt"
+    empty.write_text("header\nbroken\n", encoding='utf-8')
+    assert cli.main(str(empty)) == 1
+
+
+def test_stage_failure_returns_one(workdir, sample_file, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(cli, 'generate_sales_report', fail)
+    metrics = PipelineMetrics()
+    assert cli.main(sample_file, metrics) == 1
+    assert metrics.summary()['failed_stages'] == ['report']
+
+
+def test_hot_functions_are_instrumented_and_restored(workdir, sample_file):
+    from utils import file_handler
+    original = file_handler.parse_line
+    metrics = PipelineMetrics()
+    with metrics.instrument(cli.HOT_FUNCTIONS):
+        assert file_handler.parse_line is not original
+        cli.main(sample_file, metrics)
+    assert file_handler.parse_line is original
+
+    functions = metrics.summary()['functions']
+    assert functions['utils.file_handler.parse_line']['calls'] == 10
+    assert functions['utils.file_handler.is_valid_transaction']['calls'] > 0
+    assert functions['utils.enriched_io.format_enriched_line']['calls'] > 0
+    assert functions['utils.api_handler.product_enrichment']['calls'] > 0
+
+
+def test_catalog_messages_wait_until_prompts_are_done(workdir, sample_file, monkeypatch, capsys):
+    fetched = threading.Event()
+
+    def fetch(log=print):
+        log("Connecting to API: stand-in")
+        fetched.set()
+        return None
+
+    def prompt(text=''):
+        fetched.wait(5)  # The background fetch has logged by the time the user answers
+        print(text)
+        return 'n'
+
+    monkeypatch.setattr(cli, 'fetch_catalog_cached', fetch)
+    monkeypatch.setattr(builtins, 'input', prompt)
+    cli.main(sample_file)
+
+    out = capsys.readouterr().out
+    assert out.index("Do you want to filter data?") < out.index("Connecting to API: stand-in")
+    assert out.index("Connecting to API: stand-in") < out.index("[7/10]")
+
+
+def test_deferred_log_prints_directly_after_flush(capsys):
+    log = cli.DeferredLog()
+    log("first")
+    assert capsys.readouterr().out == ""
+    log.flush()
+    log("second")
+    assert capsys.readouterr().out == "first\nsecond\n"
+
+
+@pytest.mark.parametrize('exact, expected', [(False, 1), (True, 0)])
+def test_exact_money_reaches_interactive_filters(workdir, tmp_path, monkeypatch, exact, expected):
+    data = tmp_path / "cents.txt"
+    data.write_text("header\nT001|2024-12-01|P101|Sticker|3|0.1|C001|North\n", encoding='utf-8')
+    answers = iter(['y', '', '', '0.3'])
+    monkeypatch.setattr(builtins, 'input', lambda prompt='': next(answers))
+    reports = []
+    monkeypatch.setattr(cli, 'generate_sales_report',
+                        lambda *args, **kwargs: reports.append(kwargs['aggregator']) or ['report.txt'])
+
+    # 3 * 0.1 is just over 0.3 as a float, exactly 30 paise in exact mode
+    assert cli.main(str(data), exact=exact) == expected
+    if exact:
+        assert reports[0].exact and reports[0].total_revenue == 30
+
+
+@pytest.mark.parametrize('content', ['{"variants": [', '{"variants": "north"}', '[{"min_amount": "lots"}]', None])
+def test_bad_config_is_reported_not_raised(workdir, sample_file, capsys, content):
+    config = workdir / "variants.json"
+    if content is not None:
+        config.write_text(content, encoding='utf-8')
+    args = cli.parse_args(['--batch', '--input', sample_file, '--config', str(config)])
+    assert cli.run_batch(args) == 1
+    assert "Error: Could not load config" in capsys.readouterr().out
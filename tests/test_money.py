@@ -0,0 +1,103 @@
+# tests/test_money.py
+import random
+from decimal import Decimal, ROUND_HALF_EVEN
+
+import pytest
+
+from utils.batch_runner import normalize_variant, run_filter_variants
+from utils.data_processor import SalesAggregator
+from utils.file_handler import iter_transactions, parse_line, parse_transactions, validate_and_filter
+from utils.money import format_money, from_minor, parse_minor, to_minor
+from utils.records import Transaction
+
+
+@pytest.mark.parametrize('text, minor', [
+    ('45000', 4500000), ('1,500', 150000), ('19.99', 1999), (' 0.5 ', 50), ('.5', 50), ('5.', 500),
+    ('19.995', 2000), ('19.985', 1998), ('0.125', 12), ('0.135', 14), ('0.1251', 13),
+    ('-19.995', -2000), ('+2.50', 250), ('1e3', 100000),
+])
+def test_parse_minor(text, minor):
+    assert parse_minor(text) == minor
+
+
+@pytest.mark.parametrize('text', ['', 'abc', '-', '.', '1.2.3', 'nan', 'inf', '12abc'])
+def test_parse_minor_rejects_bad_text(text):
+    with pytest.raises(ValueError):
+        parse_minor(text)
+
+
+def test_parse_minor_matches_decimal_half_even():
+    rng = random.Random(3)
+    for _ in range(5000):
+        text = f"{rng.choice(['', '-'])}{rng.randint(0, 10 ** 6)}.{rng.randint(0, 99999):0{rng.randint(1, 5)}d}"
+        expected = int((Decimal(text) * 100).quantize(Decimal(1), rounding=ROUND_HALF_EVEN))
+        assert parse_minor(text) == expected, text
+
+
+def test_to_minor_types():
+    assert to_minor(19.99) == 1999
+    assert to_minor(0.1 + 0.2) == 30
+    assert to_minor(7) == 700
+    assert to_minor(Decimal('1.005')) == 100
+    assert to_minor('1,234.56') == 123456
+    assert from_minor(123456) == 1234.56
+
+
+def test_format_money():
+    assert format_money(123456789) == '₹1,234,567.89'
+    assert format_money(5) == '₹0.05'
+    assert format_money(-150) == '-₹1.50'
+
+
+def test_amount_minor_is_computed_on_first_use():
+    t = parse_line("T1|2024-12-01|P1|Pen|3|0.1|C1|North", compact=True)
+    assert t._amount_minor is None # Not paid for by runs without exact money
+    assert t.amount_minor == 30
+    assert t.amount != 0.3 # the float amount keeps its rounding error
+
+    t['Quantity'] = 4
+    assert t.amount_minor == 40
+    assert Transaction('T2', '2024-12-01', 'P1', 'Pen', 2, 19.99, 'C1', 'North').amount_minor == 3998
+
+
+NON_FINITE_LINES = [
+    "T2|2024-12-01|P1|Pen|2|nan|C1|North",
+    "T3|2024-12-01|P1|Pen|2|inf|C1|North",
+    "T4|2024-12-01|P1|Pen|2|-Infinity|C1|North",
+]
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_non_finite_prices_are_malformed_in_both_parse_modes(compact):
+    lines = ["T1|2024-12-01|P1|Pen|3|0.1|C1|North"] + NON_FINITE_LINES
+    assert all(parse_line(line, compact) is None for line in NON_FINITE_LINES)
+
+    records = parse_transactions(lines, compact)
+    assert [t['TransactionID'] for t in records] == ['T1']
+    valid, _, _ = validate_and_filter(records, exact=True)
+    assert SalesAggregator(exact=True).consume(valid).total_revenue == 30
+
+
+def test_non_finite_prices_in_exact_batch_run():
+    lines = ["T1|2024-12-01|P1|Pen|3|0.1|C1|North"] + NON_FINITE_LINES
+    [(_, aggregator, summary)] = run_filter_variants(iter_transactions(lines), [normalize_variant({})], exact=True)
+    assert aggregator.total_revenue == 30 and summary['total_input'] == 1
+
+
+def test_exact_aggregation_is_order_independent():
+    lines = [f"T{i}|2024-12-0{i % 3 + 1}|P1|Pen|{i % 4 + 1}|{i % 7}.{i % 100:02d}|C{i % 5}|North"
+             for i in range(1, 500)]
+    records = parse_transactions(lines, compact=True)
+    forward = SalesAggregator(exact=True).consume(records)
+    backward = SalesAggregator(exact=True).consume(reversed(records))
+    assert forward.total_revenue == backward.total_revenue == sum(t.amount_minor for t in records)
+    assert isinstance(forward.total_revenue, int)
+    assert forward.calculate_total_revenue() == from_minor(forward.total_revenue)
+
+
+def test_exact_amount_filters_compare_paise():
+    records = parse_transactions(["T1|2024-12-01|P1|Pen|3|0.1|C1|North"], compact=True)
+    valid, _, _ = validate_and_filter(records, max_amount=0.3)
+    assert valid == []
+    valid, _, _ = validate_and_filter(records, max_amount=0.3, exact=True)
+    assert len(valid) == 1
@@ -0,0 +1,39 @@
+# tests/test_parallel.py
+import pytest
+
+from utils.data_processor import build_aggregates
+from utils.file_handler import parse_transactions, read_sales_data, validate_and_filter
+from utils.parallel import parallel_aggregate, split_file_chunks
+
+
+@pytest.mark.parametrize('num_chunks', [1, 3, 7, 50])
+def test_chunks_cover_every_line_once(synthetic_file, num_chunks):
+    chunks = split_file_chunks(synthetic_file, num_chunks)
+    with open(synthetic_file, 'rb') as f:
+        data = f.read()
+    header_end = data.index(b'\n') + 1
+    assert chunks[0][0] == header_end and chunks[-1][1] == len(data)
+    for (_, end), (start, _) in zip(chunks, chunks[1:]):
+        assert end == start
+        assert data[start - 1:start] == b'\n'
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_parallel_matches_serial(synthetic_file, workers):
+    rows, _, summary = validate_and_filter(
+        parse_transactions(read_sales_data(synthetic_file)), region='South', min_amount=1000)
+    expected = build_aggregates(rows, exact=True)
+
+    aggregator, parallel_summary = parallel_aggregate(
+        synthetic_file, region='South', min_amount=1000, workers=workers, chunks_per_worker=3, exact=True)
+
+    assert parallel_summary == summary
+    assert aggregator.calculate_total_revenue() == expected.calculate_total_revenue()
+    assert aggregator.region_wise_sales() == expected.region_wise_sales()
+    assert aggregator.daily_sales_trend() == expected.daily_sales_trend()
+
+
+def test_missing_file_returns_empty(tmp_path):
+    aggregator, summary = parallel_aggregate(str(tmp_path / "missing.txt"), workers=1)
+    assert aggregator.transaction_count == 0
+    assert summary['final_count'] == 0
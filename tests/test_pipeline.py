@@ -0,0 +1,47 @@
+# tests/test_pipeline.py
+import pytest
+
+from utils.api_handler import create_product_mapping, enrich_sales_data, save_enriched_data
+from utils.data_processor import build_aggregates
+from utils.file_handler import parse_transactions, read_sales_data, validate_and_filter
+from utils.pipeline import run_pipeline
+from utils.rollup_cube import RollupCube, build_cube
+
+PRODUCTS = [{'id': i, 'title': f"P{i}", 'category': 'cat', 'brand': 'b', 'rating': 4.0} for i in range(101, 106)]
+
+
+def fetch_catalog():
+    return {'products': PRODUCTS, 'mapping': create_product_mapping(PRODUCTS)}
+
+
+@pytest.mark.parametrize('filters', [{}, {'region': 'South', 'min_amount': 1000}])
+def test_pipeline_matches_sequential_run(tmp_path, synthetic_file, filters):
+    valid, _, summary = validate_and_filter(parse_transactions(read_sales_data(synthetic_file)), **filters)
+    expected_file = tmp_path / "expected.txt"
+    save_enriched_data(enrich_sales_data(valid, create_product_mapping(PRODUCTS)), str(expected_file))
+
+    output = tmp_path / "out" / "enriched.txt"
+    cube = RollupCube(include_category=True)
+    result = run_pipeline(synthetic_file, output_file=str(output), fetch_catalog=fetch_catalog,
+                          batch_size=97, max_pending_batches=2, cube=cube, **filters)
+
+    assert result['summary'] == summary
+    assert result['valid'] == valid
+    assert result['rows_written'] == len(valid)
+    assert output.read_bytes() == expected_file.read_bytes()
+    assert result['aggregator'].region_wise_sales() == build_aggregates(valid).region_wise_sales()
+    assert cube.rollup(('region',)) == build_cube(result['enriched'], include_category=True).rollup(('region',))
+
+
+def test_failed_catalog_fetch_still_writes_unenriched_rows(tmp_path, synthetic_file):
+    result = run_pipeline(synthetic_file, output_file=str(tmp_path / "e.txt"),
+                          fetch_catalog=lambda: None, keep_rows=False)
+    assert result['valid'] is None and result['rows_written'] == result['summary']['final_count']
+
+
+def test_stage_errors_are_raised(tmp_path, synthetic_file):
+    def broken():
+        raise ConnectionError("no route")
+    with pytest.raises(RuntimeError, match="enrich"):
+        run_pipeline(synthetic_file, output_file=str(tmp_path / "e.txt"), fetch_catalog=broken, batch_size=50,
+                     max_pending_batches=1)
@@ -0,0 +1,41 @@
+# tests/test_records.py
+import pickle
+
+from utils.file_handler import parse_line, parse_transactions
+from utils.records import Transaction, to_records
+
+
+def test_compact_parse_matches_dict_parse(sample_lines):
+    dicts = parse_transactions(sample_lines)
+    records = parse_transactions(sample_lines, compact=True)
+    assert len(dicts) == len(records)
+    for d, r in zip(dicts, records):
+        assert isinstance(r, Transaction)
+        assert r == d
+        assert r.to_dict() == d
+
+
+def test_parse_line_handles_commas_and_rejects_short_rows():
+    t = parse_line("T004|2024-12-02|P103|Keyboard,Wireless|3|1,500|C001|North")
+    assert t['ProductName'] == "Keyboard Wireless"
+    assert t['UnitPrice'] == 1500.0
+    assert parse_line("broken line") is None
+
+
+def test_dict_compatibility():
+    t = Transaction('T1', '2024-12-01', 'P1', 'Mouse', 2, 250.0, 'C1', 'North')
+    assert t['Quantity'] == 2 and t.get('Region') == 'North'
+    assert t.get('Missing', 'x') == 'x'
+    assert 'Date' in t and 'API_Rating' not in t
+    t['Quantity'] = 4
+    assert t.amount == 1000.0
+    widened = t.copy()
+    widened['API_Rating'] = 4.5
+    assert isinstance(widened, dict) and widened['Quantity'] == 4
+
+
+def test_pickle_round_trip():
+    records = to_records(parse_transactions(["T1|2024-12-01|P1|Mouse|2|250|C1|North"]))
+    restored = pickle.loads(pickle.dumps(records))
+    assert restored == records
+    assert restored[0].amount == 500.0
@@ -0,0 +1,82 @@
+# tests/test_report_generator.py
+import json
+import threading
+
+import pytest
+
+from utils.api_handler import create_product_mapping, enrich_sales_data_shared
+from utils.data_processor import build_aggregates
+from utils.report_generator import ReportContext, build_report_sections, generate_sales_report, render_json
+
+
+@pytest.fixture
+def ctx(synthetic_valid):
+    products = [{'id': 101, 'title': 'Laptop', 'category': 'laptops', 'brand': 'Acme', 'rating': 4.5}]
+    enriched = enrich_sales_data_shared(synthetic_valid, create_product_mapping(products))
+    return ReportContext(synthetic_valid, enriched)
+
+
+def test_parallel_and_serial_sections_match(ctx, synthetic_valid):
+    serial = build_report_sections(ReportContext(synthetic_valid, ctx.enriched_transactions), parallel=False)
+    assert build_report_sections(ctx, parallel=True, max_workers=8) == serial
+
+
+def test_different_keys_compute_concurrently(ctx):
+    both_running = threading.Barrier(2, timeout=5)
+
+    def compute():
+        both_running.wait()  # Only passes if the other key is being computed at the same time
+        return 'done'
+
+    results = []
+    threads = [threading.Thread(target=lambda key=key: results.append(ctx._memo(key, compute)))
+               for key in ('a', 'b')]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ['done', 'done']
+
+
+def test_same_key_computes_once(ctx):
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return object()
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(ctx._memo('k', compute)))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.append(ctx._memo('k', compute)))
+    second.start()
+    release.set()
+    first.join()
+    second.join()
+    assert len(calls) == 1 and results[0] is results[1]
+
+
+def test_failed_result_is_not_cached(ctx):
+    def fail():
+        raise ValueError("boom")
+    with pytest.raises(ValueError):
+        ctx._memo('k', fail)
+    assert ctx._memo('k', lambda: 42) == 42
+
+
+def test_report_files(tmp_path, synthetic_valid, ctx):
+    aggregator = build_aggregates(synthetic_valid)
+    written = generate_sales_report(synthetic_valid, ctx.enriched_transactions, str(tmp_path / "report.txt"),
+                                    formats=('txt', 'json', 'csv'), aggregator=aggregator)
+    assert [p.rsplit('.', 1)[1] for p in written] == ['txt', 'json', 'csv']
+
+    report = json.loads((tmp_path / "report.json").read_text(encoding='utf-8'))
+    expected = json.loads(render_json(build_report_sections(ctx, parallel=False), {}))
+    assert report.pop('meta')['records_processed'] == len(synthetic_valid)
+    assert report == {key: value for key, value in expected.items() if key != 'meta'}
+    assert "REGION" in (tmp_path / "report.txt").read_text(encoding='utf-8').upper()
@@ -0,0 +1,115 @@
+# tests/test_rollup_cube.py
+import pickle
+
+import pytest
+
+from utils import data_processor
+from utils.rollup_cube import CUBE_VERSION, RollupCube, build_cube
+
+
+def approx_rows(actual, expected):
+    assert sorted(actual) == sorted(expected)
+    for key in expected:
+        assert actual[key] == pytest.approx(expected[key])
+
+
+def test_cube_matches_data_processor(synthetic_valid):
+    cube = build_cube(synthetic_valid)
+    approx_rows(cube.region_wise_sales(), data_processor.region_wise_sales(synthetic_valid))
+    assert cube.top_selling_products(5) == data_processor.top_selling_products(synthetic_valid, 5)
+    assert cube.low_performing_products(10) == data_processor.low_performing_products(synthetic_valid, 10)
+    approx_rows(cube.daily_sales_trend(), data_processor.daily_sales_trend(synthetic_valid))
+
+
+def test_slice_and_dice_match_filtered_rows(synthetic_valid):
+    cube = build_cube(synthetic_valid)
+    east = [t for t in synthetic_valid if t['Region'] == 'East']
+    assert cube.slice('region', 'East').total() == cube.total(region='East')
+    assert cube.total(region='East')['transaction_count'] == len(east)
+    assert cube.total(region='East')['revenue'] == pytest.approx(data_processor.calculate_total_revenue(east))
+
+    regions = {'East', 'West'}
+    dates = sorted({t['Date'] for t in synthetic_valid})
+    start, end = dates[2], dates[-3]
+    rows = [t for t in synthetic_valid if t['Region'] in regions and start <= t['Date'] <= end]
+    diced = cube.dice(region=regions, date=(start, end))
+    assert diced.total()['transaction_count'] == len(rows)
+    assert diced.total()['quantity'] == sum(t['Quantity'] for t in rows)
+
+
+def test_daily_trend_customers_unknown_after_non_date_dice(synthetic_valid):
+    cube = build_cube(synthetic_valid)
+    diced = cube.dice(region='East')
+    assert all(day['unique_customers'] is None for day in diced.daily_sales_trend().values())
+    assert all(day['unique_customers'] is None for day in cube.daily_sales_trend(region='East').values())
+
+    # Still unknown after a later date-only dice of the diced cube
+    date = next(iter(diced.daily_sales_trend()))
+    assert diced.dice(date=(date, None)).daily_sales_trend()[date]['unique_customers'] is None
+
+
+def test_daily_trend_customers_exact_after_date_dice(synthetic_valid):
+    cube = build_cube(synthetic_valid)
+    dates = sorted({t['Date'] for t in synthetic_valid})
+    start, end = dates[1], dates[3]
+    rows = [t for t in synthetic_valid if start <= t['Date'] <= end]
+    trend = cube.dice(date=(start, end)).daily_sales_trend()
+    approx_rows(trend, data_processor.daily_sales_trend(rows))
+
+
+def test_bad_filters_raise(synthetic_valid):
+    cube = build_cube(synthetic_valid)
+    with pytest.raises(ValueError):
+        cube.total(date=('2024-12-01', '2024-12-02', '2024-12-03'))
+    with pytest.raises(ValueError):
+        cube.dice(date=('2024-12-01',))
+    with pytest.raises(ValueError):
+        cube.total(colour='red')
+
+
+def test_date_range_totals_match_rows(synthetic_valid):
+    cube = build_cube(synthetic_valid)
+    dates = sorted({t['Date'] for t in synthetic_valid})
+    for start, end in [(None, None), (dates[0], dates[0]), (dates[2], dates[-2]), (dates[-1], None), (dates[3], dates[1])]:
+        rows = [t for t in synthetic_valid
+                if (start is None or t['Date'] >= start) and (end is None or t['Date'] <= end)]
+        totals = cube.date_range_totals(start, end)
+        assert totals['transaction_count'] == len(rows)
+        assert totals['quantity'] == sum(t['Quantity'] for t in rows)
+        assert totals['revenue'] == pytest.approx(data_processor.calculate_total_revenue(rows))
+
+    west = [t for t in synthetic_valid if t['Region'] == 'West' and t['Date'] >= dates[2]]
+    assert cube.date_range_totals(dates[2], None, region='West')['transaction_count'] == len(west)
+
+
+def test_merge_equals_single_build(synthetic_valid):
+    half = len(synthetic_valid) // 2
+    merged = build_cube(synthetic_valid[:half]).merge(build_cube(synthetic_valid[half:]))
+    whole = build_cube(synthetic_valid)
+    approx_rows(merged.rollup(by=('date', 'region')), whole.rollup(by=('date', 'region')))
+    assert merged.daily_sales_trend() == whole.daily_sales_trend()
+
+
+def test_save_and_load_round_trip(tmp_path, synthetic_valid):
+    path = str(tmp_path / "cube" / "sales.cube")
+    cube = build_cube(synthetic_valid)
+    cube.save(path)
+    loaded = RollupCube.load(path)
+    assert loaded.cells == cube.cells
+    assert loaded.daily_sales_trend() == cube.daily_sales_trend()
+
+    cube.dice(region='North').save(path)
+    assert RollupCube.load(path).customers_known is False
+
+
+@pytest.mark.parametrize('content', [
+    b"not a pickle",
+    b"",
+    b"cnowhere\nThing\n.",                          # class from a module that is gone
+    pickle.dumps({'version': CUBE_VERSION, 'include_category': False}),  # fields missing
+])
+def test_load_missing_or_corrupt_returns_none(tmp_path, content):
+    assert RollupCube.load(str(tmp_path / "missing.cube")) is None
+    bad = tmp_path / "bad.cube"
+    bad.write_bytes(content)
+    assert RollupCube.load(str(bad)) is None
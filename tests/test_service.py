@@ -0,0 +1,225 @@
+# tests/test_service.py
+import gzip
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from utils.api_handler import create_product_mapping
+from utils.data_processor import build_aggregates
+from utils.file_handler import parse_transactions, read_sales_data, validate_and_filter
+from utils.service import SalesDataStore, _parse_query_params, make_handler
+
+from tests.conftest import HEADER
+
+
+def approx_results(actual, expected):
+    assert sorted(actual) == sorted(expected)
+    for key in expected:
+        assert actual[key] == pytest.approx(expected[key])
+
+
+@pytest.fixture
+def store(synthetic_file):
+    store = SalesDataStore(synthetic_file, fetch_catalog=False)
+    assert store.load()
+    return store
+
+
+@pytest.fixture
+def server(store):
+    """Serves store on a free local port; yields the base URL."""
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(store))
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def request(url, method='GET'):
+    """(status, JSON body) for one request; HTTP errors are returned, not raised."""
+    req = urllib.request.Request(url, method=method)
+    try:
+        with urllib.request.urlopen(req, timeout=5) as response:
+            return response.status, json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read().decode('utf-8'))
+
+
+def test_query_before_load_raises(synthetic_file):
+    with pytest.raises(ValueError):
+        SalesDataStore(synthetic_file, fetch_catalog=False).query()
+
+
+def test_unfiltered_queries_match_data_processor(store, synthetic_valid):
+    expected = build_aggregates(synthetic_valid)
+    assert store.query('calculate_total_revenue')['result'] == pytest.approx(expected.calculate_total_revenue())
+    approx_results(store.query('region_wise_sales')['result'], expected.region_wise_sales())
+    assert store.query('top_selling_products', n=3)['result'] == expected.top_selling_products(3)
+    assert store.query('low_performing_products', threshold=50)['result'] == expected.low_performing_products(50)
+    assert store.query()['filter_summary']['final_count'] == len(synthetic_valid)
+
+
+def test_filtered_query_matches_validate_and_filter(store, synthetic_file):
+    transactions = parse_transactions(read_sales_data(synthetic_file))
+    valid, _, summary = validate_and_filter(transactions, region='East', min_amount=1000, max_amount=50000)
+    response = store.query('daily_sales_trend', region='East', min_amount=1000, max_amount=50000)
+    approx_results(response['result'], build_aggregates(valid).daily_sales_trend())
+    assert response['filter_summary'] == summary
+
+
+def test_filtered_results_are_cached_per_snapshot(store):
+    first = store._filtered(store.snapshot, 'West', None, None)
+    assert store._filtered(store.snapshot, 'West', None, None) is first
+    store.load()
+    assert store._filtered(store.snapshot, 'West', None, None) is not first
+
+
+def test_report_and_enrichment_queries(store, synthetic_valid):
+    store.mapping = create_product_mapping([{'id': 101, 'title': 'Laptop', 'category': 'laptops',
+                                             'brand': 'Acme', 'rating': 4.5}])
+    store.load()
+    report = store.query('report', region='North', n=2)['result']
+    assert len(report['top_selling_products']) <= 2
+    assert report['variant']['region'] == 'North'
+
+    stats = store.query('enrichment')['result']
+    assert stats['total'] == len(synthetic_valid)
+    assert stats['matched'] == sum(1 for t in synthetic_valid if t['ProductID'] == 'P101')
+    assert 'P101' not in stats['unmatched_products']
+
+    with pytest.raises(ValueError):
+        store.query('no_such_function')
+
+
+def test_enrichment_is_cached_per_filter_and_snapshot(store):
+    first = store.query('enrichment', region='East')['result']
+    assert store.query('enrichment', region='East')['result'] is first
+    assert store.query('enrichment')['result'] is not first
+    store.load()
+    assert store.query('enrichment', region='East')['result'] is not first
+
+
+def test_reload_refreshes_the_catalog(synthetic_file, monkeypatch):
+    from utils import catalog_cache
+    catalogs = iter([
+        {'mapping': create_product_mapping([{'id': 101}])},
+        {'mapping': create_product_mapping([{'id': 101}, {'id': 102}])},
+        None, # Fetch failed: the last good mapping stays
+    ])
+    monkeypatch.setattr(catalog_cache, 'fetch_catalog_cached', lambda: next(catalogs))
+    store = SalesDataStore(synthetic_file)
+
+    counts = []
+    for _ in range(3):
+        store.load()
+        counts.append((store.status()['catalog_products'], store.query('enrichment')['result']['matched'] > 0))
+    assert counts == [(1, True), (2, True), (2, True)]
+
+
+def test_reload_if_changed(tmp_path, sample_lines):
+    path = tmp_path / "sales.txt"
+    path.write_text("\n".join([HEADER] + sample_lines), encoding='utf-8')
+    store = SalesDataStore(str(path), fetch_catalog=False)
+    assert store.reload_if_changed()
+    before = store.snapshot
+    assert not store.reload_if_changed()
+
+    path.write_text("\n".join([HEADER] + sample_lines[:3]), encoding='utf-8')
+    assert store.reload_if_changed()
+    assert store.snapshot is not before
+    assert store.query()['filter_summary']['final_count'] == 3
+
+
+def test_missing_or_broken_input_keeps_current_snapshot(tmp_path, sample_lines):
+    directory = tmp_path / "shards"
+    directory.mkdir()
+    with gzip.open(str(directory / "day01.gz"), 'wt', encoding='utf-8') as f:
+        f.write("\n".join([HEADER] + sample_lines))
+    store = SalesDataStore(str(directory), fetch_catalog=False)
+    assert store.load()
+    snapshot = store.snapshot
+
+    (directory / "day02.gz").write_bytes(b"truncated")
+    with pytest.raises(OSError):
+        store.load()
+    assert store.snapshot is snapshot
+
+    for name in os.listdir(directory):
+        os.remove(directory / name)
+    assert not store.load()
+    assert store.snapshot is snapshot
+
+
+def test_watch_picks_up_changes(tmp_path, sample_lines):
+    path = tmp_path / "sales.txt"
+    path.write_text("\n".join([HEADER] + sample_lines[:3]), encoding='utf-8')
+    store = SalesDataStore(str(path), fetch_catalog=False)
+    store.load()
+    store.watch(interval=0.05)
+
+    path.write_text("\n".join([HEADER] + sample_lines), encoding='utf-8')
+    deadline = time.time() + 5
+    while store.snapshot['summary']['final_count'] == 3 and time.time() < deadline:
+        time.sleep(0.02)
+    assert store.snapshot['summary']['final_count'] > 3
+    store.reload_if_changed = lambda: False # quiet the daemon poller once tmp_path goes away
+
+
+def test_parse_query_params():
+    assert _parse_query_params("fn=top_selling_products&region=East&min_amount=500&n=3") == {
+        'function': 'top_selling_products', 'region': 'East', 'min_amount': 500.0, 'n': 3}
+    assert _parse_query_params("") == {'function': 'region_wise_sales'}
+    with pytest.raises(ValueError):
+        _parse_query_params("min_amount=lots")
+    with pytest.raises(ValueError):
+        _parse_query_params("n=2.5")
+    for bad in ("n=0", "n=-3", "threshold=0"):
+        with pytest.raises(ValueError):
+            _parse_query_params(bad)
+
+
+def test_http_endpoints(server, store, synthetic_valid):
+    assert request(f"{server}/health") == (200, {'status': 'ok'})
+
+    status, body = request(f"{server}/status")
+    assert status == 200 and body['loaded'] and body['valid_transactions'] == len(synthetic_valid)
+
+    status, body = request(f"{server}/query?fn=top_selling_products&region=East&n=2")
+    assert status == 200
+    assert body['result'] == [list(row) for row in store.query('top_selling_products', region='East', n=2)['result']]
+    assert 'query_ms' in body
+
+    assert request(f"{server}/query?fn=nope")[0] == 400
+    assert request(f"{server}/query?max_amount=x")[0] == 400
+    assert request(f"{server}/query?fn=top_selling_products&n=0")[0] == 400
+    assert request(f"{server}/missing")[0] == 404
+
+    status, body = request(f"{server}/reload", method='POST')
+    assert status == 200 and body['reloaded']
+    assert request(f"{server}/other", method='POST')[0] == 404
+
+
+def test_http_reload_failure_reports_error(tmp_path, sample_lines):
+    directory = tmp_path / "shards"
+    directory.mkdir()
+    with gzip.open(str(directory / "day01.gz"), 'wt', encoding='utf-8') as f:
+        f.write("\n".join([HEADER] + sample_lines))
+    store = SalesDataStore(str(directory), fetch_catalog=False)
+    store.load()
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(store))
+    threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+    try:
+        (directory / "day02.gz").write_bytes(b"truncated")
+        status, body = request(f"http://127.0.0.1:{httpd.server_address[1]}/reload", method='POST')
+        assert status == 500 and not body['reloaded'] and 'day02.gz' in body['error']
+        assert body['valid_transactions'] == store.query()['filter_summary']['final_count']
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
@@ -0,0 +1,121 @@
+# tests/test_shards.py
+import bz2
+import gzip
+
+import pytest
+
+from utils import shards
+from utils.data_processor import build_aggregates
+from utils.file_handler import iter_sales_data, parse_transactions, read_sales_data
+from utils.shards import (
+    expand_inputs, iter_input_lines, iter_sharded_lines, iter_sharded_transactions, sharded_aggregate
+)
+
+from tests.conftest import HEADER
+
+
+def write_shards(directory, rows, sizes, suffixes, header=True, encoding='utf-8'):
+    """Splits rows into consecutive shards (one per suffix) and writes them."""
+    directory.mkdir(exist_ok=True)
+    openers = {'.txt': open, '.gz': gzip.open, '.bz2': bz2.open}
+    start = 0
+    for i, (size, suffix) in enumerate(zip(sizes, suffixes)):
+        text = "\n".join(([HEADER] if header else []) + rows[start:start + size]) + "\n"
+        with openers[suffix](str(directory / f"day{i:02d}{suffix}"), 'wb') as f:
+            f.write(text.encode(encoding))
+        start += size
+    return str(directory)
+
+
+@pytest.fixture
+def synthetic_rows(synthetic_file):
+    with open(synthetic_file, encoding='utf-8') as f:
+        return f.read().splitlines()[1:]
+
+
+def test_expand_inputs_orders_supported_files(tmp_path):
+    for name in ["b.gz", "a.txt", "c.bz2", "notes.md"]:
+        (tmp_path / name).write_bytes(b"")
+    assert [p.rsplit('/', 1)[-1] for p in expand_inputs(str(tmp_path))] == ["a.txt", "b.gz", "c.bz2"]
+    assert expand_inputs(str(tmp_path / "*.gz")) == [str(tmp_path / "b.gz")]
+    assert expand_inputs(str(tmp_path / "missing.txt")) == []
+
+
+@pytest.mark.parametrize('header', [True, False])
+def test_gz_bz2_and_plain_shards_match_single_file(tmp_path, synthetic_file, synthetic_rows, header):
+    directory = write_shards(tmp_path / "shards", synthetic_rows, [700, 600, 700], ['.gz', '.bz2', '.txt'], header)
+    expected = list(iter_sales_data(synthetic_file))
+    assert list(iter_sharded_lines(directory, workers=3)) == expected
+    assert list(iter_sharded_lines(directory, workers=1)) == expected
+    assert list(iter_input_lines(directory)) == expected
+
+
+def test_latin1_shard(tmp_path):
+    rows = ["T001|2024-12-01|P101|Café Crème|2|450|C001|North",
+            "T002|2024-12-01|P102|Mouse|5|500|C002|South"]
+    directory = write_shards(tmp_path / "shards", rows, [1, 1], ['.gz', '.bz2'], encoding='latin-1')
+    assert list(iter_sharded_lines(directory)) == rows
+
+
+def test_sharded_transactions_and_aggregate_match(tmp_path, synthetic_file, synthetic_rows, synthetic_valid):
+    directory = write_shards(tmp_path / "shards", synthetic_rows, [1000, 1000], ['.gz', '.bz2'])
+    transactions = list(iter_sharded_transactions(directory, workers=2, use_processes=False))
+    assert transactions == parse_transactions(read_sales_data(synthetic_file))
+
+    aggregator, summary = sharded_aggregate(directory, workers=2, use_processes=False)
+    assert summary['final_count'] == len(synthetic_valid)
+    assert aggregator.calculate_total_revenue() == pytest.approx(build_aggregates(synthetic_valid).calculate_total_revenue())
+
+
+@pytest.mark.parametrize('suffix', ['.gz', '.bz2'])
+def test_truncated_shard_raises_without_partial_rows(tmp_path, synthetic_rows, suffix):
+    directory = tmp_path / "shards"
+    write_shards(directory, synthetic_rows, [500, 1500], ['.txt', suffix])
+    bad = directory / f"day01{suffix}"
+    data = bad.read_bytes()
+    bad.write_bytes(data[:len(data) // 2])
+
+    seen = []
+    with pytest.raises(OSError, match="day01"):
+        for line in iter_sharded_lines(str(directory), workers=2):
+            seen.append(line)
+    # The good shard before it was read in full, nothing from the broken one
+    assert seen == synthetic_rows[:500]
+
+    with pytest.raises(OSError):
+        sharded_aggregate(str(directory), workers=2, use_processes=False)
+
+
+def test_corrupt_shard_raises(tmp_path):
+    directory = tmp_path / "shards"
+    directory.mkdir()
+    (directory / "day00.gz").write_bytes(b"this is not gzip data\n")
+    with pytest.raises(OSError, match="day00.gz"):
+        list(iter_sharded_lines(str(directory)))
+
+
+def test_programming_errors_are_not_reported_as_read_failures(tmp_path, synthetic_rows):
+    directory = write_shards(tmp_path / "shards", synthetic_rows, [100], ['.gz'])
+
+    def consume(lines):
+        raise TypeError("bug in the consumer")
+
+    with pytest.raises(TypeError, match="bug in the consumer"):
+        shards._read_shard(expand_inputs(directory)[0], consume)
+
+
+@pytest.mark.parametrize('newline', ['\r', '\r\n'])
+def test_shard_line_endings_match_plain_file(tmp_path, synthetic_rows, newline):
+    path = tmp_path / "day00.gz"
+    with gzip.open(str(path), 'wb') as f:
+        f.write(newline.join([HEADER] + synthetic_rows[:200]).encode('utf-8') + newline.encode('utf-8'))
+    assert list(iter_sharded_lines(str(path))) == synthetic_rows[:200]
+
+
+def test_shards_decompressed_once(tmp_path, synthetic_rows, monkeypatch):
+    directory = write_shards(tmp_path / "shards", synthetic_rows, [1000, 1000], ['.gz', '.bz2'])
+    opened = []
+    original = shards._open_binary
+    monkeypatch.setattr(shards, '_open_binary', lambda path: opened.append(path) or original(path))
+    list(iter_sharded_lines(directory, workers=2))
+    assert sorted(opened) == expand_inputs(directory)
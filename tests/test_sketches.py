@@ -0,0 +1,98 @@
+# tests/test_sketches.py
+import random
+from collections import Counter
+
+import pytest
+
+from utils.data_processor import build_aggregates
+from utils.sketches import ApproximateAggregator, CountMinSketch, HyperLogLog, SpaceSaving
+
+
+def zipf_stream(n, items=500, seed=7):
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(items)]
+    return rng.choices([f"item{i}" for i in range(items)], weights, k=n)
+
+
+def check_bounds(summary, truth, total):
+    bound = total / summary.capacity
+    for item, weight, error, _, _ in summary.top(summary.capacity):
+        assert truth[item] <= weight <= truth[item] + error
+        assert error <= bound + 1e-9
+    held = set(summary.counters)
+    assert all(item in held for item, w in truth.items() if w > bound)
+
+
+def test_space_saving_bounds():
+    stream = zipf_stream(5000)
+    summary = SpaceSaving(capacity=50)
+    for item in stream:
+        summary.add(item)
+    check_bounds(summary, Counter(stream), len(stream))
+
+
+def test_merge_keeps_bounds_for_items_missing_on_one_side():
+    left_stream = zipf_stream(3000, seed=1)
+    right_stream = [f"other{i % 40}" for i in range(1500)] + zipf_stream(1500, seed=2)
+    left, right = SpaceSaving(capacity=40), SpaceSaving(capacity=40)
+    for item in left_stream:
+        left.add(item)
+    for item in right_stream:
+        right.add(item)
+
+    left.merge(right)
+    check_bounds(left, Counter(left_stream) + Counter(right_stream), len(left_stream) + len(right_stream))
+
+
+def test_merge_adds_other_minimum_to_one_sided_items():
+    left, right = SpaceSaving(capacity=2), SpaceSaving(capacity=2)
+    left.add('a', 10)
+    left.add('b', 4)
+    right.add('a', 3)
+    right.add('c', 5)
+    left.merge(right)
+    # 'b' may have had up to right's minimum (3) there; 'c' up to left's minimum (4)
+    assert left.counters['a'][:2] == [13, 0]
+    assert 'b' not in left.counters
+    assert left.counters['c'][:2] == [9, 4]
+
+
+def test_merge_with_room_adds_nothing():
+    left, right = SpaceSaving(capacity=10), SpaceSaving(capacity=10)
+    left.add('a', 2)
+    right.add('b', 3)
+    left.merge(right)
+    assert left.top(2) == [('b', 3, 0, 0.0, 1), ('a', 2, 0, 0.0, 1)]
+
+
+def test_hyperloglog_and_count_min():
+    hll, other = HyperLogLog(12), HyperLogLog(12)
+    for i in range(20000):
+        (hll if i % 2 else other).add(f"C{i}")
+    assert hll.merge(other).count() == pytest.approx(20000, rel=0.05)
+    with pytest.raises(ValueError):
+        hll.merge(HyperLogLog(10))
+
+    cms = CountMinSketch(epsilon=0.01, delta=0.01)
+    stream = zipf_stream(5000)
+    for item in stream:
+        cms.add(item)
+    truth = Counter(stream)
+    assert all(truth[item] <= cms.estimate(item) <= truth[item] + 0.01 * len(stream) for item in truth)
+
+
+def test_approximate_aggregator(synthetic_valid):
+    exact = build_aggregates(synthetic_valid)
+    half = len(synthetic_valid) // 2
+    approx = ApproximateAggregator(customer_capacity=20).consume(synthetic_valid[:half])
+    approx.merge(ApproximateAggregator(customer_capacity=20).consume(synthetic_valid[half:]))
+
+    assert approx.calculate_total_revenue() == pytest.approx(exact.calculate_total_revenue())
+    assert approx.unique_customers() == pytest.approx(len(exact.cust_stats), rel=0.05)
+
+    truth = exact.customer_analysis()
+    for c_id, stats in approx.top_customers(5).items():
+        assert stats['total_spent'] - stats['max_error'] <= truth[c_id]['total_spent'] + 0.01
+        assert truth[c_id]['total_spent'] <= stats['total_spent'] + 0.01
+        assert stats['purchase_count'] <= truth[c_id]['purchase_count']
+        assert stats['avg_order_value'] > 0
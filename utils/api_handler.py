@@ -1,17 +1,27 @@
-import requests
 import os
+import time
+import random
+from collections import OrderedDict
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from utils.instrumentation import record_api_call
 
 # ==========================================
 # Task 3.1: Fetch Product Details
 # ==========================================
 
-def fetch_all_products():
+PRODUCTS_URL = "https://dummyjson.com/products?limit=100"
+
+def fetch_all_products(url=PRODUCTS_URL):
     """Fetches all products from DummyJSON API."""
-    url = "https://dummyjson.com/products?limit=100"
+    import requests # Imported on first use; it is the slowest import at startup
+
     print(f"Connecting to API: {url}")
     
+    start = time.perf_counter()
     try:
         response = requests.get(url, timeout=10) # 10 second timeout
+        record_api_call(url, time.perf_counter() - start, 1, response.status_code)
         
         # Check if request was successful (Status Code 200)
         if response.status_code == 200:
@@ -24,13 +34,16 @@ def fetch_all_products():
             return []
             
     except requests.exceptions.RequestException as e:
+        record_api_call(url, time.perf_counter() - start, 1, None)
         print(f"Error: Connection failed. {e}")
         return []
 
 def create_product_mapping(api_products):
     """Creates a mapping of product IDs to product info."""
-    mapping = {}
-    
+    return update_product_mapping({}, api_products)
+
+def update_product_mapping(mapping, api_products):
+    """Adds a batch of API products to an existing mapping (in place)."""
     for p in api_products:
         p_id = p['id']
         mapping[p_id] = {
@@ -45,35 +58,52 @@ def create_product_mapping(api_products):
 # Task 3.2: Enrich Sales Data
 # ==========================================
 
+def product_numeric_id(p_id_str):
+    """Extracts the numeric API ID from a ProductID ("P101" -> 101). Returns None if malformed."""
+    # Try to strip 'P' and convert to int
+    if p_id_str.startswith('P') and p_id_str[1:].isdigit():
+        return int(p_id_str[1:])
+    return None
+
+NO_MATCH_ENRICHMENT = {
+    'API_Category': None,
+    'API_Brand': None,
+    'API_Rating': None,
+    'API_Match': False
+}
+
+def product_enrichment(p_id_str, product_mapping):
+    """Builds the four API_* enrichment fields for one ProductID."""
+    # Extract numeric ID from "P101" -> 101
+    numeric_id = product_numeric_id(p_id_str)
+    
+    # Look up in mapping
+    if numeric_id in product_mapping:
+        info = product_mapping[numeric_id]
+        return {
+            'API_Category': info['category'],
+            'API_Brand': info['brand'],
+            'API_Rating': info['rating'],
+            'API_Match': True
+        }
+    
+    # If product not found in API
+    return dict(NO_MATCH_ENRICHMENT)
+
 def enrich_sales_data(transactions, product_mapping):
     """Enriches transaction data with API product information."""
     enriched_data = []
+    enrichment_by_product = {} # ProductID -> enrichment fields, computed once per product
     
     for t in transactions:
         # Create a copy so we don't mess up original data
         record = t.copy()
         
-        # Extract numeric ID from "P101" -> 101
-        p_id_str = record['ProductID']
-        
-        numeric_id = None
-        # Try to strip 'P' and convert to int
-        if p_id_str.startswith('P') and p_id_str[1:].isdigit():
-            numeric_id = int(p_id_str[1:])
-        
-        # Look up in mapping
-        if numeric_id in product_mapping:
-            info = product_mapping[numeric_id]
-            record['API_Category'] = info['category']
-            record['API_Brand'] = info['brand']
-            record['API_Rating'] = info['rating']
-            record['API_Match'] = True
-        else:
-            # If product not found in API
-            record['API_Category'] = None
-            record['API_Brand'] = None
-            record['API_Rating'] = None
-            record['API_Match'] = False
+        enrichment = enrichment_by_product.get(record['ProductID'])
+        if enrichment is None:
+            enrichment = product_enrichment(record['ProductID'], product_mapping)
+            enrichment_by_product[record['ProductID']] = enrichment
+        record.update(enrichment)
             
         enriched_data.append(record)
         
@@ -104,4 +134,348 @@ def save_enriched_data(enriched_transactions, filename='data/enriched_sales_data
         print(f"Successfully saved enriched data to {filename}")
         
     except IOError as e:
-        print(f"Error saving file: {e}")
\ No newline at end of file
+        print(f"Error saving file: {e}")
+
+# ==========================================
+# Task 3.4: Paginated Catalog Fetch
+# ==========================================
+
+PRODUCTS_BASE_URL = "https://dummyjson.com/products"
+
+# Only the fields create_product_mapping needs ('id' is always returned)
+MAPPING_FIELDS = "title,category,brand,rating"
+
+# Status codes worth retrying: rate limiting and server-side errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def create_session(pool_size=8):
+    """Creates a requests Session whose connection pool fits pool_size threads."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def get_with_retry(session, url, params=None, timeout=10, retries=3, backoff=0.5, parse=None,
+                   headers=None, log=print):
+    """
+    GET with retries on connection errors, 429 and 5xx responses.
+    Waits a random time up to backoff * 2**attempt between attempts (full jitter).
+    If parse is given it is applied to the response, and a ValueError from it
+    (e.g. a truncated JSON body) is retried like a connection error.
+    headers are sent with every attempt; messages go to log.
+    Returns: the Response (or parse result), or None if every attempt failed.
+    """
+    import requests
+
+    start = time.perf_counter()
+    status = None
+    for attempt in range(retries + 1):
+        try:
+            response = session.get(url, params=params, headers=headers, timeout=timeout)
+            status = response.status_code
+            if status not in RETRY_STATUS_CODES:
+                result = parse(response) if parse else response
+                record_api_call(url, time.perf_counter() - start, attempt + 1, status)
+                return result
+            error = f"status code {status}"
+        except requests.exceptions.RequestException as e:
+            error = str(e)
+        except ValueError as e:
+            error = f"invalid response body ({e})"
+
+        if attempt < retries:
+            time.sleep(random.uniform(0, backoff * (2 ** attempt)))
+
+    record_api_call(url, time.perf_counter() - start, retries + 1, status)
+    log(f"Error: Giving up on {url} after {retries + 1} attempts ({error}).")
+    return None
+
+def _parse_page(response, log=print):
+    """Reads (products, total) from a page response. Returns None on a non-200 status."""
+    if response.status_code != 200:
+        log(f"Error: API returned status code {response.status_code} for {response.url}")
+        return None
+    data = response.json() # ValueError here is retried by get_with_retry
+    return data.get('products', []), data.get('total', 0)
+
+def page_params(skip, limit):
+    """Query parameters for one catalog page, selecting only the mapping fields."""
+    return {'limit': limit, 'skip': skip, 'select': MAPPING_FIELDS}
+
+def _fetch_page(session, base_url, skip, page_size, timeout, retries, log=print):
+    """Fetches one page of products. Returns: (products, total) or None."""
+    return get_with_retry(session, base_url, params=page_params(skip, page_size), timeout=timeout,
+                          retries=retries, parse=lambda response: _parse_page(response, log), log=log)
+
+def fetch_catalog_mapping(base_url=PRODUCTS_BASE_URL, page_size=100, max_workers=8,
+                          timeout=10, retries=3, mapping=None, first_page=None, log=print):
+    """
+    Pages through the whole catalog with skip/limit and builds the product mapping.
+
+    The first page tells us the catalog size and the page length the server
+    actually honours (it may cap limit below page_size); the remaining pages
+    are then fetched concurrently over one pooled Session at that length and
+    added to the mapping as each one arrives. A page that comes back short
+    is followed by a request for the rest of its range. Pages that still
+    fail after retries are skipped.
+    first_page is an already fetched (products, total) for skip 0, e.g. from
+    a conditional request, so it is not requested again. Messages go to log.
+    Returns: mapping of product IDs to product info (same shape as
+    create_product_mapping).
+    """
+    if mapping is None:
+        mapping = {}
+
+    log(f"Connecting to API: {base_url} (paginated, {max_workers} workers)")
+
+    with create_session(pool_size=max_workers) as session:
+        if first_page is None:
+            first_page = _fetch_page(session, base_url, 0, page_size, timeout, retries, log)
+            if first_page is None:
+                return mapping
+
+        products, total = first_page
+        update_product_mapping(mapping, products)
+        failed_pages = 0
+        step = len(products)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            def submit(skip, limit):
+                future = pool.submit(_fetch_page, session, base_url, skip, limit, timeout, retries, log)
+                pending[future] = (skip, limit)
+
+            pending = {}
+            for skip in (range(step, total, step) if step else ()):
+                submit(skip, step)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    skip, limit = pending.pop(future)
+                    page = future.result()
+                    if page is None:
+                        failed_pages += 1
+                        continue
+                    received = page[0]
+                    update_product_mapping(mapping, received)
+
+                    # Short page: ask for the part of the range we did not get
+                    expected = min(limit, total - skip)
+                    if 0 < len(received) < expected:
+                        submit(skip + len(received), expected - len(received))
+
+    if failed_pages:
+        log(f"Warning: {failed_pages} catalog pages could not be fetched.")
+    log(f"Success: Mapped {len(mapping)} of {total} catalog products.")
+    return mapping
+
+# ==========================================
+# Task 3.5: On-demand Product Lookup
+# ==========================================
+
+def collect_product_ids(transactions, product_ids):
+    """
+    Passes transactions through unchanged while adding their numeric
+    product IDs to the product_ids set. Use it to wrap an ingestion stream.
+    """
+    for t in transactions:
+        numeric_id = product_numeric_id(t['ProductID'])
+        if numeric_id is not None:
+            product_ids.add(numeric_id)
+        yield t
+
+def _parse_product(response):
+    """Reads (status, product) from a single-product response; only a 200 body is parsed."""
+    if response.status_code != 200:
+        return response.status_code, None
+    return response.status_code, response.json() # ValueError here is retried by get_with_retry
+
+class ProductLookup:
+    """
+    Resolves product IDs one at a time through /products/{id}, keeping
+    results in a bounded LRU map so only IDs seen in the sales data are
+    ever fetched or held in memory. IDs the API does not know (404) are
+    remembered as misses too.
+    """
+
+    def __init__(self, base_url=PRODUCTS_BASE_URL, max_size=10000, max_workers=8,
+                 timeout=10, retries=3):
+        self.base_url = base_url.rstrip('/')
+        self.max_size = max_size
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retries = retries
+        self.session = create_session(pool_size=max_workers)
+        self._cache = OrderedDict() # id -> product info, or None for a known miss
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _remember(self, product_id, info):
+        self._cache[product_id] = info
+        self._cache.move_to_end(product_id)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def _fetch_one(self, product_id):
+        """
+        Returns: (product_id, info or None, fetched_ok). A body that is not a
+        product (bad JSON after every retry, or the wrong shape) counts as a
+        transient failure, so the ID stays unresolved and is retried later.
+        """
+        url = f"{self.base_url}/{product_id}"
+        response = get_with_retry(
+            self.session, url, params={'select': MAPPING_FIELDS},
+            timeout=self.timeout, retries=self.retries, parse=_parse_product
+        )
+        if response is None:
+            return product_id, None, False
+        status, product = response
+        if status == 404:
+            return product_id, None, True
+        if status != 200:
+            print(f"Error: API returned status code {status} for product {product_id}")
+            return product_id, None, False
+
+        try:
+            info = update_product_mapping({}, [product]).get(product_id)
+        except (KeyError, TypeError, AttributeError):
+            print(f"Error: API returned an invalid product body for product {product_id}")
+            return product_id, None, False
+        return product_id, info, True
+
+    def resolve(self, product_ids):
+        """
+        Looks up the given numeric product IDs, fetching only the ones not
+        already cached, concurrently.
+        Returns: mapping of the found IDs to product info (same shape as
+        create_product_mapping), ready for enrich_sales_data.
+        """
+        mapping = {}
+        missing = []
+
+        for product_id in product_ids:
+            if product_id in self._cache:
+                self._cache.move_to_end(product_id)
+                info = self._cache[product_id]
+                if info is not None:
+                    mapping[product_id] = info
+            else:
+                missing.append(product_id)
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for product_id, info, fetched_ok in pool.map(self._fetch_one, missing):
+                    if fetched_ok:
+                        # Transient failures are not cached, so a later call retries them
+                        self._remember(product_id, info)
+                    if info is not None:
+                        mapping[product_id] = info
+
+        return mapping
+
+def enrich_on_demand(transactions, lookup, product_ids=None, batch_size=10000):
+    """
+    Yields enriched transactions (iter_enriched views), looking up only the
+    products they reference.
+
+    If product_ids were gathered during ingestion (collect_product_ids),
+    they are resolved in one call and rows stream straight through.
+    Otherwise rows are resolved batch_size at a time, so the input is
+    never held in full; IDs already in the lookup's LRU are not refetched.
+    """
+    if product_ids is not None:
+        yield from iter_enriched(transactions, lookup.resolve(product_ids))
+        return
+
+    transactions = iter(transactions)
+    while True:
+        batch_ids = set()
+        batch = list(collect_product_ids(islice(transactions, batch_size), batch_ids))
+        if not batch:
+            return
+        yield from iter_enriched(batch, lookup.resolve(batch_ids))
+
+# ==========================================
+# Task 3.6: Zero-copy Enrichment
+# ==========================================
+
+class EnrichedTransaction:
+    """
+    Read-only enriched view of a transaction.
+
+    Holds a reference to the original transaction and to an enrichment
+    record shared by every row of the same product, so nothing is copied
+    per row. Supports the dictionary reads used on enriched data
+    (t['API_Match'], t.get(...), keys()).
+    """
+
+    __slots__ = ('transaction', 'enrichment')
+
+    def __init__(self, transaction, enrichment):
+        self.transaction = transaction
+        self.enrichment = enrichment
+
+    def __getitem__(self, key):
+        if key in self.enrichment:
+            return self.enrichment[key]
+        return self.transaction[key]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in self.enrichment or key in self.transaction
+
+    def keys(self):
+        return list(self.transaction.keys()) + [k for k in self.enrichment if k not in self.transaction]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def to_dict(self):
+        """Materializes a plain dictionary (what enrich_sales_data returns per row)."""
+        record = dict(self.transaction)
+        record.update(self.enrichment)
+        return record
+
+    copy = to_dict
+
+    def __repr__(self):
+        return f"EnrichedTransaction({self.to_dict()!r})"
+
+def iter_enriched(transactions, product_mapping):
+    """
+    Streaming, allocation-light version of enrich_sales_data.
+    Each ProductID is resolved once; every row gets a two-slot view that
+    points at the original transaction and the shared enrichment record.
+    """
+    enrichment_by_product = {}
+
+    for t in transactions:
+        p_id_str = t['ProductID']
+        enrichment = enrichment_by_product.get(p_id_str)
+        if enrichment is None:
+            enrichment = product_enrichment(p_id_str, product_mapping)
+            enrichment_by_product[p_id_str] = enrichment
+        yield EnrichedTransaction(t, enrichment)
+
+def enrich_sales_data_shared(transactions, product_mapping):
+    """List form of iter_enriched; drop-in for enrich_sales_data when rows are only read."""
+    return list(iter_enriched(transactions, product_mapping))
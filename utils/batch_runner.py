@@ -0,0 +1,157 @@
+# utils/batch_runner.py
+import os
+import re
+import json
+
+from utils.file_handler import is_valid_transaction, new_filter_summary
+from utils.data_processor import SalesAggregator
+from utils.money import to_minor
+
+# ==========================================
+# Task 6.1: Batch Filter Variants
+# ==========================================
+
+def load_variants(config_path):
+    """
+    Reads filter variants from a JSON config: either a list of variants or
+    {"variants": [...]}. Each variant may set name, region, min_amount and
+    max_amount. Repeated names get a numeric suffix (see unique_variant_names).
+    Raises: OSError if the file cannot be read, ValueError if it is not
+    valid JSON or not a list of variant objects.
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    variants = config.get('variants', []) if isinstance(config, dict) else config
+    if not isinstance(variants, list) or not all(isinstance(v, dict) for v in variants):
+        raise ValueError("expected a list of variant objects")
+    return unique_variant_names([normalize_variant(v, i) for i, v in enumerate(variants)])
+
+# Written alongside the variant reports by write_variant_reports
+RESERVED_NAMES = {'index'}
+
+def unique_variant_names(variants):
+    """
+    Renames variants whose report file would clash with an earlier one
+    ("north", "north_2", ...). Names are compared case-insensitively, as
+    they would be on a case-insensitive filesystem.
+    Returns: the variants list (renamed in place).
+    """
+    taken = set(RESERVED_NAMES)
+    for variant in variants:
+        base = name = variant['name']
+        suffix = 1
+        while name.lower() in taken:
+            suffix += 1
+            name = f"{base}_{suffix}"
+        if name != base:
+            print(f"Warning: Variant name '{base}' is already used, writing it as '{name}'.")
+            variant['name'] = name
+        taken.add(name.lower())
+    return variants
+
+def normalize_variant(variant, index=0):
+    """Fills in defaults and a file-safe name for one filter variant."""
+    region = variant.get('region') or None
+    min_amount = variant.get('min_amount')
+    max_amount = variant.get('max_amount')
+
+    name = variant.get('name')
+    if not name:
+        parts = [region or 'all']
+        if min_amount is not None:
+            parts.append(f"min{min_amount}")
+        if max_amount is not None:
+            parts.append(f"max{max_amount}")
+        name = '_'.join(str(p) for p in parts)
+
+    return {
+        'name': re.sub(r'[^A-Za-z0-9_.-]+', '_', str(name)) or f"variant{index}",
+        'region': region,
+        'min_amount': float(min_amount) if min_amount is not None else None,
+        'max_amount': float(max_amount) if max_amount is not None else None
+    }
+
+def run_filter_variants(transactions, variants, exact=False):
+    """
+    Validates each transaction once and feeds it to every filter variant
+    it passes, all in a single pass over the data (list or stream).
+    With exact=True amounts, bounds and sums use integer paise.
+    Returns: list of (variant, SalesAggregator, filter_summary)
+    """
+    results = [(v, SalesAggregator(exact), new_filter_summary()) for v in variants]
+
+    if exact:
+        bounds = [dict(v, min_amount=None if v['min_amount'] is None else to_minor(v['min_amount']),
+                       max_amount=None if v['max_amount'] is None else to_minor(v['max_amount']))
+                  for v in variants]
+    else:
+        bounds = variants
+
+    for t in transactions:
+        valid = is_valid_transaction(t)
+        amount = t['Quantity'] * (to_minor(t['UnitPrice']) if exact else t['UnitPrice'])
+
+        for (_, aggregator, summary), variant in zip(results, bounds):
+            summary['total_input'] += 1
+            if not valid:
+                summary['invalid'] += 1
+                continue
+            if variant['region'] and t['Region'] != variant['region']:
+                summary['filtered_by_region'] += 1
+                continue
+            if variant['min_amount'] is not None and amount < variant['min_amount']:
+                summary['filtered_by_amount'] += 1
+                continue
+            if variant['max_amount'] is not None and amount > variant['max_amount']:
+                summary['filtered_by_amount'] += 1
+                continue
+
+            summary['final_count'] += 1
+            aggregator.add(t)
+
+    return results
+
+def variant_report(variant, aggregator, summary, top_n=5, low_threshold=10):
+    """Collects every data_processor result for one variant into a JSON-ready dictionary."""
+    peak_date, peak_revenue, peak_count = aggregator.find_peak_sales_day()
+    return {
+        'variant': variant,
+        'filter_summary': summary,
+        'total_revenue': aggregator.calculate_total_revenue(),
+        'region_wise_sales': aggregator.region_wise_sales(),
+        'top_selling_products': aggregator.top_selling_products(top_n),
+        'customer_analysis': aggregator.customer_analysis(),
+        'daily_sales_trend': aggregator.daily_sales_trend(),
+        'peak_sales_day': {'date': peak_date, 'revenue': peak_revenue, 'transaction_count': peak_count},
+        'low_performing_products': aggregator.low_performing_products(low_threshold)
+    }
+
+def write_variant_reports(results, output_dir, filter_options=None):
+    """
+    Writes one JSON report per variant plus an index with the filter-option
+    metadata. Returns: list of written file paths.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+
+    for variant, aggregator, summary in results:
+        path = os.path.join(output_dir, f"{variant['name']}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(variant_report(variant, aggregator, summary), f, indent=2)
+        written.append(path)
+
+    index = {
+        'variants': [os.path.basename(p) for p in written],
+        'filter_options': None if filter_options is None else {
+            'regions': sorted(filter_options['regions']),
+            'min_amount': filter_options['min_amount'],
+            'max_amount': filter_options['max_amount']
+        }
+    }
+    index_path = os.path.join(output_dir, 'index.json')
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    written.append(index_path)
+
+    return written
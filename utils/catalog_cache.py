@@ -0,0 +1,193 @@
+# utils/catalog_cache.py
+import os
+import json
+import time
+import atexit
+import hashlib
+import threading
+
+from utils.api_handler import (
+    PRODUCTS_BASE_URL, create_product_mapping, create_session, fetch_catalog_mapping,
+    get_with_retry, page_params
+)
+
+# ==========================================
+# Task 3.3: Persistent Product Catalog Cache
+# ==========================================
+
+DEFAULT_CACHE_DIR = os.path.join('data', '.cache', 'catalog')
+
+# Background revalidations started by fetch_catalog_cached, keyed by URL
+_refresh_threads = {}
+_refresh_lock = threading.Lock()
+
+def _cache_path(url, cache_dir):
+    """One cache file per endpoint, named after a hash of the URL."""
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{key}.json")
+
+def load_cache_entry(url, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Loads the cached catalog for an endpoint. The file is plain JSON, so a
+    corrupt or tampered cache can only ever be a cache miss.
+    Returns: entry dictionary, or None if missing or unreadable.
+    """
+    path = _cache_path(url, cache_dir)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError, RecursionError):
+        return None
+
+    if (not isinstance(entry, dict) or entry.get('url') != url
+            or not isinstance(entry.get('fetched_at'), (int, float))
+            or not isinstance(entry.get('products'), list)):
+        return None
+    try:
+        # Not stored: JSON would turn the integer product IDs into strings
+        entry['mapping'] = create_product_mapping(entry['products'])
+    except (KeyError, TypeError, AttributeError):
+        return None
+    return entry
+
+def save_cache_entry(entry, cache_dir=DEFAULT_CACHE_DIR, log=print):
+    """Writes a cache entry as JSON, atomically (temp file + rename). The mapping is rebuilt on load."""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(entry['url'], cache_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({k: v for k, v in entry.items() if k != 'mapping'}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        log(f"Warning: Could not write catalog cache. {e}")
+
+def _revalidate(url, entry, timeout, cache_dir, log=print, page_size=100, max_workers=8, retries=3):
+    """
+    Fetches the catalog with fetch_catalog_mapping. The first page is requested
+    with the stored ETag / Last-Modified validators; a 304 keeps the cached
+    products, anything else is paged through in full.
+    Returns: the fresh or revalidated entry, or None if the fetch failed.
+    """
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    def parse(response):
+        if response.status_code in (200, 304):
+            first_page = None
+            if response.status_code == 200:
+                data = response.json() # ValueError here is retried by get_with_retry
+                first_page = data.get('products', []), data.get('total', 0)
+            return response.status_code, response.headers, first_page
+        log(f"Error: API returned status code {response.status_code}")
+        return None
+
+    with create_session(pool_size=1) as session:
+        result = get_with_retry(session, url, params=page_params(0, page_size), timeout=timeout,
+                                retries=retries, parse=parse, headers=headers, log=log)
+    if result is None:
+        return None
+    status, response_headers, first_page = result
+
+    if status == 304:
+        if not entry:
+            log("Error: API returned 304 without a cached catalog")
+            return None
+        # Not modified: keep the stored products and mapping, just refresh the clock
+        entry = dict(entry, fetched_at=time.time())
+        save_cache_entry(entry, cache_dir, log)
+        return entry
+
+    mapping = fetch_catalog_mapping(url, page_size, max_workers, timeout, retries,
+                                    first_page=first_page, log=log)
+    complete = len(mapping) >= first_page[1]
+    entry = {
+        'url': url,
+        'fetched_at': time.time(),
+        # A partial catalog keeps no validators, so the next run fetches it in full
+        'etag': response_headers.get('ETag') if complete else None,
+        'last_modified': response_headers.get('Last-Modified') if complete else None,
+        'products': [dict(info, id=product_id) for product_id, info in mapping.items()],
+        'mapping': mapping
+    }
+    save_cache_entry(entry, cache_dir, log)
+    return entry
+
+def fetch_catalog_cached(url=PRODUCTS_BASE_URL, ttl=3600, stale_while_revalidate=0,
+                         cache_dir=DEFAULT_CACHE_DIR, timeout=10, log=print, retries=3):
+    """
+    Returns the product catalog for an endpoint, using the on-disk cache.
+
+    - Younger than ttl seconds: served from disk, no network.
+    - Within ttl + stale_while_revalidate: served from disk while a
+      background thread revalidates it for the next run.
+    - Otherwise revalidated with If-None-Match / If-Modified-Since, and
+      fetched page by page (fetch_catalog_mapping) when it has changed.
+    - If the fetch fails, the last cached copy is used however old it is.
+
+    Progress and error messages go to log (print by default); callers
+    running this in a background thread can pass something that defers
+    them, e.g. until interactive prompts are done.
+
+    Returns: entry dictionary with 'products' and 'mapping' (the
+    create_product_mapping result), or None if nothing could be loaded.
+    """
+    entry = load_cache_entry(url, cache_dir)
+
+    if entry:
+        age = time.time() - entry['fetched_at']
+        if age < ttl:
+            log(f"Using cached catalog for {url} (age {age:.0f}s).")
+            return entry
+        if age < ttl + stale_while_revalidate:
+            log(f"Using stale catalog for {url} (age {age:.0f}s), refreshing in background.")
+            _start_refresh(url, entry, timeout, cache_dir, log, retries)
+            return entry
+
+    fresh = _revalidate(url, entry, timeout, cache_dir, log, retries=retries)
+    if fresh:
+        log(f"Success: Catalog has {len(fresh['products'])} products.")
+        return fresh
+
+    if entry:
+        log("Warning: Using last cached catalog after fetch failure.")
+        return entry
+    return None
+
+def _start_refresh(url, entry, timeout, cache_dir, log=print, retries=3):
+    """Starts one background revalidation per URL (skipped if one is running)."""
+    with _refresh_lock:
+        running = _refresh_threads.get(url)
+        if running and running.is_alive():
+            return
+        thread = threading.Thread(target=_revalidate, args=(url, entry, timeout, cache_dir, log),
+                                  kwargs={'retries': retries}, daemon=True)
+        _refresh_threads[url] = thread
+        thread.start()
+
+def wait_for_refresh(timeout=10):
+    """
+    Waits up to timeout seconds for background revalidations to finish.
+    Registered with atexit, so a short CLI run still stores the refreshed
+    catalog instead of killing the daemon thread mid-request.
+    Returns: True if none are still running.
+    """
+    deadline = time.monotonic() + timeout
+    with _refresh_lock:
+        threads = list(_refresh_threads.values())
+    for thread in threads:
+        thread.join(max(deadline - time.monotonic(), 0))
+    return not any(thread.is_alive() for thread in threads)
+
+atexit.register(wait_for_refresh)
+
+def load_product_mapping(url=PRODUCTS_BASE_URL, ttl=3600, stale_while_revalidate=0,
+                         cache_dir=DEFAULT_CACHE_DIR, timeout=10):
+    """Cached equivalent of fetch_catalog_mapping()."""
+    entry = fetch_catalog_cached(url, ttl, stale_while_revalidate, cache_dir, timeout)
+    return entry['mapping'] if entry else {}
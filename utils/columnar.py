@@ -0,0 +1,254 @@
+# utils/columnar.py
+import numpy as np
+
+# ==========================================
+# Task 4.1: Columnar Transaction Store
+# ==========================================
+
+class ColumnarTransactions:
+    """
+    Column-oriented version of the parsed transaction list.
+
+    Numbers live in typed NumPy arrays (quantity, unit_price, amount).
+    Region, ProductName, ProductID, CustomerID and Date are dictionary
+    encoded: an int32 code column per field plus a list of the distinct
+    values, in order of first appearance.
+    """
+
+    # Field name -> attribute prefix for the dictionary-encoded columns
+    CATEGORICAL_FIELDS = {
+        'Region': 'region',
+        'ProductName': 'product',
+        'ProductID': 'product_id',
+        'CustomerID': 'customer',
+        'Date': 'date',
+    }
+
+    def __init__(self, transaction_ids, quantity, unit_price, codes, categories):
+        self.transaction_ids = np.asarray(transaction_ids, dtype=np.str_)
+        self.quantity = np.asarray(quantity, dtype=np.int64)
+        self.unit_price = np.asarray(unit_price, dtype=np.float64)
+        self.amount = self.quantity * self.unit_price
+
+        # codes / categories are keyed by attribute prefix ('region', 'product', ...)
+        for prefix in self.CATEGORICAL_FIELDS.values():
+            setattr(self, prefix + '_codes', np.asarray(codes[prefix], dtype=np.int32))
+            setattr(self, prefix + '_values', list(categories[prefix]))
+
+    @classmethod
+    def from_transactions(cls, transactions):
+        """Builds the store from transaction dictionaries (a list or a stream)."""
+        transaction_ids = []
+        quantity = []
+        unit_price = []
+        lookups = {prefix: {} for prefix in cls.CATEGORICAL_FIELDS.values()}
+        codes = {prefix: [] for prefix in cls.CATEGORICAL_FIELDS.values()}
+
+        for t in transactions:
+            transaction_ids.append(t['TransactionID'])
+            quantity.append(t['Quantity'])
+            unit_price.append(t['UnitPrice'])
+            for field, prefix in cls.CATEGORICAL_FIELDS.items():
+                lookup = lookups[prefix]
+                value = t[field]
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(lookup)
+                codes[prefix].append(code)
+
+        categories = {prefix: list(lookup) for prefix, lookup in lookups.items()}
+        return cls(transaction_ids, quantity, unit_price, codes, categories)
+
+    def __len__(self):
+        return len(self.quantity)
+
+    def take(self, mask):
+        """Returns a new store with the rows selected by a boolean mask or index array."""
+        codes = {prefix: getattr(self, prefix + '_codes')[mask] for prefix in self.CATEGORICAL_FIELDS.values()}
+        categories = {prefix: getattr(self, prefix + '_values') for prefix in self.CATEGORICAL_FIELDS.values()}
+        return ColumnarTransactions(
+            self.transaction_ids[mask], self.quantity[mask], self.unit_price[mask], codes, categories
+        )
+
+    def to_transactions(self):
+        """Converts back to the list-of-dictionaries form used elsewhere."""
+        decoded = {
+            field: [getattr(self, prefix + '_values')[c] for c in getattr(self, prefix + '_codes').tolist()]
+            for field, prefix in self.CATEGORICAL_FIELDS.items()
+        }
+        records = []
+        for i, (tid, qty, price) in enumerate(zip(self.transaction_ids.tolist(), self.quantity.tolist(), self.unit_price.tolist())):
+            records.append({
+                'TransactionID': tid,
+                'Date': decoded['Date'][i],
+                'ProductID': decoded['ProductID'][i],
+                'ProductName': decoded['ProductName'][i],
+                'Quantity': qty,
+                'UnitPrice': price,
+                'CustomerID': decoded['CustomerID'][i],
+                'Region': decoded['Region'][i]
+            })
+        return records
+
+def _category_prefix_mask(values, codes, prefix):
+    """Row mask for 'value starts with prefix', evaluated once per distinct value."""
+    ok = np.array([v.startswith(prefix) for v in values], dtype=bool)
+    if not len(ok):
+        return np.zeros(len(codes), dtype=bool)
+    return ok[codes]
+
+def _group_sum(codes, weights, size):
+    # bincount adds in row order, so float sums match the pure-Python loops
+    return np.bincount(codes, weights=weights, minlength=size)
+
+def _group_count(codes, size):
+    return np.bincount(codes, minlength=size)
+
+def _first_seen(codes, size):
+    """Row index of each group's first appearance (len(codes) for absent groups)."""
+    first = np.full(size, len(codes), dtype=np.int64)
+    present, index = np.unique(codes, return_index=True)
+    first[present] = index
+    return first
+
+def _order_by(values, codes, present, descending):
+    """
+    Indices of present groups sorted by value, ties kept in order of first
+    appearance, which is what sorted() over the dict-based results gives.
+    """
+    idx = np.flatnonzero(present)
+    first = _first_seen(codes, len(values))[idx]
+    key = -values[idx] if descending else values[idx]
+    return idx[np.lexsort((first, key))]
+
+# ==========================================
+# Task 4.2: Vectorized Validation and Analytics
+# ==========================================
+
+def validate_and_filter(store, region=None, min_amount=None, max_amount=None):
+    """
+    Vectorized version of file_handler.validate_and_filter.
+    Returns: tuple (filtered_store, invalid_count, filter_summary)
+    """
+    summary = {
+        'total_input': len(store),
+        'invalid': 0,
+        'filtered_by_region': 0,
+        'filtered_by_amount': 0,
+        'final_count': 0
+    }
+
+    valid = np.char.startswith(store.transaction_ids, 'T')
+    valid &= _category_prefix_mask(store.product_id_values, store.product_id_codes, 'P')
+    valid &= _category_prefix_mask(store.customer_values, store.customer_codes, 'C')
+    valid &= store.quantity > 0
+    valid &= store.unit_price > 0
+    summary['invalid'] = int(len(store) - valid.sum())
+
+    keep = valid
+    if region:
+        in_region = np.array([r == region for r in store.region_values], dtype=bool)
+        in_region = in_region[store.region_codes] if len(in_region) else np.zeros(len(store), dtype=bool)
+        summary['filtered_by_region'] = int((keep & ~in_region).sum())
+        keep = keep & in_region
+
+    in_amount = np.ones(len(store), dtype=bool)
+    if min_amount is not None:
+        in_amount &= store.amount >= min_amount
+    if max_amount is not None:
+        in_amount &= store.amount <= max_amount
+    summary['filtered_by_amount'] = int((keep & ~in_amount).sum())
+    keep = keep & in_amount
+
+    summary['final_count'] = int(keep.sum())
+    return store.take(keep), summary['invalid'], summary
+
+def calculate_total_revenue(store):
+    """Calculates total revenue from all transactions."""
+    return round(float(_group_sum(np.zeros(len(store), dtype=np.int32), store.amount, 1)[0]), 2)
+
+def region_wise_sales(store):
+    """Analyzes sales by region with percentages."""
+    size = len(store.region_values)
+    totals = _group_sum(store.region_codes, store.amount, size)
+    counts = _group_count(store.region_codes, size)
+    grand_total = calculate_total_revenue(store)
+
+    final_stats = {}
+    for i in _order_by(totals, store.region_codes, counts > 0, True).tolist():
+        final_stats[store.region_values[i]] = {
+            'total_sales': round(float(totals[i]), 2),
+            'transaction_count': int(counts[i]),
+            'percentage': round(float(totals[i]) / grand_total * 100, 2)
+        }
+    return final_stats
+
+def product_totals(store):
+    size = len(store.product_values)
+    qty = np.bincount(store.product_codes, weights=store.quantity, minlength=size).astype(np.int64)
+    revenue = _group_sum(store.product_codes, store.amount, size)
+    present = _group_count(store.product_codes, size) > 0
+    return qty, revenue, present
+
+def top_selling_products(store, n=5):
+    """Finds top n products by total quantity sold."""
+    qty, revenue, present = product_totals(store)
+    order = _order_by(qty, store.product_codes, present, True)[:n]
+    return [(store.product_values[i], int(qty[i]), round(float(revenue[i]), 2)) for i in order.tolist()]
+
+def low_performing_products(store, threshold=10):
+    """Identifies products with total quantity < threshold."""
+    qty, revenue, present = product_totals(store)
+    order = _order_by(qty, store.product_codes, present & (qty < threshold), False)
+    return [(store.product_values[i], int(qty[i]), round(float(revenue[i]), 2)) for i in order.tolist()]
+
+def _distinct_pairs(outer_codes, inner_codes, inner_size):
+    """Sorted unique (outer, inner) code pairs, as two arrays."""
+    combined = np.unique(outer_codes.astype(np.int64) * inner_size + inner_codes)
+    return combined // inner_size, combined % inner_size
+
+def customer_analysis(store):
+    """Analyzes customer purchase patterns."""
+    size = len(store.customer_values)
+    spent = _group_sum(store.customer_codes, store.amount, size)
+    counts = _group_count(store.customer_codes, size)
+
+    # Distinct products per customer via sorted unique (customer, product) pairs
+    pair_cust, pair_prod = _distinct_pairs(store.customer_codes, store.product_codes, max(len(store.product_values), 1))
+    bounds = np.searchsorted(pair_cust, np.arange(size + 1))
+    pair_prod = pair_prod.tolist()
+
+    final_stats = {}
+    for i in _order_by(spent, store.customer_codes, counts > 0, True).tolist():
+        final_stats[store.customer_values[i]] = {
+            'total_spent': round(float(spent[i]), 2),
+            'purchase_count': int(counts[i]),
+            'avg_order_value': round(float(spent[i]) / int(counts[i]), 2),
+            'products_bought': [store.product_values[p] for p in pair_prod[bounds[i]:bounds[i + 1]]]
+        }
+    return final_stats
+
+def daily_sales_trend(store):
+    """Analyzes sales trends by date."""
+    size = len(store.date_values)
+    revenue = _group_sum(store.date_codes, store.amount, size)
+    counts = _group_count(store.date_codes, size)
+    pair_date, _ = _distinct_pairs(store.date_codes, store.customer_codes, max(len(store.customer_values), 1))
+    unique_customers = np.bincount(pair_date, minlength=size)
+
+    final_daily = {}
+    for i in sorted(np.flatnonzero(counts).tolist(), key=lambda c: store.date_values[c]):
+        final_daily[store.date_values[i]] = {
+            'revenue': round(float(revenue[i]), 2),
+            'transaction_count': int(counts[i]),
+            'unique_customers': int(unique_customers[i])
+        }
+    return final_daily
+
+def find_peak_sales_day(store):
+    """Identifies the date with highest revenue."""
+    daily_data = daily_sales_trend(store)
+    if not daily_data:
+        return (None, -1.0, 0)
+    best_date = max(daily_data, key=lambda d: daily_data[d]['revenue'])
+    return (best_date, daily_data[best_date]['revenue'], daily_data[best_date]['transaction_count'])
@@ -1,4 +1,6 @@
 # utils/data_processor.py
+from utils.records import Transaction
+from utils.money import to_minor, from_minor
 
 # ==========================================
 # Task 2.1: Sales Summary Calculator
@@ -14,12 +16,14 @@ def calculate_total_revenue(transactions):
 def region_wise_sales(transactions):
     """Analyzes sales by region with percentages."""
     region_stats = {}
-    grand_total = calculate_total_revenue(transactions)
+    grand_total = 0.0
     
-    # 1. Aggregate data
+    # 1. Aggregate data (grand total accumulated in the same pass so this
+    # also works on a one-shot stream of transactions)
     for t in transactions:
         region = t['Region']
         amount = t['Quantity'] * t['UnitPrice']
+        grand_total += amount
         
         if region not in region_stats:
             region_stats[region] = {'total_sales': 0.0, 'transaction_count': 0}
@@ -28,6 +32,10 @@ def region_wise_sales(transactions):
         region_stats[region]['transaction_count'] += 1
         
     # 2. Calculate percentages and format
+    return format_region_stats(region_stats, round(grand_total, 2))
+
+def format_region_stats(region_stats, grand_total):
+    """Adds percentages and sorts regions by revenue (descending)."""
     # Note: We can't sort a dictionary in place, so we'll return a sorted dictionary
     # However, standard dicts preserve insertion order in modern Python.
     
@@ -40,17 +48,18 @@ def region_wise_sales(transactions):
     
     final_stats = {}
     for region, stats in sorted_regions:
-        stats['percentage'] = round((stats['total_sales'] / grand_total * 100), 2)
-        stats['total_sales'] = round(stats['total_sales'], 2)
-        final_stats[region] = stats
+        final_stats[region] = {
+            'total_sales': round(stats['total_sales'], 2),
+            'transaction_count': stats['transaction_count'],
+            'percentage': round((stats['total_sales'] / grand_total * 100), 2)
+        }
         
     return final_stats
 
-def top_selling_products(transactions, n=5):
-    """Finds top n products by total quantity sold."""
+def product_totals(transactions):
+    """Aggregates quantity and revenue per product name."""
     product_stats = {}
     
-    # Aggregate
     for t in transactions:
         name = t['ProductName']
         qty = t['Quantity']
@@ -62,6 +71,14 @@ def top_selling_products(transactions, n=5):
         product_stats[name]['qty'] += qty
         product_stats[name]['revenue'] += revenue
         
+    return product_stats
+
+def top_selling_products(transactions, n=5):
+    """Finds top n products by total quantity sold."""
+    return format_top_products(product_totals(transactions), n)
+
+def format_top_products(product_stats, n):
+    """Returns the top n products by quantity sold."""
     # Convert to list of tuples
     product_list = []
     for name, stats in product_stats.items():
@@ -92,7 +109,10 @@ def customer_analysis(transactions):
         cust_stats[c_id]['purchase_count'] += 1
         cust_stats[c_id]['products_set'].add(product)
         
-    # Final formatting
+    return format_customer_stats(cust_stats)
+
+def format_customer_stats(cust_stats):
+    """Turns raw per-customer totals into the reported dict."""
     final_stats = {}
     
     # Sort customers by total_spent descending
@@ -136,6 +156,10 @@ def daily_sales_trend(transactions):
         daily_stats[date]['transaction_count'] += 1
         daily_stats[date]['customers_set'].add(c_id)
         
+    return format_daily_stats(daily_stats)
+
+def format_daily_stats(daily_stats):
+    """Returns daily stats ordered by date."""
     # Sort by Date (strings "YYYY-MM-DD" sort correctly alphabetically)
     sorted_dates = sorted(daily_stats.keys())
     
@@ -152,8 +176,10 @@ def daily_sales_trend(transactions):
 
 def find_peak_sales_day(transactions):
     """Identifies the date with highest revenue."""
-    daily_data = daily_sales_trend(transactions)
-    
+    return peak_day(daily_sales_trend(transactions))
+
+def peak_day(daily_data):
+    """Returns (date, revenue, transaction_count) for the highest-revenue day."""
     best_date = None
     max_rev = -1.0
     count = 0
@@ -172,21 +198,12 @@ def find_peak_sales_day(transactions):
 
 def low_performing_products(transactions, threshold=10):
     """Identifies products with total quantity < threshold."""
-    # We can reuse our logic from top_selling_products to get the totals first
-    # but we need all products, not just top N
-    
-    product_stats = {}
-    for t in transactions:
-        name = t['ProductName']
-        qty = t['Quantity']
-        revenue = t['Quantity'] * t['UnitPrice']
-        
-        if name not in product_stats:
-            product_stats[name] = {'qty': 0, 'revenue': 0.0}
-        
-        product_stats[name]['qty'] += qty
-        product_stats[name]['revenue'] += revenue
-        
+    # Same per-product totals as top_selling_products, but we need all
+    # products, not just top N
+    return format_low_performers(product_totals(transactions), threshold)
+
+def format_low_performers(product_stats, threshold):
+    """Returns products whose quantity is below threshold."""
     # Filter and Format
     low_performers = []
     for name, stats in product_stats.items():
@@ -196,4 +213,154 @@ def low_performing_products(transactions, threshold=10):
     # Sort by Quantity ascending (lowest first)
     low_performers.sort(key=lambda x: x[1])
     
-    return low_performers
\ No newline at end of file
+    return low_performers
+
+# ==========================================
+# Task 2.4: Single-pass Aggregation Engine
+# ==========================================
+
+class SalesAggregator:
+    """
+    Builds every summary above in one pass over the data.
+
+    Feed it transactions (a list or a stream) with add()/consume(), then call
+    the methods named after the module functions; they return the same
+    shapes from the shared state without touching the data again.
+    Aggregators built over separate chunks can be combined with merge().
+
+    With exact=True money is accumulated as integer paise (utils/money.py):
+    sums are exact, so partials merge to identical results in any order.
+    Results are still returned in rupees.
+    """
+
+    def __init__(self, exact=False):
+        self.exact = exact
+        self._zero = 0 if exact else 0.0
+        self.total_revenue = self._zero
+        self.transaction_count = 0
+        self.region_stats = {}
+        self.product_stats = {}
+        self.cust_stats = {}
+        self.daily_stats = {}
+
+    def add(self, t):
+        """Adds a single transaction to every summary."""
+        if t.__class__ is Transaction:
+            # Attribute reads and the precomputed amount
+            qty = t.quantity
+            amount = t.amount_minor if self.exact else t.amount
+            name = t.product_name
+            c_id = t.customer_id
+            region_name = t.region
+            date = t.date
+        else:
+            qty = t['Quantity']
+            amount = qty * to_minor(t['UnitPrice']) if self.exact else qty * t['UnitPrice']
+            name = t['ProductName']
+            c_id = t['CustomerID']
+            region_name = t['Region']
+            date = t['Date']
+
+        zero = self._zero
+        self.total_revenue += amount
+        self.transaction_count += 1
+
+        region = self.region_stats.get(region_name)
+        if region is None:
+            region = self.region_stats[region_name] = {'total_sales': zero, 'transaction_count': 0}
+        region['total_sales'] += amount
+        region['transaction_count'] += 1
+
+        product = self.product_stats.get(name)
+        if product is None:
+            product = self.product_stats[name] = {'qty': 0, 'revenue': zero}
+        product['qty'] += qty
+        product['revenue'] += amount
+
+        customer = self.cust_stats.get(c_id)
+        if customer is None:
+            customer = self.cust_stats[c_id] = {'total_spent': zero, 'purchase_count': 0, 'products_set': set()}
+        customer['total_spent'] += amount
+        customer['purchase_count'] += 1
+        customer['products_set'].add(name)
+
+        day = self.daily_stats.get(date)
+        if day is None:
+            day = self.daily_stats[date] = {'revenue': zero, 'transaction_count': 0, 'customers_set': set()}
+        day['revenue'] += amount
+        day['transaction_count'] += 1
+        day['customers_set'].add(c_id)
+
+    def consume(self, transactions):
+        """Adds every transaction from an iterable. Returns self."""
+        add = self.add
+        for t in transactions:
+            add(t)
+        return self
+
+    def merge(self, other):
+        """Folds another aggregator's partial results into this one. Returns self."""
+        if self.exact != other.exact:
+            raise ValueError("Cannot merge exact and float SalesAggregators")
+        zero = self._zero
+        self.total_revenue += other.total_revenue
+        self.transaction_count += other.transaction_count
+
+        for key, stats in other.region_stats.items():
+            mine = self.region_stats.setdefault(key, {'total_sales': zero, 'transaction_count': 0})
+            mine['total_sales'] += stats['total_sales']
+            mine['transaction_count'] += stats['transaction_count']
+
+        for key, stats in other.product_stats.items():
+            mine = self.product_stats.setdefault(key, {'qty': 0, 'revenue': zero})
+            mine['qty'] += stats['qty']
+            mine['revenue'] += stats['revenue']
+
+        for key, stats in other.cust_stats.items():
+            mine = self.cust_stats.setdefault(key, {'total_spent': zero, 'purchase_count': 0, 'products_set': set()})
+            mine['total_spent'] += stats['total_spent']
+            mine['purchase_count'] += stats['purchase_count']
+            mine['products_set'] |= stats['products_set']
+
+        for key, stats in other.daily_stats.items():
+            mine = self.daily_stats.setdefault(key, {'revenue': zero, 'transaction_count': 0, 'customers_set': set()})
+            mine['revenue'] += stats['revenue']
+            mine['transaction_count'] += stats['transaction_count']
+            mine['customers_set'] |= stats['customers_set']
+
+        return self
+
+    # --- Results (same shapes as the module functions) ---
+
+    def _in_rupees(self, stats, field):
+        """Stats with the money field converted from paise (exact mode only)."""
+        if not self.exact:
+            return stats
+        return {key: dict(s, **{field: from_minor(s[field])}) for key, s in stats.items()}
+
+    def calculate_total_revenue(self):
+        if self.exact:
+            return from_minor(self.total_revenue)
+        return round(self.total_revenue, 2)
+
+    def region_wise_sales(self):
+        return format_region_stats(self._in_rupees(self.region_stats, 'total_sales'), self.calculate_total_revenue())
+
+    def top_selling_products(self, n=5):
+        return format_top_products(self._in_rupees(self.product_stats, 'revenue'), n)
+
+    def customer_analysis(self):
+        return format_customer_stats(self._in_rupees(self.cust_stats, 'total_spent'))
+
+    def daily_sales_trend(self):
+        return format_daily_stats(self._in_rupees(self.daily_stats, 'revenue'))
+
+    def find_peak_sales_day(self):
+        return peak_day(self.daily_sales_trend())
+
+    def low_performing_products(self, threshold=10):
+        return format_low_performers(self._in_rupees(self.product_stats, 'revenue'), threshold)
+
+def build_aggregates(transactions, exact=False):
+    """Runs a SalesAggregator over transactions in a single pass."""
+    return SalesAggregator(exact).consume(transactions)
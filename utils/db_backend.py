@@ -0,0 +1,267 @@
+# utils/db_backend.py
+import sqlite3
+from contextlib import contextmanager
+
+from utils.data_processor import (
+    format_region_stats, format_top_products, format_customer_stats,
+    format_daily_stats, format_low_performers
+)
+
+# ==========================================
+# Task 8.1: SQL Storage Backend
+# ==========================================
+
+# Separates values inside GROUP_CONCAT results (ASCII unit separator)
+LIST_SEPARATOR = '\x1f'
+
+# MySQL error 1061 (ER_DUP_KEYNAME): the index already exists
+MYSQL_DUPLICATE_KEY_NAME = 1061
+
+# Dialect differences between SQLite (local/tests) and MySQL
+DIALECTS = {
+    'sqlite': {
+        'placeholder': '?',
+        'row_id': 'row_id INTEGER PRIMARY KEY AUTOINCREMENT',
+        'create_index': 'CREATE INDEX IF NOT EXISTS {name} ON sales {columns}',
+        'group_concat': 'GROUP_CONCAT({column}, char(31))',
+        'session_setup': (),
+    },
+    'mysql': {
+        'placeholder': '%s',
+        'row_id': 'row_id BIGINT AUTO_INCREMENT PRIMARY KEY',
+        'create_index': 'CREATE INDEX {name} ON sales {columns}', # No IF NOT EXISTS in MySQL
+        'group_concat': "GROUP_CONCAT({column} SEPARATOR '" + LIST_SEPARATOR + "')",
+        # The default limit (1024 bytes) would silently truncate product lists
+        'session_setup': ('SET SESSION group_concat_max_len = 16777216',),
+    },
+}
+
+TABLE_COLUMNS = [
+    'transaction_id', 'sale_date', 'product_id', 'product_name', 'quantity', 'unit_price',
+    'amount', 'customer_id', 'region', 'api_category', 'api_brand', 'api_rating', 'api_match'
+]
+
+# Each index covers the GROUP BY key plus the summed columns
+INDEXES = {
+    'idx_sales_region': '(region, amount)',
+    'idx_sales_date': '(sale_date, customer_id, amount)',
+    'idx_sales_product': '(product_name, quantity, amount)',
+    'idx_sales_customer': '(customer_id, amount, product_name)',
+}
+
+class SalesDatabase:
+    """
+    Stores parsed (optionally enriched) transactions in SQL and answers the
+    data_processor questions with GROUP BY queries, so the data never has
+    to fit in memory. Results use the data_processor shapes; ties are
+    ordered by first insertion, like the in-memory functions.
+    Every query method accepts region / min_amount / max_amount filters.
+    """
+
+    def __init__(self, dialect, connect, release, db_error):
+        self.dialect = dialect
+        self.placeholder = DIALECTS[dialect]['placeholder']
+        self._connect = connect
+        self._release = release
+        self.db_error = db_error
+
+    @classmethod
+    def sqlite(cls, path=':memory:'):
+        """SQLite backend; one shared connection (no server needed)."""
+        connection = sqlite3.connect(path, check_same_thread=False)
+        return cls('sqlite', lambda: connection, lambda conn: None, sqlite3.Error)
+
+    @classmethod
+    def mysql(cls, pool_size=5, pool_name='sales_pool', **connect_args):
+        """MySQL backend over a mysql-connector connection pool."""
+        import mysql.connector
+        from mysql.connector import pooling
+
+        pool = pooling.MySQLConnectionPool(pool_name=pool_name, pool_size=pool_size, **connect_args)
+        # Closing a pooled connection hands it back to the pool
+        return cls('mysql', pool.get_connection, lambda conn: conn.close(), mysql.connector.Error)
+
+    @contextmanager
+    def connection(self):
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def _query(self, sql, params=(), setup=()):
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            for statement in setup:
+                cursor.execute(statement)
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            cursor.close()
+        return rows
+
+    # --- Schema and loading ---
+
+    def create_schema(self):
+        """Creates the sales table and its indexes if they do not exist."""
+        ddl = f"""
+            CREATE TABLE IF NOT EXISTS sales (
+                {DIALECTS[self.dialect]['row_id']},
+                transaction_id VARCHAR(32) NOT NULL,
+                sale_date VARCHAR(10) NOT NULL,
+                product_id VARCHAR(32) NOT NULL,
+                product_name VARCHAR(255) NOT NULL,
+                quantity INTEGER NOT NULL,
+                unit_price DOUBLE NOT NULL,
+                amount DOUBLE NOT NULL,
+                customer_id VARCHAR(32) NOT NULL,
+                region VARCHAR(64) NOT NULL,
+                api_category VARCHAR(255),
+                api_brand VARCHAR(255),
+                api_rating DOUBLE,
+                api_match SMALLINT
+            )
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(ddl)
+            for name, columns in INDEXES.items():
+                try:
+                    cursor.execute(DIALECTS[self.dialect]['create_index'].format(name=name, columns=columns))
+                except self.db_error as e:
+                    if getattr(e, 'errno', None) != MYSQL_DUPLICATE_KEY_NAME:
+                        raise
+            conn.commit()
+            cursor.close()
+
+    def bulk_load(self, transactions, batch_size=10000):
+        """
+        Inserts transactions with batched executemany (a list or a stream).
+        Enrichment fields are stored when present.
+        Returns: number of rows inserted.
+        """
+        placeholders = ', '.join([self.placeholder] * len(TABLE_COLUMNS))
+        sql = f"INSERT INTO sales ({', '.join(TABLE_COLUMNS)}) VALUES ({placeholders})"
+        inserted = 0
+
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            batch = []
+
+            for t in transactions:
+                match = t.get('API_Match')
+                batch.append((
+                    t['TransactionID'], t['Date'], t['ProductID'], t['ProductName'],
+                    t['Quantity'], t['UnitPrice'], t['Quantity'] * t['UnitPrice'],
+                    t['CustomerID'], t['Region'],
+                    t.get('API_Category'), t.get('API_Brand'), t.get('API_Rating'),
+                    None if match is None else int(match)
+                ))
+                if len(batch) >= batch_size:
+                    cursor.executemany(sql, batch)
+                    conn.commit()
+                    inserted += len(batch)
+                    batch = []
+
+            if batch:
+                cursor.executemany(sql, batch)
+                conn.commit()
+                inserted += len(batch)
+            cursor.close()
+
+        return inserted
+
+    # --- Pushed-down aggregations ---
+
+    def _where(self, region=None, min_amount=None, max_amount=None):
+        clauses, params = [], []
+        if region:
+            clauses.append(f"region = {self.placeholder}")
+            params.append(region)
+        if min_amount is not None:
+            clauses.append(f"amount >= {self.placeholder}")
+            params.append(min_amount)
+        if max_amount is not None:
+            clauses.append(f"amount <= {self.placeholder}")
+            params.append(max_amount)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def calculate_total_revenue(self, **filters):
+        where, params = self._where(**filters)
+        (total,), = self._query(f"SELECT COALESCE(SUM(amount), 0) FROM sales{where}", params)
+        return round(float(total), 2)
+
+    def region_wise_sales(self, **filters):
+        where, params = self._where(**filters)
+        rows = self._query(
+            f"SELECT region, SUM(amount), COUNT(*) FROM sales{where} "
+            f"GROUP BY region ORDER BY MIN(row_id)", params
+        )
+        region_stats = {r: {'total_sales': float(s), 'transaction_count': c} for r, s, c in rows}
+        grand_total = round(sum(stats['total_sales'] for stats in region_stats.values()), 2)
+        return format_region_stats(region_stats, grand_total)
+
+    def _product_stats(self, having='', having_params=(), order='', limit=None, **filters):
+        where, params = self._where(**filters)
+        sql = (
+            f"SELECT product_name, SUM(quantity), SUM(amount) FROM sales{where} "
+            f"GROUP BY product_name{having} ORDER BY {order}MIN(row_id)"
+        )
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        rows = self._query(sql, params + list(having_params))
+        return {name: {'qty': int(q), 'revenue': float(r)} for name, q, r in rows}
+
+    def top_selling_products(self, n=5, **filters):
+        stats = self._product_stats(order='SUM(quantity) DESC, ', limit=n, **filters)
+        return format_top_products(stats, n)
+
+    def low_performing_products(self, threshold=10, **filters):
+        stats = self._product_stats(
+            having=f" HAVING SUM(quantity) < {self.placeholder}", having_params=(threshold,),
+            order='SUM(quantity), ', **filters
+        )
+        return format_low_performers(stats, threshold)
+
+    def customer_analysis(self, **filters):
+        where, params = self._where(**filters)
+        dialect = DIALECTS[self.dialect]
+        # Distinct products are listed per customer in SQL: one row per customer comes back
+        products = dialect['group_concat'].format(column='product_name')
+        rows = self._query(
+            f"SELECT t.customer_id, t.spent, t.purchases, p.products FROM "
+            f"(SELECT customer_id, SUM(amount) AS spent, COUNT(*) AS purchases, MIN(row_id) AS first_row "
+            f"FROM sales{where} GROUP BY customer_id) t "
+            f"JOIN (SELECT customer_id, {products} AS products FROM "
+            f"(SELECT DISTINCT customer_id, product_name FROM sales{where}) d GROUP BY customer_id) p "
+            f"ON p.customer_id = t.customer_id ORDER BY t.first_row",
+            params + params, setup=dialect['session_setup']
+        )
+        cust_stats = {
+            c: {'total_spent': float(s), 'purchase_count': n, 'products_set': p.split(LIST_SEPARATOR)}
+            for c, s, n, p in rows
+        }
+        return format_customer_stats(cust_stats)
+
+    def daily_sales_trend(self, **filters):
+        where, params = self._where(**filters)
+        rows = self._query(
+            f"SELECT sale_date, SUM(amount), COUNT(*), COUNT(DISTINCT customer_id) FROM sales{where} "
+            f"GROUP BY sale_date", params
+        )
+        # format_daily_stats only needs the size of the customer set
+        daily_stats = {
+            d: {'revenue': float(r), 'transaction_count': n, 'customers_set': range(u)}
+            for d, r, n, u in rows
+        }
+        return format_daily_stats(daily_stats)
+
+    def find_peak_sales_day(self, **filters):
+        where, params = self._where(**filters)
+        rows = self._query(
+            f"SELECT sale_date, SUM(amount), COUNT(*) FROM sales{where} "
+            f"GROUP BY sale_date ORDER BY SUM(amount) DESC, sale_date LIMIT 1", params
+        )
+        if not rows:
+            return (None, -1.0, 0)
+        date, revenue, count = rows[0]
+        return (date, round(float(revenue), 2), count)
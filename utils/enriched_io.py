@@ -0,0 +1,250 @@
+# utils/enriched_io.py
+import os
+import sys
+import json
+import math
+import struct
+from array import array
+
+# ==========================================
+# Task 3.7: Bulk and Columnar Enriched Output
+# ==========================================
+
+ENRICHED_FIELDS = [
+    'TransactionID', 'Date', 'ProductID', 'ProductName', 'Quantity', 'UnitPrice',
+    'CustomerID', 'Region', 'API_Category', 'API_Brand', 'API_Rating', 'API_Match'
+]
+
+# Column storage: 'str' columns are dictionary encoded (uint32 codes + value list);
+# 'text' columns hold unique values, stored as uint32 byte lengths + UTF-8 data
+COLUMN_TYPES = {
+    'TransactionID': 'text',
+    'Date': 'str',
+    'ProductID': 'str',
+    'ProductName': 'str',
+    'Quantity': 'int',
+    'UnitPrice': 'float',
+    'CustomerID': 'str',
+    'Region': 'str',
+    'API_Category': 'str',
+    'API_Brand': 'str',
+    'API_Rating': 'float', # None is stored as NaN
+    'API_Match': 'bool'
+}
+
+TYPECODES = {'str': 'I', 'text': 'I', 'int': 'q', 'float': 'd', 'bool': 'b'}
+
+COLUMNAR_MAGIC = b'SALESCOL2\n'
+
+def format_enriched_line(t):
+    """Same text layout as api_handler.save_enriched_data."""
+    # Handle None values for string formatting
+    cat = t['API_Category'] if t['API_Category'] else 'N/A'
+    brand = t['API_Brand'] if t['API_Brand'] else 'N/A'
+    rating = str(t['API_Rating']) if t['API_Rating'] is not None else '0.0'
+    match = str(t['API_Match'])
+
+    return f"{t['TransactionID']}|{t['Date']}|{t['ProductID']}|{t['ProductName']}|{t['Quantity']}|{t['UnitPrice']}|{t['CustomerID']}|{t['Region']}|{cat}|{brand}|{rating}|{match}\n"
+
+def batched(rows, batch_size):
+    """Yields lists of up to batch_size rows."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def save_enriched_data_bulk(enriched_transactions, filename='data/enriched_sales_data.txt',
+                            batch_size=10000, buffer_size=1 << 20):
+    """
+    Bulk version of save_enriched_data: same file contents, but rows are
+    formatted in batches and written with one large buffered write per batch.
+    Accepts a list or a stream. Returns: number of rows written.
+    """
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    rows_written = 0
+
+    try:
+        with open(filename, 'w', encoding='utf-8', buffering=buffer_size) as f:
+            f.write('|'.join(ENRICHED_FIELDS) + '\n')
+
+            for batch in batched(enriched_transactions, batch_size):
+                f.write(''.join([format_enriched_line(t) for t in batch]))
+                rows_written += len(batch)
+
+        print(f"Successfully saved enriched data to {filename}")
+
+    except IOError as e:
+        print(f"Error saving file: {e}")
+
+    return rows_written
+
+def load_enriched_data(filename='data/enriched_sales_data.txt'):
+    """
+    Reads a file written by save_enriched_data back into typed dictionaries,
+    without the cleanup work of read_sales_data + parse_transactions.
+    'N/A' strings come back as None. The file writes a missing rating as
+    0.0, so API_Match is used as the null mask: unmatched rows get None.
+    """
+    records = []
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        next(f, None) # Skip header
+
+        for line in f:
+            parts = line.rstrip('\n').split('|')
+            if len(parts) != len(ENRICHED_FIELDS):
+                continue
+
+            matched = parts[11] == 'True'
+            records.append({
+                'TransactionID': parts[0],
+                'Date': parts[1],
+                'ProductID': parts[2],
+                'ProductName': parts[3],
+                'Quantity': int(parts[4]),
+                'UnitPrice': float(parts[5]),
+                'CustomerID': parts[6],
+                'Region': parts[7],
+                'API_Category': None if parts[8] == 'N/A' else parts[8],
+                'API_Brand': None if parts[9] == 'N/A' else parts[9],
+                'API_Rating': float(parts[10]) if matched else None,
+                'API_Match': matched
+            })
+
+    return records
+
+# --- Columnar binary format ---
+#
+# File layout:  MAGIC, then row groups until EOF.
+# Row group:    uint32 length of JSON metadata, the metadata, then each
+#               column's raw array bytes in ENRICHED_FIELDS order ('text'
+#               columns: the lengths array, then text_bytes of UTF-8 data).
+# Metadata:     {"rows": n, "byteorder": "little", "columns": {name:
+#               {"nbytes": ..., "values": [...], "text_bytes": ...}}} where
+#               "values" is the string dictionary for 'str' columns.
+
+def _encode_row_group(batch):
+    meta = {'rows': len(batch), 'byteorder': sys.byteorder, 'columns': {}}
+    payloads = []
+
+    for field in ENRICHED_FIELDS:
+        kind = COLUMN_TYPES[field]
+        column = array(TYPECODES[kind])
+        column_meta = {}
+
+        if kind == 'str':
+            lookup = {}
+            for t in batch:
+                value = t[field]
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(lookup)
+                column.append(code)
+            column_meta['values'] = list(lookup)
+        elif kind == 'text':
+            encoded = [t[field].encode('utf-8') for t in batch]
+            column.extend(map(len, encoded))
+            text = b''.join(encoded)
+            column_meta['text_bytes'] = len(text)
+        elif kind == 'float':
+            column.extend(math.nan if t[field] is None else t[field] for t in batch)
+        elif kind == 'bool':
+            column.extend(1 if t[field] else 0 for t in batch)
+        else:
+            column.extend(t[field] for t in batch)
+
+        payload = column.tobytes()
+        column_meta['nbytes'] = len(payload)
+        meta['columns'][field] = column_meta
+        payloads.append(payload)
+        if kind == 'text':
+            payloads.append(text)
+
+    meta_bytes = json.dumps(meta, separators=(',', ':')).encode('utf-8')
+    return struct.pack('<I', len(meta_bytes)) + meta_bytes + b''.join(payloads)
+
+def save_enriched_columnar(enriched_transactions, filename='data/enriched_sales_data.col',
+                           batch_size=65536):
+    """
+    Writes enriched transactions in a compact columnar binary format:
+    typed arrays per column, repeating strings dictionary encoded per row
+    group, TransactionID (unique per row) stored as plain UTF-8.
+    Accepts a list or a stream. Returns: number of rows written.
+    """
+    os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+    rows_written = 0
+
+    try:
+        with open(filename, 'wb') as f:
+            f.write(COLUMNAR_MAGIC)
+            for batch in batched(enriched_transactions, batch_size):
+                f.write(_encode_row_group(batch))
+                rows_written += len(batch)
+
+        print(f"Successfully saved columnar data to {filename}")
+
+    except IOError as e:
+        print(f"Error saving file: {e}")
+
+    return rows_written
+
+def iter_columnar_row_groups(filename):
+    """
+    Reads a columnar file one row group at a time.
+    Yields: dict of column name -> list of decoded values.
+    """
+    with open(filename, 'rb') as f:
+        if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError(f"'{filename}' is not a columnar sales file")
+
+        while True:
+            prefix = f.read(4)
+            if not prefix:
+                break
+            if len(prefix) < 4:
+                raise ValueError(f"'{filename}' is truncated")
+            (meta_len,) = struct.unpack('<I', prefix)
+            meta = json.loads(f.read(meta_len).decode('utf-8'))
+
+            columns = {}
+            for field in ENRICHED_FIELDS:
+                column_meta = meta['columns'][field]
+                kind = COLUMN_TYPES[field]
+                column = array(TYPECODES[kind])
+                column.frombytes(f.read(column_meta['nbytes']))
+                if meta['byteorder'] != sys.byteorder:
+                    column.byteswap()
+
+                if kind == 'str':
+                    values = column_meta['values']
+                    columns[field] = [values[c] for c in column]
+                elif kind == 'text':
+                    text = f.read(column_meta['text_bytes'])
+                    values = []
+                    position = 0
+                    for length in column:
+                        values.append(text[position:position + length].decode('utf-8'))
+                        position += length
+                    columns[field] = values
+                elif kind == 'float':
+                    columns[field] = [None if math.isnan(v) else v for v in column]
+                elif kind == 'bool':
+                    columns[field] = [bool(v) for v in column]
+                else:
+                    columns[field] = column.tolist()
+
+            yield columns
+
+def iter_enriched_columnar(filename):
+    """Streams a columnar file back as enriched transaction dictionaries."""
+    for columns in iter_columnar_row_groups(filename):
+        for row in zip(*(columns[field] for field in ENRICHED_FIELDS)):
+            yield dict(zip(ENRICHED_FIELDS, row))
+
+def load_enriched_columnar(filename='data/enriched_sales_data.col'):
+    """Loads a columnar file into a list of enriched transaction dictionaries."""
+    return list(iter_enriched_columnar(filename))
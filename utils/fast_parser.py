@@ -0,0 +1,340 @@
+# utils/fast_parser.py
+import os
+import mmap
+import numpy as np
+
+from utils.file_handler import decode_line, detect_encoding, parse_line, parse_price
+
+# ==========================================
+# Task 1.4: Memory-mapped Fast-path Parser
+# ==========================================
+
+BLOCK_SIZE = 4 << 20 # bytes of the mapping scanned at a time
+MAX_FIELD_WIDTH = 256 # wider fields send the block down the per-line path
+
+PIPE, NEWLINE, COMMA, DOT, SPACE, TAB = 124, 10, 44, 46, 32, 9
+
+# Field index -> (output name, cleanup) for the string fields
+STRING_FIELDS = [
+    (0, 'TransactionID', lambda s: s.strip()),
+    (1, 'Date', lambda s: s.strip()),
+    (2, 'ProductID', lambda s: s.strip()),
+    # Handle commas in ProductName (replace with space)
+    (3, 'ProductName', lambda s: s.replace(',', ' ').strip()),
+    (6, 'CustomerID', lambda s: s.strip()),
+    (7, 'Region', lambda s: s.strip()),
+]
+
+def _iter_blocks(filename):
+    """
+    Yields blocks of the memory-mapped file, header removed, each ending on a
+    line break. '\\r\\n' and lone '\\r' are normalized to '\\n', matching the
+    universal newlines that read_sales_data gets from text mode.
+    """
+    if os.path.getsize(filename) == 0:
+        return
+
+    with open(filename, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            position = 0
+            tail = b''
+            header_skipped = False
+
+            while position < size:
+                block = mm[position:position + BLOCK_SIZE]
+                position += len(block)
+
+                if position < size:
+                    # Keep the partial last line for the next block
+                    cut = block.rfind(b'\n') + 1
+                    if cut == 0:
+                        tail += block
+                        continue
+                    block, next_tail = tail + block[:cut], block[cut:]
+                else:
+                    block, next_tail = tail + block + b'\n', b''
+                tail = next_tail
+
+                if b'\r' in block:
+                    block = block.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+                if not header_skipped:
+                    block = block[block.find(b'\n') + 1:]
+                    header_skipped = True
+
+                if block:
+                    yield block
+
+def _gather(windows, starts, ends):
+    """
+    Copies variable-length byte spans into a zero-padded (rows, width) matrix.
+    windows is a sliding-window view of the block, so each row is one slice.
+    """
+    lengths = ends - starts
+    width = int(lengths.max()) if len(lengths) else 0
+    inside = np.arange(width) < lengths[:, None]
+    matrix = windows[starts, :width]
+    matrix *= inside # zero the bytes past each field's end
+    return matrix, inside
+
+def _parse_numbers(matrix, inside, allow_dot):
+    """
+    Vectorized int()/float() of numeric fields after removing commas.
+    Handles the plain cases (digits, thousands commas, one '.', surrounding
+    spaces); rows it is not certain about are flagged for the exact
+    per-row path.
+    Returns: (values, fast_ok)
+    """
+    rows, width = matrix.shape
+    positions = np.arange(width)
+
+    if width == 0:
+        # Every field is empty; let the per-row path reject them
+        return np.zeros(rows, dtype=np.float64 if allow_dot else np.int64), np.zeros(rows, dtype=bool)
+
+    is_digit = inside & (matrix >= 48) & (matrix <= 57)
+    is_dot = inside & (matrix == DOT) if allow_dot else np.zeros_like(inside)
+    is_space = inside & ((matrix == SPACE) | (matrix == TAB))
+    other = inside & ~(is_digit | is_dot | is_space | (matrix == COMMA))
+
+    digit_count = is_digit.sum(axis=1)
+    fast_ok = ~other.any(axis=1) & (digit_count > 0) & (digit_count <= 15)
+
+    # No spaces between the first and last digit/dot ("1 2" is not a number)
+    core = is_digit | is_dot
+    first = np.argmax(core, axis=1)
+    last = width - 1 - np.argmax(core[:, ::-1], axis=1)
+    between = (positions >= first[:, None]) & (positions <= last[:, None])
+    fast_ok &= ~(is_space & between).any(axis=1)
+
+    mantissa = np.zeros(rows, dtype=np.int64)
+    for j in range(width):
+        mantissa = np.where(is_digit[:, j], mantissa * 10 + (matrix[:, j].astype(np.int64) - 48), mantissa)
+
+    if not allow_dot:
+        return mantissa, fast_ok
+
+    dot_count = is_dot.sum(axis=1)
+    fast_ok &= dot_count <= 1
+    dot_position = np.where(dot_count == 1, np.argmax(is_dot, axis=1), width)
+    fraction_digits = (is_digit & (positions > dot_position[:, None])).sum(axis=1)
+
+    # Both operands are exact doubles (<= 15 digits), so the correctly rounded
+    # quotient is the same float that float() gives for the decimal string
+    return mantissa / np.power(10.0, fraction_digits), fast_ok
+
+def _slow_number(raw, convert, encoding):
+    """Exact parse_transactions rules for one numeric field. Returns None if invalid."""
+    try:
+        return convert(decode_line(raw, encoding).replace(',', '').strip())
+    except ValueError:
+        return None
+
+def _row_keys(matrix):
+    """
+    One uint64 key per row. Exact for fields up to 8 bytes; wider fields are
+    hashed, and the caller checks for collisions.
+    Returns: (keys, exact, words)
+    """
+    rows, width = matrix.shape
+    padded_width = -(-width // 8) * 8
+    if padded_width != width:
+        matrix = np.concatenate((matrix, np.zeros((rows, padded_width - width), dtype=np.uint8)), axis=1)
+    words = np.ascontiguousarray(matrix).view(np.uint64)
+
+    keys = words[:, 0].copy()
+    for j in range(1, words.shape[1]):
+        keys *= np.uint64(0x100000001B3)
+        keys ^= words[:, j]
+    return keys, words.shape[1] == 1, words
+
+def _dictionary_encode(matrix, encoding, clean):
+    """
+    Dictionary-encodes a padded byte matrix without creating per-row objects.
+    Only distinct values are decoded and cleaned.
+    Returns: (values, codes)
+    """
+    rows, width = matrix.shape
+    if width == 0:
+        return [clean('')], np.zeros(rows, dtype=np.int32)
+
+    keys, exact, words = _row_keys(matrix)
+    _, first_rows, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(rows)
+    if not exact and not (words == words[first_rows[inverse]]).all():
+        # Hash collision: fall back to sorting the raw bytes themselves
+        fixed = np.ascontiguousarray(matrix).view(f'S{width}').reshape(rows)
+        _, first_rows, inverse = np.unique(fixed, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(rows)
+
+    raw_values = np.ascontiguousarray(matrix[first_rows]).view(f'S{width}').reshape(len(first_rows))
+
+    # Raw spellings that clean to the same string share one code
+    values = []
+    lookup = {}
+    remap = np.empty(len(first_rows), dtype=np.int32)
+    for i, raw in enumerate(raw_values.tolist()):
+        value = clean(decode_line(raw, encoding))
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(values)
+            values.append(value)
+        remap[i] = code
+
+    return values, remap[inverse]
+
+def _parse_block_by_line(block, encoding):
+    """Per-line path using parse_transactions' own rules, for unusual blocks."""
+    records = [t for t in map(parse_line, (decode_line(line, encoding) for line in block.split(b'\n'))) if t is not None]
+
+    parsed = {
+        'Quantity': np.array([t['Quantity'] for t in records], dtype=np.int64),
+        'UnitPrice': np.array([t['UnitPrice'] for t in records], dtype=np.float64),
+    }
+    for _, name, _ in STRING_FIELDS:
+        lookup = {}
+        codes = np.array([lookup.setdefault(t[name], len(lookup)) for t in records], dtype=np.int32)
+        parsed[name] = (list(lookup), codes)
+    return parsed
+
+def _parse_block(block, encoding):
+    """
+    Parses one block of lines into columns by scanning bytes for delimiters.
+    Returns: dict with 'Quantity' / 'UnitPrice' arrays and, for each string
+    field, a (values, codes) pair local to the block.
+    """
+    if b'\x00' in block:
+        # NUL bytes would be lost by the fixed-width byte views below
+        return _parse_block_by_line(block, encoding)
+
+    buf = np.frombuffer(block, dtype=np.uint8)
+    # Padding lets every field start have a full-width window after it
+    windows = np.lib.stride_tricks.sliding_window_view(
+        np.frombuffer(block + bytes(MAX_FIELD_WIDTH), dtype=np.uint8), MAX_FIELD_WIDTH
+    )
+    line_ends = np.flatnonzero(buf == NEWLINE)
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+
+    # Only lines with exactly 7 pipes (8 fields) are candidates
+    pipes = np.flatnonzero(buf == PIPE)
+    pipe_line = np.searchsorted(line_ends, pipes)
+    pipe_counts = np.bincount(pipe_line, minlength=len(line_ends))
+    first_pipe = np.concatenate(([0], np.cumsum(pipe_counts)[:-1]))
+    candidates = np.flatnonzero(pipe_counts == 7)
+
+    line_pipes = pipes[first_pipe[candidates][:, None] + np.arange(7)]
+    field_starts = np.column_stack((line_starts[candidates], line_pipes + 1))
+    field_ends = np.column_stack((line_pipes, line_ends[candidates]))
+
+    if len(candidates) and int((field_ends - field_starts).max()) > MAX_FIELD_WIDTH:
+        return _parse_block_by_line(block, encoding)
+
+    # Numeric fields: vectorized where possible, exact per-row fallback otherwise
+    keep = np.ones(len(candidates), dtype=bool)
+    parsed = {}
+    for index, name, convert, allow_dot in ((4, 'Quantity', int, False), (5, 'UnitPrice', parse_price, True)):
+        matrix, inside = _gather(windows, field_starts[:, index], field_ends[:, index])
+        values, fast_ok = _parse_numbers(matrix, inside, allow_dot)
+        if not allow_dot:
+            values = values.astype(np.int64)
+
+        for row in np.flatnonzero(~fast_ok).tolist():
+            raw = block[field_starts[row, index]:field_ends[row, index]]
+            value = _slow_number(raw, convert, encoding)
+            if value is None:
+                keep[row] = False
+            else:
+                values[row] = value
+        parsed[name] = values
+
+    parsed['Quantity'] = parsed['Quantity'][keep]
+    parsed['UnitPrice'] = parsed['UnitPrice'][keep]
+    field_starts = field_starts[keep]
+    field_ends = field_ends[keep]
+
+    for index, name, clean in STRING_FIELDS:
+        matrix, _ = _gather(windows, field_starts[:, index], field_ends[:, index])
+        parsed[name] = _dictionary_encode(matrix, encoding, clean)
+
+    return parsed
+
+def _resolve_encoding(filename, encoding):
+    if not os.path.exists(filename):
+        print(f"Error: The file '{filename}' was not found.")
+        return None
+    if encoding is None:
+        encoding = detect_encoding(filename)
+        if encoding is None:
+            print("Error: Failed to read file with supported encodings.")
+    return encoding
+
+def iter_parsed_blocks(filename, encoding=None):
+    """
+    Memory-maps a sales file and yields one parsed block at a time (see
+    _parse_block). Rows are accepted or rejected exactly as
+    parse_transactions(read_sales_data(filename)) would.
+    """
+    encoding = _resolve_encoding(filename, encoding)
+    if encoding is None:
+        return
+
+    for block in _iter_blocks(filename):
+        yield _parse_block(block, encoding)
+
+def iter_fast_transactions(filename, encoding=None):
+    """Record form of the fast parser: yields the usual transaction dictionaries."""
+    for parsed in iter_parsed_blocks(filename, encoding):
+        columns = {}
+        for _, name, _ in STRING_FIELDS:
+            values, codes = parsed[name]
+            columns[name] = [values[c] for c in codes.tolist()]
+
+        for row in zip(columns['TransactionID'], columns['Date'], columns['ProductID'],
+                       columns['ProductName'], parsed['Quantity'].tolist(), parsed['UnitPrice'].tolist(),
+                       columns['CustomerID'], columns['Region']):
+            yield {
+                'TransactionID': row[0],
+                'Date': row[1],
+                'ProductID': row[2],
+                'ProductName': row[3],
+                'Quantity': row[4],
+                'UnitPrice': row[5],
+                'CustomerID': row[6],
+                'Region': row[7]
+            }
+
+def parse_file_columnar(filename, encoding=None):
+    """
+    Parses a sales file straight into a ColumnarTransactions store, with
+    block dictionaries merged into one dictionary per field.
+    """
+    from utils.columnar import ColumnarTransactions
+
+    prefixes = {name: prefix for name, prefix in ColumnarTransactions.CATEGORICAL_FIELDS.items()}
+    lookups = {name: {} for name in prefixes}
+    transaction_ids, quantity, unit_price = [], [], []
+    codes = {name: [] for name in prefixes}
+
+    for parsed in iter_parsed_blocks(filename, encoding):
+        quantity.append(parsed['Quantity'])
+        unit_price.append(parsed['UnitPrice'])
+
+        values, local_codes = parsed['TransactionID']
+        transaction_ids.append(np.array(values, dtype=np.str_)[local_codes])
+
+        for name, lookup in lookups.items():
+            values, local_codes = parsed[name]
+            remap = np.array([lookup.setdefault(v, len(lookup)) for v in values], dtype=np.int32)
+            codes[name].append(remap[local_codes])
+
+    def _concat(parts, dtype):
+        return np.concatenate(parts) if parts else np.array([], dtype=dtype)
+
+    return ColumnarTransactions(
+        _concat(transaction_ids, np.str_),
+        _concat(quantity, np.int64),
+        _concat(unit_price, np.float64),
+        {prefixes[name]: _concat(parts, np.int32) for name, parts in codes.items()},
+        {prefixes[name]: list(lookup) for name, lookup in lookups.items()}
+    )
@@ -1,4 +1,9 @@
 import os
+import math
+import codecs
+
+from utils.records import Transaction, to_records
+from utils.money import to_minor
 
 # ==========================================
 # Task 1.1: Read Sales Data with Encoding Handling
@@ -44,120 +49,297 @@ def read_sales_data(filename):
     print("Error: Failed to read file with supported encodings.")
     return []
 
+ENCODINGS = ('utf-8', 'latin-1', 'cp1252')
+READ_BLOCK_SIZE = 1 << 20 # bytes read at a time by iter_raw_lines
+
+def detect_encoding(filename, encodings_to_try=ENCODINGS, sample_size=1 << 20):
+    """
+    Guesses the file encoding from the first sample_size bytes.
+    Only a bounded prefix is decoded, so this costs the same for any file
+    size; lines further on that do not fit are handled by decode_line.
+    Returns: encoding name, or None if none of them work.
+    """
+    with open(filename, 'rb') as file:
+        sample = file.read(sample_size)
+    for encoding in encodings_to_try:
+        try:
+            # Not final: the sample may end in the middle of a multi-byte character
+            codecs.getincrementaldecoder(encoding)().decode(sample)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return None
+
+def decode_line(raw, encoding='utf-8'):
+    """
+    Decodes raw bytes with encoding, falling back through ENCODINGS on the
+    first UnicodeDecodeError (latin-1 accepts any byte, so this never fails).
+    """
+    try:
+        return raw.decode(encoding)
+    except UnicodeDecodeError:
+        for fallback in ENCODINGS:
+            if fallback != encoding:
+                try:
+                    return raw.decode(fallback)
+                except UnicodeDecodeError:
+                    continue
+        raise
+
+def iter_raw_lines(file, block_size=READ_BLOCK_SIZE):
+    """
+    Yields the lines of a binary file as bytes, without line breaks.
+    '\\r\\n' and lone '\\r' count as line breaks too, matching the universal
+    newlines read_sales_data gets from text mode.
+    """
+    tail = b''
+    while True:
+        block = file.read(block_size)
+        if not block:
+            break
+        block = tail + block
+        # A trailing '\r' may be the first half of a '\r\n' split across reads
+        carry = b'\r' if block.endswith(b'\r') else b''
+        if carry:
+            block = block[:-1]
+        if b'\r' in block:
+            block = block.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+        lines = block.split(b'\n')
+        tail = lines.pop() + carry
+        yield from lines
+    if tail:
+        yield tail.rstrip(b'\r')
+
+def iter_sales_data(filename, encoding=None):
+    """
+    Streaming version of read_sales_data.
+    Yields cleaned raw lines one at a time instead of building a list.
+    Lines are decoded as they are read (utf-8 unless encoding is given);
+    a line that does not decode falls back to the next encoding, so there
+    is no separate pass over the file to detect the encoding first.
+    """
+    if not os.path.exists(filename):
+        print(f"Error: The file '{filename}' was not found.")
+        return
+
+    encoding = encoding or ENCODINGS[0]
+    with open(filename, 'rb') as file:
+        lines = iter_raw_lines(file)
+        # Skip header
+        next(lines, None)
+
+        for raw in lines:
+            cleaned_line = decode_line(raw, encoding).strip()
+            if cleaned_line:
+                yield cleaned_line
+
 # ==========================================
 # Task 1.2: Parse and Clean Data
 # ==========================================
-def parse_transactions(raw_lines):
+def parse_price(text):
+    """float() for a cleaned UnitPrice field. nan and infinities are not prices, so they raise ValueError too."""
+    price = float(text)
+    if not math.isfinite(price):
+        raise ValueError(f"Non-finite price: {text!r}")
+    return price
+
+def parse_line(line, compact=False):
+    """
+    Parses one raw line into a transaction dictionary (or a Transaction
+    record when compact is set).
+    Returns None for malformed lines.
+    """
+    parts = line.split('|')
+
+    # Skip rows with incorrect number of fields (expecting 8)
+    if len(parts) != 8:
+        return None
+
+    # Unpack and Clean fields
+    try:
+        # Handle commas in numeric fields (e.g., "1,500" -> "1500")
+        qty_str = parts[4].replace(',', '').strip()
+        price_str = parts[5].replace(',', '').strip()
+
+        # Convert types
+        quantity = int(qty_str)
+        unit_price = float(price_str)
+    except ValueError:
+        # Skip if type conversion fails
+        return None
+    if not math.isfinite(unit_price):
+        return None # nan and infinities are not prices (see parse_price)
+
+    # Handle commas in ProductName (replace with space)
+    product_name = parts[3].replace(',', ' ').strip()
+
+    if compact:
+        return Transaction(parts[0].strip(), parts[1].strip(), parts[2].strip(), product_name,
+                           quantity, unit_price, parts[6].strip(), parts[7].strip())
+
+    return {
+        'TransactionID': parts[0].strip(),
+        'Date': parts[1].strip(),
+        'ProductID': parts[2].strip(),
+        'ProductName': product_name,
+        'Quantity': quantity,
+        'UnitPrice': unit_price,
+        'CustomerID': parts[6].strip(),
+        'Region': parts[7].strip()
+    }
+
+def parse_transactions(raw_lines, compact=False):
     """
     Parses raw lines into clean list of dictionaries.
+    With compact=True rows are Transaction records (utils/records.py), which
+    use a fraction of the memory and still support dictionary access.
+    """
+    return list(iter_transactions(raw_lines, compact))
+
+def iter_transactions(raw_lines, compact=False):
+    """
+    Streaming version of parse_transactions.
+    Accepts any iterable of lines (e.g. iter_sales_data) and yields dictionaries.
     """
-    parsed_data = []
-    
     for line in raw_lines:
-        parts = line.split('|')
-        
-        # Skip rows with incorrect number of fields (expecting 8)
-        if len(parts) != 8:
-            continue
-            
-        # Unpack and Clean fields
-        try:
-            # Handle commas in numeric fields (e.g., "1,500" -> "1500")
-            qty_str = parts[4].replace(',', '').strip()
-            price_str = parts[5].replace(',', '').strip()
-            
-            # Convert types
-            quantity = int(qty_str)
-            unit_price = float(price_str)
-            
-            # Handle commas in ProductName (replace with space)
-            product_name = parts[3].replace(',', ' ').strip()
-            
-            transaction = {
-                'TransactionID': parts[0].strip(),
-                'Date': parts[1].strip(),
-                'ProductID': parts[2].strip(),
-                'ProductName': product_name,
-                'Quantity': quantity,
-                'UnitPrice': unit_price,
-                'CustomerID': parts[6].strip(),
-                'Region': parts[7].strip()
-            }
-            parsed_data.append(transaction)
-            
-        except ValueError:
-            # Skip if type conversion fails
-            continue
-            
-    return parsed_data
+        transaction = parse_line(line, compact)
+        if transaction is not None:
+            yield transaction
 
 # ==========================================
 # Task 1.3: Data Validation and Filtering
 # ==========================================
-def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
-    """
-    Validates transactions and applies optional filters.
-    Returns: tuple (valid_transactions, invalid_count, filter_summary)
-    """
-    valid_filtered_transactions = []
-    invalid_count = 0
-    
-    # Summary Dictionary
-    summary = {
-        'total_input': len(transactions),
+def new_filter_summary(total_input=0):
+    """Returns an empty validation summary dict."""
+    return {
+        'total_input': total_input,
         'invalid': 0,
         'filtered_by_region': 0,
         'filtered_by_amount': 0,
         'final_count': 0
     }
-    
+
+def is_valid_transaction(t):
+    """Checks ID prefixes and positive quantity/price."""
+    # Check IDs
+    if not t['TransactionID'].startswith('T'): return False
+    if not t['ProductID'].startswith('P'): return False
+    if not t['CustomerID'].startswith('C'): return False
+
+    # Check Values
+    if t['Quantity'] <= 0: return False
+    if t['UnitPrice'] <= 0: return False
+
+    return True
+
+def new_filter_options():
+    """Empty filter-option metadata, filled in by track_filter_options."""
+    return {'regions': set(), 'min_amount': None, 'max_amount': None}
+
+def track_filter_options(transactions, options):
+    """
+    Passes transactions through unchanged while recording the available
+    regions and the amount range in options, so no extra pass is needed.
+    """
+    regions = options['regions']
+    for t in transactions:
+        if t.get('Region'):
+            regions.add(t['Region'])
+
+        amount = t['Quantity'] * t['UnitPrice']
+        if options['min_amount'] is None or amount < options['min_amount']:
+            options['min_amount'] = amount
+        if options['max_amount'] is None or amount > options['max_amount']:
+            options['max_amount'] = amount
+
+        yield t
+
+def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None, filter_options=None,
+                        compact=False, exact=False):
+    """
+    Validates transactions and applies optional filters.
+    Pass filter_options (from track_filter_options) to reuse the region set
+    collected during ingestion instead of scanning again.
+    With compact=True the valid rows are returned as Transaction records.
+    With exact=True the amount filters compare integer paise (no float edge cases).
+    Returns: tuple (valid_transactions, invalid_count, filter_summary)
+    """
+    # Summary Dictionary
+    summary = new_filter_summary()
+
     # 1. Display available options to user
-    available_regions = set(t['Region'] for t in transactions if t.get('Region'))
+    if filter_options is not None:
+        available_regions = filter_options['regions']
+    else:
+        available_regions = set(t['Region'] for t in transactions if t.get('Region'))
     print(f"\n--- Filter Options ---")
     print(f"Available Regions: {sorted(list(available_regions))}")
     if min_amount or max_amount:
         print(f"Amount Range: {min_amount if min_amount else 0} to {max_amount if max_amount else 'Infinity'}")
 
+    valid_filtered_transactions = list(
+        iter_valid_transactions(transactions, region, min_amount, max_amount, summary, exact)
+    )
+    if compact:
+        valid_filtered_transactions = to_records(valid_filtered_transactions)
+
+    return valid_filtered_transactions, summary['invalid'], summary
+
+def iter_valid_transactions(transactions, region=None, min_amount=None, max_amount=None, summary=None,
+                            exact=False):
+    """
+    Streaming version of validate_and_filter.
+    Yields transactions that pass validation and filters. If a summary
+    dictionary is given it is updated in place as the stream is consumed.
+    """
+    if summary is None:
+        summary = new_filter_summary()
+
+    if exact:
+        # Bounds and amounts in integer paise
+        min_amount = to_minor(min_amount) if min_amount is not None else None
+        max_amount = to_minor(max_amount) if max_amount is not None else None
+
     for t in transactions:
+        summary['total_input'] += 1
+
         # --- VALIDATION PHASE ---
-        is_valid = True
-        
-        # Check IDs
-        if not t['TransactionID'].startswith('T'): is_valid = False
-        if not t['ProductID'].startswith('P'): is_valid = False
-        if not t['CustomerID'].startswith('C'): is_valid = False
-        
-        # Check Values
-        if t['Quantity'] <= 0: is_valid = False
-        if t['UnitPrice'] <= 0: is_valid = False
-        
-        if not is_valid:
-            invalid_count += 1
+        if not is_valid_transaction(t):
+            summary['invalid'] += 1
             continue
 
         # --- FILTER PHASE ---
-        
+
         # Region Filter
         if region and t['Region'] != region:
             summary['filtered_by_region'] += 1
             continue
-            
-        # Amount Calculation and Filter
-        total_amount = t['Quantity'] * t['UnitPrice']
-        
+
+        # Amount Calculation and Filter (precomputed on Transaction records)
+        if t.__class__ is Transaction:
+            total_amount = t.amount_minor if exact else t.amount
+        elif exact:
+            total_amount = t['Quantity'] * to_minor(t['UnitPrice'])
+        else:
+            total_amount = t['Quantity'] * t['UnitPrice']
+
         if min_amount is not None and total_amount < min_amount:
             summary['filtered_by_amount'] += 1
             continue
-            
+
         if max_amount is not None and total_amount > max_amount:
             summary['filtered_by_amount'] += 1
             continue
-            
-        # If it passes all checks, add to final list
-        valid_filtered_transactions.append(t)
 
-    # Update Summary stats
-    summary['invalid'] = invalid_count
-    summary['final_count'] = len(valid_filtered_transactions)
-    
-    return valid_filtered_transactions, invalid_count, summary
\ No newline at end of file
+        # If it passes all checks, it goes downstream
+        summary['final_count'] += 1
+        yield t
+
+def stream_valid_transactions(filename, region=None, min_amount=None, max_amount=None, summary=None):
+    """
+    Chains iter_sales_data -> iter_transactions -> iter_valid_transactions.
+    Nothing is materialized; feed the result straight into an aggregator.
+    """
+    raw_lines = iter_sales_data(filename)
+    transactions = iter_transactions(raw_lines)
+    return iter_valid_transactions(transactions, region, min_amount, max_amount, summary)
@@ -0,0 +1,186 @@
+# utils/incremental.py
+import os
+import pickle
+import hashlib
+from collections import OrderedDict
+
+from utils.file_handler import decode_line, detect_encoding, iter_transactions, iter_valid_transactions, new_filter_summary
+from utils.data_processor import SalesAggregator
+
+# ==========================================
+# Task 5.3: Incremental, Checkpointed Aggregation
+# ==========================================
+
+DEFAULT_STATE_PATH = os.path.join('data', '.cache', 'incremental_state.pkl')
+STATE_VERSION = 3
+FINGERPRINT_BYTES = 4096 # leading bytes hashed to detect a replaced file
+DEDUP_WINDOW = 100000 # most recent TransactionIDs remembered for replay detection
+
+def _fingerprint(filename, length):
+    with open(filename, 'rb') as f:
+        return hashlib.sha256(f.read(length)).hexdigest()
+
+def _new_state(filename, encoding):
+    return {
+        'version': STATE_VERSION,
+        'filename': os.path.abspath(filename),
+        'encoding': encoding,
+        'offset': 0, # byte offset just past the last committed line
+        'fingerprint': None,
+        'fingerprint_length': 0,
+        'last_transaction_id': None,
+        'last_date': None,
+        'seen_ids': OrderedDict(), # insertion-ordered, so the oldest IDs are dropped first
+        # Exact sums, so checkpoints never drift however many runs they span
+        'aggregator': SalesAggregator(exact=True),
+        'summary': new_filter_summary(),
+        'duplicates_skipped': 0
+    }
+
+def load_state(state_path=DEFAULT_STATE_PATH):
+    """
+    Loads a saved checkpoint. A corrupt pickle can fail in many ways
+    (missing class, bad opcode, truncation), and every one of them just
+    means rebuilding, so any error is treated as no checkpoint.
+    Returns: state dictionary, or None.
+    """
+    try:
+        with open(state_path, 'rb') as f:
+            state = pickle.load(f)
+    except Exception:
+        return None
+    if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+        return None
+    return state
+
+def save_state(state, state_path=DEFAULT_STATE_PATH):
+    """Writes the checkpoint atomically (temp file + rename)."""
+    os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+    tmp_path = f"{state_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, state_path)
+
+def _state_matches_file(state, filename):
+    """True if the checkpoint belongs to this file and the file was only appended to."""
+    if state['filename'] != os.path.abspath(filename):
+        return False
+    if os.path.getsize(filename) < state['offset']:
+        return False # truncated or rotated
+    if state['fingerprint'] is not None:
+        if _fingerprint(filename, state['fingerprint_length']) != state['fingerprint']:
+            return False # rewritten in place
+    return True
+
+def _iter_new_lines(filename, state):
+    """
+    Yields (line, end_offset, terminated) for the lines after the checkpoint.
+    The header is skipped when starting from the beginning of the file.
+    """
+    with open(filename, 'rb') as f:
+        f.seek(state['offset'])
+        position = state['offset']
+        if position == 0:
+            position += len(f.readline()) # Skip header
+
+        for raw in f:
+            position += len(raw)
+            yield raw, position, raw.endswith(b'\n')
+
+def _iter_committed_lines(filename, state, progress):
+    """
+    Yields the newline-terminated lines after the checkpoint, recording in
+    progress the offset just past the last one and any unterminated tail.
+    """
+    for raw, end_offset, terminated in _iter_new_lines(filename, state):
+        if terminated:
+            progress['offset'] = end_offset
+            yield raw
+        else:
+            progress['tail'] = raw
+
+def _add_new_rows(state, lines, dedup, dedup_window):
+    """Parses, validates and aggregates lines (any iterable) into the state. Returns: rows added."""
+    encoding = state['encoding']
+    aggregator = state['aggregator']
+    seen_ids = state['seen_ids']
+    summary = state['summary']
+    added = 0
+
+    cleaned = (decode_line(line, encoding).strip() for line in lines)
+    transactions = iter_transactions(line for line in cleaned if line)
+
+    for t in iter_valid_transactions(transactions, summary=summary):
+        if dedup:
+            if t['TransactionID'] in seen_ids:
+                state['duplicates_skipped'] += 1
+                summary['final_count'] -= 1 # Passed validation, but not kept
+                continue
+            seen_ids[t['TransactionID']] = None
+            if len(seen_ids) > dedup_window:
+                seen_ids.popitem(last=False)
+
+        aggregator.add(t)
+        state['last_transaction_id'] = t['TransactionID']
+        state['last_date'] = t['Date']
+        added += 1
+
+    return added
+
+def update_incremental(filename, state_path=DEFAULT_STATE_PATH, dedup=True, rebuild=False,
+                       dedup_window=DEDUP_WINDOW):
+    """
+    Brings the saved aggregates up to date with rows appended since the last run.
+
+    Only bytes past the checkpoint offset are read, and lines are streamed
+    straight into the aggregator, so run time follows the size of the delta
+    and memory does not. Replayed TransactionIDs are skipped when dedup is
+    on; the last dedup_window IDs are remembered, which covers a replayed
+    or re-appended recent batch without growing with the file.
+    A missing, mismatched, truncated or rewritten checkpoint triggers a full
+    rebuild, which runs the same code from offset 0, so the incremental and
+    full results are identical.
+
+    A trailing line without a newline may still be being written: the
+    checkpoint is saved with the offset before it, then the line is added
+    to the returned aggregates only.
+
+    Returns: tuple (SalesAggregator, run_info)
+    """
+    if not os.path.exists(filename):
+        print(f"Error: The file '{filename}' was not found.")
+        return SalesAggregator(), {}
+
+    state = None if rebuild else load_state(state_path)
+    full_rebuild = state is None or not _state_matches_file(state, filename)
+
+    if full_rebuild:
+        encoding = detect_encoding(filename)
+        if encoding is None:
+            print("Error: Failed to read file with supported encodings.")
+            return SalesAggregator(), {}
+        state = _new_state(filename, encoding)
+
+    progress = {'offset': state['offset'], 'tail': None}
+    rows_added = _add_new_rows(state, _iter_committed_lines(filename, state, progress), dedup, dedup_window)
+    committed_offset = progress['offset']
+
+    state['offset'] = committed_offset
+    state['fingerprint_length'] = min(committed_offset, FINGERPRINT_BYTES)
+    state['fingerprint'] = _fingerprint(filename, state['fingerprint_length'])
+    save_state(state, state_path)
+
+    if progress['tail'] is not None:
+        # Already checkpointed at committed_offset, so the tail only reaches the returned aggregates
+        rows_added += _add_new_rows(state, [progress['tail']], dedup, dedup_window)
+
+    run_info = {
+        'full_rebuild': full_rebuild,
+        'rows_added': rows_added,
+        'offset': committed_offset,
+        'last_transaction_id': state['last_transaction_id'],
+        'last_date': state['last_date'],
+        'duplicates_skipped': state['duplicates_skipped'],
+        'summary': dict(state['summary'])
+    }
+    return state['aggregator'], run_info
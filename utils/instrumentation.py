@@ -0,0 +1,238 @@
+# utils/instrumentation.py
+import io
+import os
+import sys
+import json
+import time
+import importlib
+from contextlib import contextmanager
+
+try:
+    import resource # Not available on Windows
+except ImportError:
+    resource = None
+
+# ==========================================
+# Task 9.1: Pipeline Instrumentation
+# ==========================================
+
+_active_metrics = None
+
+def set_active_metrics(metrics):
+    """Makes metrics the collector that library hooks (API calls, wrapped functions) report to."""
+    global _active_metrics
+    _active_metrics = metrics
+
+def get_active_metrics():
+    return _active_metrics
+
+def record_api_call(url, seconds, attempts, status):
+    """Hook for API helpers; a no-op unless a PipelineMetrics is active."""
+    if _active_metrics is not None:
+        _active_metrics.record_api_call(url, seconds, attempts, status)
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+class PipelineMetrics:
+    """
+    Collects per-stage timing, row counts, throughput and memory for a run,
+    plus API call latency/retries and wrapped-function timings.
+
+    Usage:
+        with metrics.stage('parse', rows_in=len(raw)) as stage:
+            parsed = parse_transactions(raw)
+            stage['rows_out'] = len(parsed)
+
+    Optional per-stage cProfile (profile=True) and tracemalloc
+    (trace_memory=True) capture. Export with write_json / write_prometheus.
+    """
+
+    def __init__(self, run_name='sales_pipeline', profile=False, trace_memory=False, profile_top=20):
+        self.run_name = run_name
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.profile_top = profile_top
+        self.started_at = time.time()
+        self.stages = []
+        self.api_calls = []
+        self.functions = {} # name -> {'calls', 'seconds'}
+        self.current_stage = None
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        record = {
+            'stage': name,
+            'rows_in': rows_in,
+            'rows_out': None,
+            'status': 'ok',
+            'error': None
+        }
+        self.current_stage = name
+
+        # Profiling modules are only imported when asked for
+        profiler = None
+        if self.profile:
+            import cProfile
+            profiler = cProfile.Profile()
+        tracing = False
+        if self.trace_memory:
+            import tracemalloc
+            tracing = not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        if profiler:
+            profiler.enable()
+        start = time.perf_counter()
+
+        try:
+            yield record
+        except BaseException as e:
+            record['status'] = 'error'
+            record['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            if profiler:
+                import pstats
+                profiler.disable()
+                out = io.StringIO()
+                pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(self.profile_top)
+                record['profile'] = out.getvalue()
+            if tracing:
+                record['traced_peak_bytes'] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+            rows = record['rows_in'] if record['rows_in'] is not None else record['rows_out']
+            record['wall_seconds'] = round(seconds, 6)
+            record['rows_per_sec'] = round(rows / seconds, 1) if rows and seconds > 0 else None
+            record['peak_rss_bytes'] = peak_rss_bytes()
+            self.stages.append(record)
+            self.current_stage = None
+
+    def record_api_call(self, url, seconds, attempts, status):
+        self.api_calls.append({
+            'url': url,
+            'seconds': round(seconds, 6),
+            'attempts': attempts,
+            'retries': max(attempts - 1, 0),
+            'status': status,
+            'stage': self.current_stage
+        })
+
+    def wrap(self, func, name=None):
+        """Returns func wrapped to count calls and time into this collector."""
+        name = name or f"{func.__module__}.{func.__name__}"
+        stats = self.functions.setdefault(name, {'calls': 0, 'seconds': 0.0})
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stats['calls'] += 1
+                stats['seconds'] += time.perf_counter() - start
+
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+    @contextmanager
+    def instrument(self, targets):
+        """
+        Temporarily replaces module-level functions with wrap()ped versions.
+        targets are dotted names ('utils.file_handler.parse_line'). Callers
+        that look the function up in its module at call time are counted;
+        names already imported elsewhere with 'from ... import' are not.
+        Originals are restored on exit.
+        """
+        patched = []
+        try:
+            for target in targets:
+                module_name, attr = target.rsplit('.', 1)
+                module = importlib.import_module(module_name)
+                original = getattr(module, attr)
+                setattr(module, attr, self.wrap(original, target))
+                patched.append((module, attr, original))
+            yield self
+        finally:
+            for module, attr, original in reversed(patched):
+                setattr(module, attr, original)
+
+    # --- Export ---
+
+    def summary(self):
+        failed = [s['stage'] for s in self.stages if s['status'] != 'ok']
+        return {
+            'run': self.run_name,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at)),
+            'total_seconds': round(sum(s['wall_seconds'] for s in self.stages), 6),
+            'status': 'error' if failed else 'ok',
+            'failed_stages': failed,
+            'peak_rss_bytes': peak_rss_bytes(),
+            'stages': self.stages,
+            'api_calls': self.api_calls,
+            'functions': {k: {'calls': v['calls'], 'seconds': round(v['seconds'], 6)} for k, v in self.functions.items()}
+        }
+
+    def write_json(self, path):
+        _atomic_write(path, json.dumps(self.summary(), indent=2))
+
+    def prometheus_text(self):
+        """Metrics in the Prometheus text exposition format (for the node_exporter textfile collector)."""
+        run = self.run_name
+        lines = [
+            '# HELP sales_stage_seconds Wall time per pipeline stage.',
+            '# TYPE sales_stage_seconds gauge',
+        ]
+        for s in self.stages:
+            lines.append(f'sales_stage_seconds{{run="{run}",stage="{s["stage"]}"}} {s["wall_seconds"]}')
+
+        lines += ['# HELP sales_stage_rows_in Rows entering each stage.', '# TYPE sales_stage_rows_in gauge']
+        lines += [f'sales_stage_rows_in{{run="{run}",stage="{s["stage"]}"}} {s["rows_in"]}'
+                  for s in self.stages if s['rows_in'] is not None]
+
+        lines += ['# HELP sales_stage_rows_out Rows leaving each stage.', '# TYPE sales_stage_rows_out gauge']
+        lines += [f'sales_stage_rows_out{{run="{run}",stage="{s["stage"]}"}} {s["rows_out"]}'
+                  for s in self.stages if s['rows_out'] is not None]
+
+        lines += ['# HELP sales_stage_success 1 if the stage completed, 0 if it raised.', '# TYPE sales_stage_success gauge']
+        lines += [f'sales_stage_success{{run="{run}",stage="{s["stage"]}"}} {int(s["status"] == "ok")}'
+                  for s in self.stages]
+
+        lines += [
+            '# HELP sales_api_request_seconds_total Time spent in API requests.',
+            '# TYPE sales_api_request_seconds_total counter',
+            f'sales_api_request_seconds_total{{run="{run}"}} {round(sum(c["seconds"] for c in self.api_calls), 6)}',
+            '# HELP sales_api_requests_total API requests made.',
+            '# TYPE sales_api_requests_total counter',
+            f'sales_api_requests_total{{run="{run}"}} {len(self.api_calls)}',
+            '# HELP sales_api_retries_total API retries made.',
+            '# TYPE sales_api_retries_total counter',
+            f'sales_api_retries_total{{run="{run}"}} {sum(c["retries"] for c in self.api_calls)}',
+        ]
+
+        rss = peak_rss_bytes()
+        if rss is not None:
+            lines += ['# HELP sales_peak_rss_bytes Peak resident memory of the run.', '# TYPE sales_peak_rss_bytes gauge',
+                      f'sales_peak_rss_bytes{{run="{run}"}} {rss}']
+
+        lines += ['# HELP sales_last_run_timestamp_seconds When the run started.', '# TYPE sales_last_run_timestamp_seconds gauge',
+                  f'sales_last_run_timestamp_seconds{{run="{run}"}} {round(self.started_at, 3)}']
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        _atomic_write(path, self.prometheus_text())
+
+def _atomic_write(path, text):
+    # The textfile collector may read at any time, so never expose a half-written file
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
@@ -0,0 +1,84 @@
+# utils/money.py
+from decimal import Decimal, ROUND_HALF_EVEN, InvalidOperation
+
+# ==========================================
+# Task 2.5: Fixed-point Money
+# ==========================================
+
+MINOR_UNITS = 100 # paise per rupee
+CURRENCY_SYMBOL = '₹'
+
+_ONE = Decimal(1)
+_MAX_CACHED = 100000
+_minor_cache = {} # float prices repeat heavily, so their conversions are memoized
+
+def parse_minor(text):
+    """
+    Parses a price or amount string (e.g. '1,500' or '19.999') straight to
+    integer minor units, rounding half-even beyond two decimals. Plain
+    decimal text is handled with int arithmetic; anything else (exponents
+    and the like) goes through Decimal.
+    """
+    cleaned = text.replace(',', '').strip()
+    body = cleaned
+    sign = 1
+    if body[:1] in ('-', '+'):
+        sign = -1 if body[0] == '-' else 1
+        body = body[1:]
+
+    whole, _, frac = body.partition('.')
+    if (whole or frac) and body.isascii() and (not whole or whole.isdigit()) and (not frac or frac.isdigit()):
+        minor = int(whole or 0) * MINOR_UNITS + int(frac[:2].ljust(2, '0'))
+        rest = frac[2:]
+        if rest:
+            half = '5'.ljust(len(rest), '0') # same length, so string order is numeric order
+            if rest > half or (rest == half and minor % 2):
+                minor += 1
+        return sign * minor
+
+    return _decimal_to_minor(cleaned, text)
+
+def _decimal_to_minor(value, original):
+    try:
+        return int((Decimal(value) * MINOR_UNITS).quantize(_ONE, rounding=ROUND_HALF_EVEN))
+    except (InvalidOperation, ValueError, OverflowError, TypeError):
+        raise ValueError(f"Invalid money value: {original!r}") from None
+
+def to_minor(value):
+    """
+    Converts a price or amount (str, int, float or Decimal) to integer
+    minor units (paise), rounding half-even beyond two decimals.
+    Floats go through their shortest repr, so 19.99 becomes exactly 1999
+    rather than 1998.9999... Strings may contain thousands separators.
+    """
+    if isinstance(value, str):
+        return parse_minor(value)
+
+    minor = _minor_cache.get(value)
+    if minor is not None:
+        return minor
+
+    if isinstance(value, int):
+        minor = value * MINOR_UNITS
+    elif isinstance(value, float):
+        minor = parse_minor(repr(float(value)))
+    else:
+        minor = _decimal_to_minor(value, value)
+
+    if len(_minor_cache) < _MAX_CACHED:
+        _minor_cache[value] = minor
+    return minor
+
+def from_minor(minor):
+    """Minor units back to a float amount (the nearest float to the exact value)."""
+    return minor / MINOR_UNITS
+
+def format_money(minor, symbol=CURRENCY_SYMBOL):
+    """Formats minor units exactly, e.g. 123456789 -> '₹1,234,567.89'."""
+    sign = '-' if minor < 0 else ''
+    major, cents = divmod(abs(minor), MINOR_UNITS)
+    return f"{sign}{symbol}{major:,}.{cents:02d}"
+
+def amount_minor(quantity, unit_price):
+    """Exact line amount in minor units."""
+    return quantity * to_minor(unit_price)
@@ -0,0 +1,124 @@
+# utils/parallel.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.file_handler import decode_line, detect_encoding, iter_transactions, iter_valid_transactions, new_filter_summary
+from utils.data_processor import SalesAggregator
+
+# ==========================================
+# Task 5.1: Split Input into Line-aligned Chunks
+# ==========================================
+
+def split_file_chunks(filename, num_chunks):
+    """
+    Splits a sales file into byte ranges that start and end on line boundaries.
+    The header line is excluded from the first chunk.
+    Returns: list of (start, end) byte offsets.
+    """
+    file_size = os.path.getsize(filename)
+
+    with open(filename, 'rb') as file:
+        file.readline() # Skip header
+        data_start = file.tell()
+
+        chunk_size = max((file_size - data_start) // max(num_chunks, 1), 1)
+        boundaries = [data_start]
+
+        for i in range(1, num_chunks):
+            target = data_start + i * chunk_size
+            if target <= boundaries[-1]:
+                continue
+            if target >= file_size:
+                break
+
+            # Move forward to the start of the next full line
+            file.seek(target - 1)
+            file.readline()
+            position = file.tell()
+
+            if boundaries[-1] < position < file_size:
+                boundaries.append(position)
+
+    boundaries.append(file_size)
+    return [(boundaries[i], boundaries[i + 1]) for i in range(len(boundaries) - 1) if boundaries[i] < boundaries[i + 1]]
+
+def _iter_chunk_lines(filename, start, end, encoding):
+    """Yields cleaned lines from one byte range, the same way read_sales_data cleans them."""
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        position = start
+
+        while position < end:
+            line = file.readline()
+            if not line:
+                break
+            position += len(line)
+
+            cleaned_line = decode_line(line, encoding).strip()
+            if cleaned_line:
+                yield cleaned_line
+
+# ==========================================
+# Task 5.2: Parallel Parse, Validate and Aggregate
+# ==========================================
+
+def _aggregate_chunk(args):
+    """Worker: parses, validates and aggregates one chunk into a partial result."""
+    filename, start, end, encoding, region, min_amount, max_amount, exact = args
+
+    summary = new_filter_summary()
+    transactions = iter_transactions(_iter_chunk_lines(filename, start, end, encoding))
+    valid = iter_valid_transactions(transactions, region, min_amount, max_amount, summary, exact)
+    aggregator = SalesAggregator(exact).consume(valid)
+
+    return aggregator, summary
+
+def merge_filter_summaries(summaries):
+    """Adds up per-chunk filter summaries into one."""
+    merged = new_filter_summary()
+    for summary in summaries:
+        for key in merged:
+            merged[key] += summary[key]
+    return merged
+
+def parallel_aggregate(filename, region=None, min_amount=None, max_amount=None,
+                       workers=None, chunks_per_worker=4, encoding=None, exact=False):
+    """
+    Parses, validates and aggregates a sales file across a process pool.
+
+    The file is split into line-aligned byte ranges; each range is handled
+    by a worker with the normal parse_transactions / validate_and_filter
+    rules and returns a partial SalesAggregator. Partials are merged in
+    file order; with exact=True money is summed in integer paise, so the
+    result does not depend on how the file was chunked.
+    Returns: tuple (SalesAggregator, filter_summary)
+    """
+    if not os.path.exists(filename):
+        print(f"Error: The file '{filename}' was not found.")
+        return SalesAggregator(exact), new_filter_summary()
+
+    if encoding is None:
+        encoding = detect_encoding(filename)
+        if encoding is None:
+            print("Error: Failed to read file with supported encodings.")
+            return SalesAggregator(exact), new_filter_summary()
+
+    workers = workers or os.cpu_count() or 1
+    chunks = split_file_chunks(filename, workers * chunks_per_worker)
+    tasks = [(filename, start, end, encoding, region, min_amount, max_amount, exact) for start, end in chunks]
+
+    aggregator = SalesAggregator(exact)
+    summaries = []
+
+    if workers == 1 or len(tasks) <= 1:
+        results = map(_aggregate_chunk, tasks)
+        for partial, summary in results:
+            aggregator.merge(partial)
+            summaries.append(summary)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for partial, summary in pool.map(_aggregate_chunk, tasks):
+                aggregator.merge(partial)
+                summaries.append(summary)
+
+    return aggregator, merge_filter_summaries(summaries)
@@ -0,0 +1,134 @@
+# utils/records.py
+import sys
+
+from utils.money import to_minor
+
+# ==========================================
+# Task 1.5: Compact Transaction Records
+# ==========================================
+
+# Dictionary key -> attribute name
+TRANSACTION_FIELDS = {
+    'TransactionID': 'transaction_id',
+    'Date': 'date',
+    'ProductID': 'product_id',
+    'ProductName': 'product_name',
+    'Quantity': 'quantity',
+    'UnitPrice': 'unit_price',
+    'CustomerID': 'customer_id',
+    'Region': 'region'
+}
+
+_intern = sys.intern
+
+class Transaction:
+    """
+    Compact parsed transaction.
+
+    Fixed slots instead of a per-row dictionary. Repeating strings (date,
+    product, customer, region) are interned, so every row shares a single
+    copy of each. The amount (Quantity * UnitPrice) is computed once as a
+    float; the exact integer paise (amount_minor) only on first use, so
+    runs without exact money never pay for it. It comes from the price's
+    shortest repr (see money.to_minor) unless price_minor is passed.
+
+    Hot loops can read attributes (t.amount, t.region). Existing code can
+    keep using the dictionary interface (t['Quantity'], t.get(), keys(),
+    copy()). copy() returns a plain dict, so code that copies and then
+    adds keys (enrich_sales_data) still works.
+    """
+
+    __slots__ = ('transaction_id', 'date', 'product_id', 'product_name',
+                 'quantity', 'unit_price', 'customer_id', 'region', 'amount', '_amount_minor')
+
+    def __init__(self, transaction_id, date, product_id, product_name,
+                 quantity, unit_price, customer_id, region, price_minor=None):
+        self.transaction_id = transaction_id
+        self.date = _intern(date)
+        self.product_id = _intern(product_id)
+        self.product_name = _intern(product_name)
+        self.quantity = quantity
+        self.unit_price = unit_price
+        self.customer_id = _intern(customer_id)
+        self.region = _intern(region)
+        self.amount = quantity * unit_price
+        self._amount_minor = None if price_minor is None else quantity * price_minor
+
+    @property
+    def amount_minor(self):
+        """Exact amount in paise, computed on first access."""
+        minor = self._amount_minor
+        if minor is None:
+            minor = self._amount_minor = self.quantity * to_minor(self.unit_price)
+        return minor
+
+    @classmethod
+    def from_dict(cls, t):
+        return cls(t['TransactionID'], t['Date'], t['ProductID'], t['ProductName'],
+                   t['Quantity'], t['UnitPrice'], t['CustomerID'], t['Region'])
+
+    # --- Dictionary compatibility ---
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, TRANSACTION_FIELDS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in TRANSACTION_FIELDS:
+            raise KeyError(f"Transaction has no field {key!r}; use copy() for a widened dict")
+        setattr(self, TRANSACTION_FIELDS[key], value)
+        if key in ('Quantity', 'UnitPrice'):
+            self.amount = self.quantity * self.unit_price
+            self._amount_minor = None
+
+    def get(self, key, default=None):
+        attr = TRANSACTION_FIELDS.get(key)
+        return default if attr is None else getattr(self, attr)
+
+    def __contains__(self, key):
+        return key in TRANSACTION_FIELDS
+
+    def keys(self):
+        return TRANSACTION_FIELDS.keys()
+
+    def values(self):
+        return [getattr(self, attr) for attr in TRANSACTION_FIELDS.values()]
+
+    def items(self):
+        return [(key, getattr(self, attr)) for key, attr in TRANSACTION_FIELDS.items()]
+
+    def __iter__(self):
+        return iter(TRANSACTION_FIELDS)
+
+    def __len__(self):
+        return len(TRANSACTION_FIELDS)
+
+    def to_dict(self):
+        """The dictionary parse_transactions returns for this row."""
+        return {key: getattr(self, attr) for key, attr in TRANSACTION_FIELDS.items()}
+
+    copy = to_dict
+
+    def __eq__(self, other):
+        if isinstance(other, Transaction):
+            return self.values() == other.values()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self.values()
+
+    def __setstate__(self, state):
+        Transaction.__init__(self, *state)
+
+    def __repr__(self):
+        return f"Transaction({self.to_dict()!r})"
+
+def to_records(transactions):
+    """Converts parsed dictionaries (or records) to Transaction records."""
+    return [t if isinstance(t, Transaction) else Transaction.from_dict(t) for t in transactions]
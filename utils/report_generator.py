@@ -0,0 +1,347 @@
+# utils/report_generator.py
+import os
+import csv
+import json
+import threading
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from utils.data_processor import SalesAggregator, peak_day
+from utils.money import format_money, to_minor
+
+# ==========================================
+# Task 10.1: Shared Report Context
+# ==========================================
+
+class ReportContext:
+    """
+    Everything the report sections need, computed once.
+
+    The SalesAggregator makes a single pass over the transactions, and the
+    category/brand breakdowns make a single pass over the enriched data.
+    Each derived result (region_wise_sales(), daily_sales_trend(), ...) is
+    memoized, so sections that share a result (e.g. daily trend and peak
+    day) and every output format reuse the same object.
+    """
+
+    def __init__(self, transactions, enriched_transactions, aggregator=None, top_n=5, low_threshold=10):
+        self.aggregator = aggregator if aggregator is not None else SalesAggregator().consume(transactions)
+        self.enriched_transactions = enriched_transactions
+        self.top_n = top_n
+        self.low_threshold = low_threshold
+        self._results = {} # key -> Future
+        self._lock = threading.Lock() # Guards _results only; never held while computing
+
+    def _memo(self, key, compute):
+        """
+        Computes each result once. The first caller for a key computes it;
+        concurrent callers for the same key wait on its Future, while other
+        keys are computed in parallel. A failed result is not cached.
+        """
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = self._results[key] = Future()
+
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as e:
+                with self._lock:
+                    del self._results[key]
+                future.set_exception(e)
+        return future.result()
+
+    def total_revenue(self):
+        return self._memo('total_revenue', self.aggregator.calculate_total_revenue)
+
+    def region_wise_sales(self):
+        return self._memo('region_wise_sales', self.aggregator.region_wise_sales)
+
+    def top_selling_products(self):
+        return self._memo('top_selling_products', lambda: self.aggregator.top_selling_products(self.top_n))
+
+    def customer_analysis(self):
+        return self._memo('customer_analysis', self.aggregator.customer_analysis)
+
+    def daily_sales_trend(self):
+        return self._memo('daily_sales_trend', self.aggregator.daily_sales_trend)
+
+    def peak_sales_day(self):
+        # Derived from the memoized trend rather than aggregator.find_peak_sales_day()
+        return self._memo('peak_sales_day', lambda: peak_day(self.daily_sales_trend()))
+
+    def low_performing_products(self):
+        return self._memo('low_performing_products', lambda: self.aggregator.low_performing_products(self.low_threshold))
+
+    def enrichment_stats(self):
+        return self._memo('enrichment_stats', lambda: enrichment_breakdown(self.enriched_transactions))
+
+def enrichment_breakdown(enriched_transactions):
+    """
+    One pass over enriched rows (dicts or EnrichedTransaction views):
+    match counts, unmatched ProductIDs and revenue per API category / brand.
+    """
+    stats = {'total': 0, 'matched': 0, 'unmatched_products': set(), 'categories': {}, 'brands': {}}
+
+    for t in enriched_transactions:
+        stats['total'] += 1
+        if not t.get('API_Match'):
+            stats['unmatched_products'].add(t['ProductID'])
+            continue
+        stats['matched'] += 1
+
+        amount = t['Quantity'] * t['UnitPrice']
+        for key, field in (('categories', 'API_Category'), ('brands', 'API_Brand')):
+            name = t[field] or 'N/A'
+            group = stats[key].get(name)
+            if group is None:
+                group = stats[key][name] = {'revenue': 0.0, 'transaction_count': 0}
+            group['revenue'] += amount
+            group['transaction_count'] += 1
+
+    return stats
+
+# ==========================================
+# Task 10.2: Report Sections
+# ==========================================
+
+# A section is {'key', 'title', 'notes': [(label, value, kind)],
+# 'columns': [(name, kind)], 'rows': [tuple]}; kind drives text formatting.
+
+def _overview_section(ctx):
+    agg = ctx.aggregator
+    dates = sorted(agg.daily_stats)
+    avg_order = round(ctx.total_revenue() / agg.transaction_count, 2) if agg.transaction_count else 0.0
+    return {
+        'key': 'overall_summary',
+        'title': 'OVERALL SUMMARY',
+        'notes': [
+            ('Total Revenue', ctx.total_revenue(), 'money'),
+            ('Total Transactions', agg.transaction_count, 'int'),
+            ('Average Order Value', avg_order, 'money'),
+            ('Date Range', f"{dates[0]} to {dates[-1]}" if dates else 'N/A', 'text')
+        ],
+        'columns': [],
+        'rows': []
+    }
+
+def _region_section(ctx):
+    rows = []
+    for region, stats in ctx.region_wise_sales().items():
+        avg = round(stats['total_sales'] / stats['transaction_count'], 2)
+        rows.append((region, stats['total_sales'], stats['percentage'], stats['transaction_count'], avg))
+    return {
+        'key': 'region_wise_performance',
+        'title': 'REGION-WISE PERFORMANCE',
+        'notes': [],
+        'columns': [('Region', 'text'), ('Sales', 'money'), ('% of Total', 'pct'),
+                    ('Transactions', 'int'), ('Avg Transaction', 'money')],
+        'rows': rows
+    }
+
+def _top_products_section(ctx):
+    return {
+        'key': 'top_products',
+        'title': f'TOP {ctx.top_n} PRODUCTS',
+        'notes': [],
+        'columns': [('Rank', 'int'), ('Product Name', 'text'), ('Quantity Sold', 'int'), ('Revenue', 'money')],
+        'rows': [(i, name, qty, revenue) for i, (name, qty, revenue) in enumerate(ctx.top_selling_products(), 1)]
+    }
+
+def _top_customers_section(ctx):
+    customers = list(ctx.customer_analysis().items())[:ctx.top_n]
+    return {
+        'key': 'top_customers',
+        'title': f'TOP {ctx.top_n} CUSTOMERS',
+        'notes': [],
+        'columns': [('Rank', 'int'), ('Customer ID', 'text'), ('Total Spent', 'money'),
+                    ('Orders', 'int'), ('Avg Order', 'money')],
+        'rows': [(i, c_id, s['total_spent'], s['purchase_count'], s['avg_order_value'])
+                 for i, (c_id, s) in enumerate(customers, 1)]
+    }
+
+def _daily_trend_section(ctx):
+    return {
+        'key': 'daily_sales_trend',
+        'title': 'DAILY SALES TREND',
+        'notes': [],
+        'columns': [('Date', 'text'), ('Revenue', 'money'), ('Transactions', 'int'), ('Unique Customers', 'int')],
+        'rows': [(date, s['revenue'], s['transaction_count'], s['unique_customers'])
+                 for date, s in ctx.daily_sales_trend().items()]
+    }
+
+def _performance_section(ctx):
+    peak_date, peak_revenue, peak_count = ctx.peak_sales_day()
+    return {
+        'key': 'product_performance',
+        'title': 'PRODUCT PERFORMANCE ANALYSIS',
+        'notes': [
+            ('Best Selling Day', peak_date or 'N/A', 'text'),
+            ('Best Day Revenue', max(peak_revenue, 0.0), 'money'),
+            ('Best Day Transactions', peak_count, 'int'),
+            ('Low Performer Threshold (qty)', ctx.low_threshold, 'int')
+        ],
+        'columns': [('Low Performing Product', 'text'), ('Quantity Sold', 'int'), ('Revenue', 'money')],
+        'rows': ctx.low_performing_products()
+    }
+
+def _breakdown_rows(groups):
+    ordered = sorted(groups.items(), key=lambda item: item[1]['revenue'], reverse=True)
+    return [(name, round(s['revenue'], 2), s['transaction_count']) for name, s in ordered]
+
+def _enrichment_section(ctx):
+    stats = ctx.enrichment_stats()
+    rate = round(stats['matched'] / stats['total'] * 100, 2) if stats['total'] else 0.0
+    return {
+        'key': 'api_enrichment',
+        'title': 'API ENRICHMENT SUMMARY',
+        'notes': [
+            ('Total Transactions Enriched', stats['matched'], 'int'),
+            ('Success Rate', rate, 'pct'),
+            ('Products Not Enriched', ', '.join(sorted(stats['unmatched_products'])) or 'None', 'text')
+        ],
+        'columns': [('API Category', 'text'), ('Revenue', 'money'), ('Transactions', 'int')],
+        'rows': _breakdown_rows(stats['categories'])
+    }
+
+def _brand_section(ctx):
+    return {
+        'key': 'api_brands',
+        'title': 'REVENUE BY BRAND',
+        'notes': [],
+        'columns': [('API Brand', 'text'), ('Revenue', 'money'), ('Transactions', 'int')],
+        'rows': _breakdown_rows(ctx.enrichment_stats()['brands'])
+    }
+
+REPORT_SECTIONS = [
+    _overview_section, _region_section, _top_products_section, _top_customers_section,
+    _daily_trend_section, _performance_section, _enrichment_section, _brand_section
+]
+
+def build_report_sections(ctx, parallel=True, max_workers=4):
+    """Builds every section from the shared context, in report order."""
+    if not parallel:
+        return [build(ctx) for build in REPORT_SECTIONS]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda build: build(ctx), REPORT_SECTIONS))
+
+# ==========================================
+# Task 10.3: Text, JSON and CSV Rendering
+# ==========================================
+
+def _fmt(value, kind):
+    if value is None or value == '':
+        return 'N/A'
+    if kind == 'money':
+        return format_money(to_minor(value))
+    if kind == 'pct':
+        return f"{value:.2f}%"
+    if kind == 'int':
+        return f"{value:,}"
+    return str(value)
+
+def render_text_section(section):
+    lines = [section['title'], '-' * 60]
+
+    for label, value, kind in section['notes']:
+        lines.append(f"{label + ':':<32}{_fmt(value, kind)}")
+
+    if section['columns']:
+        if section['notes']:
+            lines.append('')
+        header = [name for name, _ in section['columns']]
+        cells = [[_fmt(v, kind) for v, (_, kind) in zip(row, section['columns'])] for row in section['rows']]
+        widths = [max([len(header[i])] + [len(r[i]) for r in cells]) for i in range(len(header))]
+
+        lines.append('  '.join(h.ljust(w) for h, w in zip(header, widths)).rstrip())
+        for r in cells:
+            # Text left-aligned, numbers right-aligned
+            lines.append('  '.join(
+                c.ljust(w) if kind == 'text' else c.rjust(w)
+                for c, w, (_, kind) in zip(r, widths, section['columns'])
+            ).rstrip())
+        if not cells:
+            lines.append('(none)')
+
+    return '\n'.join(lines)
+
+def render_text(sections, meta):
+    header = [
+        '=' * 60,
+        f"{'SALES ANALYTICS REPORT':^60}",
+        f"{'Generated: ' + meta['generated_at']:^60}",
+        f"{'Records Processed: ' + format(meta['records_processed'], ','):^60}",
+        '=' * 60
+    ]
+    return '\n'.join(header) + '\n\n' + '\n\n'.join(render_text_section(s) for s in sections) + '\n'
+
+def render_json(sections, meta):
+    report = {'meta': meta}
+    for s in sections:
+        names = [name for name, _ in s['columns']]
+        report[s['key']] = {
+            'title': s['title'],
+            'summary': {label: value for label, value, _ in s['notes']},
+            'rows': [dict(zip(names, row)) for row in s['rows']]
+        }
+    return json.dumps(report, indent=2, ensure_ascii=False)
+
+def write_csv(sections, meta, filename):
+    """One CSV file, sections stacked with a title row and a blank line between them."""
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Generated', meta['generated_at']])
+        writer.writerow(['Records Processed', meta['records_processed']])
+        for s in sections:
+            writer.writerow([])
+            writer.writerow([s['title']])
+            for label, value, _ in s['notes']:
+                writer.writerow([label, value])
+            if s['columns']:
+                writer.writerow([name for name, _ in s['columns']])
+                writer.writerows(s['rows'])
+
+def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt',
+                          formats=('txt',), aggregator=None, parallel=True, top_n=5, low_threshold=10):
+    """
+    Generates the sales report from one shared ReportContext.
+
+    formats may contain 'txt', 'json' and 'csv'. They are all rendered from
+    the same built sections, and the JSON and CSV files sit next to
+    output_file. Pass an existing SalesAggregator (e.g. from run_pipeline)
+    to skip the pass over transactions.
+    Returns: list of written file paths.
+    """
+    ctx = ReportContext(transactions, enriched_transactions, aggregator, top_n, low_threshold)
+    sections = build_report_sections(ctx, parallel=parallel)
+    meta = {
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'records_processed': ctx.aggregator.transaction_count
+    }
+
+    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+    base = os.path.splitext(output_file)[0]
+    written = []
+
+    try:
+        for fmt in formats:
+            path = output_file if fmt == 'txt' else f"{base}.{fmt}"
+            if fmt == 'txt':
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(render_text(sections, meta))
+            elif fmt == 'json':
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(render_json(sections, meta))
+            elif fmt == 'csv':
+                write_csv(sections, meta, path)
+            else:
+                print(f"Warning: Unknown report format '{fmt}', skipping.")
+                continue
+            written.append(path)
+
+    except IOError as e:
+        print(f"Error writing report: {e}")
+
+    return written
@@ -0,0 +1,272 @@
+# utils/rollup_cube.py
+import os
+import pickle
+from bisect import bisect_left, bisect_right
+
+from utils.data_processor import format_region_stats, format_top_products, format_low_performers
+
+# ==========================================
+# Task 5.4: Rollup Cube
+# ==========================================
+
+# Cell key layout; API_Category is only filled when the cube is built with categories
+CUBE_DIMENSIONS = ('Date', 'Region', 'ProductID', 'ProductName', 'API_Category')
+
+# Query keyword -> key position
+_FILTER_FIELDS = {'date': 0, 'region': 1, 'product_id': 2, 'product_name': 3, 'category': 4}
+
+CUBE_VERSION = 1
+
+def _matcher(field, value):
+    """
+    Predicate for one filter. Date takes a value or an inclusive
+    (start, end) tuple, where either end may be None. The other fields take
+    a value or a list/set of values.
+    """
+    if field == 'date' and isinstance(value, tuple):
+        if len(value) != 2:
+            raise ValueError(f"Date range must be a (start, end) tuple, got {value!r}")
+        start, end = value
+        return lambda v: (start is None or v >= start) and (end is None or v <= end)
+    if isinstance(value, (list, set, frozenset, tuple)):
+        allowed = set(value)
+        return lambda v: v in allowed
+    return lambda v: v == value
+
+class RollupCube:
+    """
+    Materialized date x region x product (x API category) rollup.
+
+    Each cell holds [sum(amount), sum(quantity), count]. The cube is built
+    once, e.g. while ingesting or enriching, and can be saved and reloaded.
+    Slices, dices, roll-ups and the data_processor-style results all run over
+    the cells, so their cost depends on the cube size rather than the row count.
+
+    Filters (keyword arguments on every query): date, region, product_id,
+    product_name and category. See _matcher for the accepted values.
+    """
+
+    def __init__(self, include_category=False):
+        self.include_category = include_category
+        self.cells = {} # (date, region, product_id, product_name, category) -> [amount, quantity, count]
+        self.day_customers = {} # date -> set of CustomerIDs, for unfiltered daily trends
+        self.customers_known = True # False once diced on anything but date
+        self._prefix = None # cached date prefix sums
+
+    # --- Building ---
+
+    def add(self, t):
+        key = (t['Date'], t['Region'], t['ProductID'], t['ProductName'],
+               (t.get('API_Category') or 'N/A') if self.include_category else None)
+        qty = t['Quantity']
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = self.cells[key] = [0.0, 0, 0]
+        cell[0] += qty * t['UnitPrice']
+        cell[1] += qty
+        cell[2] += 1
+
+        customers = self.day_customers.get(t['Date'])
+        if customers is None:
+            customers = self.day_customers[t['Date']] = set()
+        customers.add(t['CustomerID'])
+        self._prefix = None
+
+    def consume(self, transactions):
+        """Adds every transaction from an iterable. Returns self."""
+        add = self.add
+        for t in transactions:
+            add(t)
+        return self
+
+    def merge(self, other):
+        """Folds another cube (same include_category) into this one. Returns self."""
+        for key, (amount, qty, count) in other.cells.items():
+            cell = self.cells.setdefault(key, [0.0, 0, 0])
+            cell[0] += amount
+            cell[1] += qty
+            cell[2] += count
+        for date, customers in other.day_customers.items():
+            self.day_customers.setdefault(date, set()).update(customers)
+        self.customers_known = self.customers_known and other.customers_known
+        self._prefix = None
+        return self
+
+    # --- Slice / dice / roll-up ---
+
+    def _iter_cells(self, filters):
+        if not filters:
+            return iter(self.cells.items())
+        unknown = set(filters) - set(_FILTER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown cube filter(s): {', '.join(sorted(unknown))}")
+
+        tests = [(_FILTER_FIELDS[f], _matcher(f, v)) for f, v in filters.items() if v is not None]
+        return ((key, cell) for key, cell in self.cells.items()
+                if all(test(key[i]) for i, test in tests))
+
+    def dice(self, **filters):
+        """Sub-cube of the cells matching every filter."""
+        cube = RollupCube(self.include_category)
+        cube.cells = {key: list(cell) for key, cell in self._iter_cells(filters)}
+        active = {f: v for f, v in filters.items() if v is not None}
+        if self.customers_known and set(active) <= {'date'}:
+            # Customers are kept per date, so a date-only dice stays exact
+            matches = _matcher('date', active['date']) if active else None
+            cube.day_customers = {d: set(c) for d, c in self.day_customers.items()
+                                  if matches is None or matches(d)}
+        else:
+            cube.customers_known = False
+        return cube
+
+    def slice(self, field, value):
+        """Sub-cube with one dimension fixed, e.g. slice('region', 'East')."""
+        return self.dice(**{field: value})
+
+    def rollup(self, by=('region',), **filters):
+        """
+        Aggregates the (filtered) cells up to the given dimensions.
+        Returns: {group: {'revenue', 'quantity', 'transaction_count'}} in first-seen
+        order; group is a value for one dimension, a tuple for several.
+        """
+        positions = [_FILTER_FIELDS[f] for f in by]
+        groups = {}
+
+        for key, (amount, qty, count) in self._iter_cells(filters):
+            group_key = key[positions[0]] if len(positions) == 1 else tuple(key[i] for i in positions)
+            group = groups.get(group_key)
+            if group is None:
+                group = groups[group_key] = {'revenue': 0.0, 'quantity': 0, 'transaction_count': 0}
+            group['revenue'] += amount
+            group['quantity'] += qty
+            group['transaction_count'] += count
+
+        return groups
+
+    def total(self, **filters):
+        """Grand totals over the filtered cells."""
+        totals = {'revenue': 0.0, 'quantity': 0, 'transaction_count': 0}
+        for _, (amount, qty, count) in self._iter_cells(filters):
+            totals['revenue'] += amount
+            totals['quantity'] += qty
+            totals['transaction_count'] += count
+        totals['revenue'] = round(totals['revenue'], 2)
+        return totals
+
+    # --- Date-range prefix sums ---
+
+    def _date_prefix(self):
+        if self._prefix is None:
+            daily = self.rollup(by=('date',))
+            dates = sorted(daily)
+            revenue, quantity, count = [0.0], [0], [0]
+            for d in dates:
+                revenue.append(revenue[-1] + daily[d]['revenue'])
+                quantity.append(quantity[-1] + daily[d]['quantity'])
+                count.append(count[-1] + daily[d]['transaction_count'])
+            self._prefix = (dates, revenue, quantity, count)
+        return self._prefix
+
+    def date_range_totals(self, start=None, end=None, **filters):
+        """
+        Totals for start <= Date <= end (inclusive, either may be None).
+        Unfiltered queries use cached prefix sums, so each is two binary
+        searches. With filters, prefix sums are built over the diced cube.
+        """
+        cube = self.dice(**filters) if filters else self
+        dates, revenue, quantity, count = cube._date_prefix()
+        lo = 0 if start is None else bisect_left(dates, start)
+        hi = len(dates) if end is None else bisect_right(dates, end)
+        hi = max(hi, lo)
+        return {
+            'revenue': round(revenue[hi] - revenue[lo], 2),
+            'quantity': quantity[hi] - quantity[lo],
+            'transaction_count': count[hi] - count[lo]
+        }
+
+    # --- data_processor-style results ---
+
+    def region_wise_sales(self, **filters):
+        groups = self.rollup(by=('region',), **filters)
+        region_stats = {r: {'total_sales': g['revenue'], 'transaction_count': g['transaction_count']}
+                        for r, g in groups.items()}
+        grand_total = round(sum(g['revenue'] for g in groups.values()), 2)
+        return format_region_stats(region_stats, grand_total)
+
+    def _product_stats(self, filters):
+        groups = self.rollup(by=('product_name',), **filters)
+        return {name: {'qty': g['quantity'], 'revenue': g['revenue']} for name, g in groups.items()}
+
+    def top_selling_products(self, n=5, **filters):
+        return format_top_products(self._product_stats(filters), n)
+
+    def low_performing_products(self, threshold=10, **filters):
+        return format_low_performers(self._product_stats(filters), threshold)
+
+    def daily_sales_trend(self, **filters):
+        """
+        Same shape as data_processor.daily_sales_trend. The cube does not
+        hold customers per cell, so unique_customers is None unless the only
+        filter is a date range (on this cube and any it was diced from).
+        """
+        groups = self.rollup(by=('date',), **filters)
+        exact_customers = (self.customers_known
+                           and set(f for f, v in filters.items() if v is not None) <= {'date'})
+
+        final_daily = {}
+        for date in sorted(groups):
+            g = groups[date]
+            final_daily[date] = {
+                'revenue': round(g['revenue'], 2),
+                'transaction_count': g['transaction_count'],
+                'unique_customers': len(self.day_customers.get(date, ())) if exact_customers else None
+            }
+        return final_daily
+
+    # --- Persistence ---
+
+    def save(self, path):
+        """Writes the cube atomically (temp file + rename)."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        state = {
+            'version': CUBE_VERSION,
+            'include_category': self.include_category,
+            'cells': self.cells,
+            'day_customers': self.day_customers,
+            'customers_known': self.customers_known
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a saved cube. Any error while unpickling or a missing field
+        means a corrupt file, which is treated like a missing one.
+        Returns: RollupCube, or None if missing, corrupt or incompatible.
+        """
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+            if not isinstance(state, dict) or state.get('version') != CUBE_VERSION:
+                return None
+            cube = cls(state['include_category'])
+            cube.cells = state['cells']
+            cube.day_customers = state['day_customers']
+            cube.customers_known = state['customers_known']
+        except Exception:
+            return None
+        return cube
+
+def track_cube(transactions, cube):
+    """Passes transactions through unchanged while adding them to cube."""
+    add = cube.add
+    for t in transactions:
+        add(t)
+        yield t
+
+def build_cube(transactions, include_category=False):
+    """Builds a RollupCube in one pass. Use enriched rows for include_category."""
+    return RollupCube(include_category).consume(transactions)
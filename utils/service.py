@@ -0,0 +1,319 @@
+# utils/service.py
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from utils.file_handler import iter_transactions, iter_valid_transactions, new_filter_options, track_filter_options, new_filter_summary
+from utils.data_processor import SalesAggregator
+from utils.batch_runner import variant_report
+from utils.shards import expand_inputs, iter_input_lines
+
+# ==========================================
+# Task 11.1: Warm In-memory Analytics Service
+# ==========================================
+
+# Query functions: name -> (SalesAggregator method, optional integer parameter and default)
+QUERY_FUNCTIONS = {
+    'calculate_total_revenue': (None, None),
+    'region_wise_sales': (None, None),
+    'top_selling_products': ('n', 5),
+    'customer_analysis': (None, None),
+    'daily_sales_trend': (None, None),
+    'find_peak_sales_day': (None, None),
+    'low_performing_products': ('threshold', 10),
+}
+
+def _input_signature(source):
+    """(path, mtime, size) for every input file; changes when any shard changes."""
+    signature = []
+    for path in expand_inputs(source):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+class SalesDataStore:
+    """
+    Keeps the parsed transactions, the product mapping and the unfiltered
+    aggregates in memory and answers validate_and_filter + data_processor
+    queries from them.
+
+    Reloads build a complete new snapshot and swap it in, so queries in
+    flight keep using the old one. Each reload also refreshes the product
+    mapping through the catalog cache. Filtered results and enrichment
+    breakdowns are kept in a small LRU per snapshot.
+    """
+
+    def __init__(self, input_file='data/sales_data.txt', fetch_catalog=True, cache_size=256, exact=False):
+        self.input_file = input_file
+        self.fetch_catalog = fetch_catalog
+        self.cache_size = cache_size
+        self.exact = exact
+        self.snapshot = None
+        self._reload_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self.mapping = {}
+
+    def load(self):
+        """Builds a fresh snapshot from the input. Returns: True if it was swapped in."""
+        with self._reload_lock:
+            start = time.perf_counter()
+            signature = _input_signature(self.input_file)
+            if not signature:
+                print(f"Error: No input found for '{self.input_file}'; keeping the current data.")
+                return False
+
+            filter_options = new_filter_options()
+            summary = new_filter_summary()
+            parsed = track_filter_options(iter_transactions(iter_input_lines(self.input_file), compact=True), filter_options)
+            valid = list(iter_valid_transactions(parsed, summary=summary, exact=self.exact))
+
+            mapping = self.mapping
+            if self.fetch_catalog:
+                from utils.catalog_cache import fetch_catalog_cached # Only the service needs it up front
+                catalog = fetch_catalog_cached() # From disk while fresh, revalidated once the TTL is up
+                if catalog:
+                    mapping = catalog['mapping'] # Otherwise keep the last good mapping
+
+            self.snapshot = {
+                'signature': signature,
+                'loaded_at': time.time(),
+                'load_seconds': round(time.perf_counter() - start, 4),
+                'transactions': valid,
+                'summary': summary,
+                'filter_options': filter_options,
+                'aggregator': SalesAggregator(self.exact).consume(valid),
+                'mapping': mapping,
+                'cache': OrderedDict()
+            }
+            self.mapping = mapping
+            print(f"Loaded {len(valid)} valid transactions from {self.input_file} "
+                  f"in {self.snapshot['load_seconds']}s")
+            return True
+
+    def reload_if_changed(self):
+        """Reloads when any input file's mtime or size changed. Returns: True if reloaded."""
+        if self.snapshot is not None and _input_signature(self.input_file) == self.snapshot['signature']:
+            return False
+        return self.load()
+
+    def watch(self, interval=2.0):
+        """Starts a daemon thread that polls the input and hot-reloads it."""
+        def poll():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.reload_if_changed()
+                except Exception as e:
+                    print(f"Error: Reload failed, keeping the current data. {e}")
+
+        thread = threading.Thread(target=poll, name='sales-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def _filtered(self, snapshot, region, min_amount, max_amount):
+        """(aggregator, summary, rows) for one filter combination, memoized per snapshot."""
+        if region is None and min_amount is None and max_amount is None:
+            return snapshot['aggregator'], snapshot['summary'], snapshot['transactions']
+
+        key = (region, min_amount, max_amount)
+        cached = self._cached(snapshot, key)
+        if cached is not None:
+            return cached
+
+        # Rows in memory are already valid, so only the filters run here
+        summary = dict(snapshot['summary'])
+        filter_summary = new_filter_summary()
+        rows = list(iter_valid_transactions(snapshot['transactions'], region, min_amount, max_amount,
+                                            filter_summary, self.exact))
+        for field in ('filtered_by_region', 'filtered_by_amount'):
+            summary[field] = filter_summary[field]
+        summary['final_count'] = filter_summary['final_count']
+
+        return self._remember(snapshot, key, (SalesAggregator(self.exact).consume(rows), summary, rows))
+
+    def _cached(self, snapshot, key):
+        """Looks key up in the snapshot's LRU. Returns: the result, or None."""
+        cache = snapshot['cache']
+        with self._cache_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        return None
+
+    def _remember(self, snapshot, key, result):
+        """Adds a result to the snapshot's LRU, dropping the oldest beyond cache_size."""
+        cache = snapshot['cache']
+        with self._cache_lock:
+            cache[key] = result
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return result
+
+    def _enrichment(self, snapshot, rows, region, min_amount, max_amount):
+        """API category/brand breakdown of one filter's rows, memoized per snapshot."""
+        key = ('enrichment', region, min_amount, max_amount)
+        cached = self._cached(snapshot, key)
+        if cached is not None:
+            return cached
+
+        from utils.api_handler import iter_enriched
+        from utils.report_generator import enrichment_breakdown
+        stats = enrichment_breakdown(iter_enriched(rows, snapshot['mapping']))
+        stats['unmatched_products'] = sorted(stats['unmatched_products'])
+        return self._remember(snapshot, key, stats)
+
+    def query(self, function='region_wise_sales', region=None, min_amount=None, max_amount=None, **params):
+        """
+        Runs one data_processor function over the filtered data. function may
+        also be 'report' (every result, as in batch mode) or 'enrichment'
+        (API category/brand breakdown).
+        Returns: JSON-ready dictionary. Raises ValueError for bad parameters.
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
+            raise ValueError("No data loaded")
+
+        aggregator, summary, rows = self._filtered(snapshot, region, min_amount, max_amount)
+        response = {'function': function, 'filter_summary': summary}
+
+        if function == 'report':
+            variant = {'name': 'query', 'region': region, 'min_amount': min_amount, 'max_amount': max_amount}
+            response['result'] = variant_report(variant, aggregator, summary,
+                                                top_n=params.get('n', 5), low_threshold=params.get('threshold', 10))
+        elif function == 'enrichment':
+            response['result'] = self._enrichment(snapshot, rows, region, min_amount, max_amount)
+        elif function in QUERY_FUNCTIONS:
+            param, default = QUERY_FUNCTIONS[function]
+            method = getattr(aggregator, function)
+            response['result'] = method(params.get(param, default)) if param else method()
+        else:
+            raise ValueError(f"Unknown function '{function}'")
+
+        return response
+
+    def status(self):
+        snapshot = self.snapshot
+        if snapshot is None:
+            return {'loaded': False}
+        options = snapshot['filter_options']
+        return {
+            'loaded': True,
+            'input': self.input_file,
+            'loaded_at': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(snapshot['loaded_at'])),
+            'load_seconds': snapshot['load_seconds'],
+            'valid_transactions': len(snapshot['transactions']),
+            'filter_summary': snapshot['summary'],
+            'filter_options': {
+                'regions': sorted(options['regions']),
+                'min_amount': options['min_amount'],
+                'max_amount': options['max_amount']
+            },
+            'catalog_products': len(snapshot['mapping']),
+            'functions': sorted(QUERY_FUNCTIONS) + ['enrichment', 'report']
+        }
+
+def _parse_query_params(query_string):
+    """Typed query parameters from a URL query string. Raises ValueError."""
+    raw = {k: v[-1] for k, v in parse_qs(query_string).items()}
+    params = {'function': raw.pop('fn', raw.pop('function', 'region_wise_sales'))}
+
+    if raw.get('region'):
+        params['region'] = raw.pop('region')
+    for field in ('min_amount', 'max_amount'):
+        if raw.get(field):
+            try:
+                params[field] = float(raw.pop(field))
+            except ValueError:
+                raise ValueError(f"{field} must be a number") from None
+    for field in ('n', 'threshold'):
+        if raw.get(field):
+            try:
+                params[field] = int(raw.pop(field))
+            except ValueError:
+                raise ValueError(f"{field} must be an integer") from None
+            if params[field] < 1:
+                raise ValueError(f"{field} must be at least 1")
+    return params
+
+def make_handler(store, quiet=True):
+    """Request handler class bound to a SalesDataStore."""
+
+    class SalesRequestHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            try:
+                if url.path in ('/', '/health'):
+                    self._send_json(200, {'status': 'ok'})
+                elif url.path == '/status':
+                    self._send_json(200, store.status())
+                elif url.path == '/query':
+                    start = time.perf_counter()
+                    response = store.query(**_parse_query_params(url.query))
+                    response['query_ms'] = round((time.perf_counter() - start) * 1000, 3)
+                    self._send_json(200, response)
+                else:
+                    self._send_json(404, {'error': f"Unknown path {url.path}"})
+            except ValueError as e:
+                self._send_json(400, {'error': str(e)})
+            except Exception as e:
+                self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/reload':
+                self._send_json(404, {'error': f"Unknown path {self.path}"})
+                return
+            try:
+                reloaded = store.load()
+            except Exception as e:
+                # e.g. a shard that cannot be read; the current snapshot stays in place
+                self._send_json(500, {'reloaded': False, 'error': f"{type(e).__name__}: {e}", **store.status()})
+                return
+            self._send_json(200 if reloaded else 500, {'reloaded': reloaded, **store.status()})
+
+        def log_message(self, format, *args):
+            if not quiet:
+                super().log_message(format, *args)
+
+    return SalesRequestHandler
+
+def serve(input_file='data/sales_data.txt', host='127.0.0.1', port=8050, poll_interval=2.0,
+          fetch_catalog=True, exact=False, quiet=True):
+    """
+    Loads the data once, then serves JSON queries until interrupted:
+
+        GET  /status                      loaded data, filter options, functions
+        GET  /query?fn=top_selling_products&region=East&min_amount=500&n=3
+        POST /reload                      force a reload
+
+    The input is polled every poll_interval seconds and hot-reloaded when it changes.
+    """
+    store = SalesDataStore(input_file, fetch_catalog=fetch_catalog, exact=exact)
+    if not store.load():
+        return 1
+    if poll_interval:
+        store.watch(poll_interval)
+
+    server = ThreadingHTTPServer((host, port), make_handler(store, quiet))
+    print(f"Serving sales analytics on http://{host}:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        server.server_close()
+    return 0
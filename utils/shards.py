@@ -0,0 +1,193 @@
+# utils/shards.py
+import os
+import io
+import sys
+import bz2
+import glob
+import gzip
+import zlib
+from collections import deque
+
+from utils.file_handler import (
+    decode_line, iter_raw_lines, iter_sales_data, parse_line, iter_transactions, iter_valid_transactions, new_filter_summary
+)
+from utils.data_processor import SalesAggregator
+from utils.parallel import merge_filter_summaries
+
+# ==========================================
+# Task 5.5: Sharded and Compressed Input
+# ==========================================
+
+SHARD_SUFFIXES = ('.txt', '.gz', '.bz2', '.zst')
+COMPRESSED_SUFFIXES = ('.gz', '.bz2', '.zst')
+
+def expand_inputs(source):
+    """
+    Resolves an input spec to an ordered list of shard paths. source may be
+    a file, a directory (every .txt/.gz/.bz2/.zst file in it), a glob
+    pattern, or a list of any of these.
+    """
+    if isinstance(source, (list, tuple)):
+        return [path for item in source for path in expand_inputs(item)]
+
+    if os.path.isdir(source):
+        names = sorted(n for n in os.listdir(source) if n.endswith(SHARD_SUFFIXES))
+        return [os.path.join(source, n) for n in names if os.path.isfile(os.path.join(source, n))]
+    if any(c in source for c in '*?['):
+        return sorted(p for p in glob.glob(source) if os.path.isfile(p))
+    if os.path.isfile(source):
+        return [source]
+
+    print(f"Error: The file '{source}' was not found.")
+    return []
+
+def is_sharded_input(source):
+    """True unless source is a single plain-text file that read_sales_data can handle."""
+    return not (isinstance(source, str) and os.path.isfile(source) and not source.endswith(COMPRESSED_SUFFIXES))
+
+def _open_binary(path):
+    """Opens a shard as a decompressed binary stream, chosen by extension."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    if path.endswith('.bz2'):
+        return bz2.open(path, 'rb')
+    if path.endswith('.zst'):
+        import zstandard # Optional: only needed for .zst shards
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+    return open(path, 'rb')
+
+def _iter_shard_lines(path):
+    """
+    Yields cleaned lines from one shard. Lines are split like
+    iter_sales_data splits them (\n, \r\n or a lone \r) and decoded one at
+    a time with decode_line, so each shard is decompressed once. Each shard may
+    carry its own header row, so the first line is dropped when it does not
+    parse as a transaction.
+    """
+    with _open_binary(path) as file:
+        first = True
+        for raw in iter_raw_lines(file):
+            cleaned_line = decode_line(raw).strip()
+            if not cleaned_line:
+                continue
+            if first:
+                first = False
+                if parse_line(cleaned_line) is None:
+                    continue # Header
+            yield cleaned_line
+
+def _shard_read_errors():
+    """
+    Exceptions raised by a corrupt or truncated archive: OSError (including
+    gzip.BadGzipFile and bz2's invalid data), EOFError, zlib.error and, once
+    a .zst shard has imported it, zstandard.ZstdError.
+    """
+    errors = (OSError, EOFError, zlib.error)
+    zstandard = sys.modules.get('zstandard')
+    if zstandard is not None:
+        errors += (zstandard.ZstdError,)
+    return errors
+
+def _read_shard(path, consume):
+    """
+    Runs consume(lines) over a whole shard. consume must not hand out rows
+    before it returns, so a truncated or corrupt archive never yields part
+    of a shard.
+    Returns: consume's result. Raises OSError if the shard cannot be read;
+    any other error (a bug, not bad data) propagates unchanged.
+    """
+    try:
+        return consume(_iter_shard_lines(path))
+    except ImportError as e:
+        raise OSError(f"Cannot read shard '{path}': zstandard is not installed") from e
+    except _shard_read_errors() as e:
+        raise OSError(f"Failed to read shard '{path}': {e}") from e
+
+def _shard_lines(path):
+    """Worker: decompresses one shard into a list of cleaned lines."""
+    return _read_shard(path, list)
+
+def iter_sharded_lines(source, workers=None):
+    """
+    Streams cleaned raw lines from every shard in order, decompressing on
+    the fly (nothing is written to disk). Drop-in for iter_sales_data.
+    Shards are decompressed concurrently on threads (zlib/bz2 release the
+    GIL) and at most 2 * workers decoded shards are held at a time.
+    Raises OSError for a shard that cannot be read, after the shards before it.
+    """
+    paths = expand_inputs(source)
+    workers = workers or os.cpu_count() or 1
+    for lines in _ordered_map(_shard_lines, paths, workers, use_processes=False):
+        yield from lines
+
+def iter_input_lines(source, encoding=None):
+    """iter_sales_data for a single plain file, iter_sharded_lines for anything else."""
+    if is_sharded_input(source):
+        return iter_sharded_lines(source)
+    return iter_sales_data(source, encoding)
+
+def _ordered_map(func, items, workers, use_processes):
+    """Like executor.map, in input order, but keeps at most 2 * workers results pending."""
+    if workers <= 1 or len(items) <= 1:
+        yield from map(func, items)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with executor_class(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _parse_shard(args):
+    """Worker: decompresses and parses one shard into a list of transactions."""
+    path, compact = args
+    return _read_shard(path, lambda lines: list(iter_transactions(lines, compact)))
+
+def iter_sharded_transactions(source, workers=None, compact=False, use_processes=True):
+    """
+    One merged transaction stream over all shards, in shard order.
+    Shards are decompressed and parsed concurrently (a process pool by
+    default), and only a bounded number of parsed shards is held at a time.
+    Raises OSError for a shard that cannot be read.
+    """
+    paths = expand_inputs(source)
+    workers = workers or os.cpu_count() or 1
+    for transactions in _ordered_map(_parse_shard, [(p, compact) for p in paths], workers, use_processes):
+        yield from transactions
+
+def _aggregate_shard(args):
+    """Worker: parses, validates and aggregates one shard into a partial result."""
+    path, region, min_amount, max_amount, exact = args
+
+    def consume(lines):
+        summary = new_filter_summary()
+        valid = iter_valid_transactions(iter_transactions(lines), region, min_amount, max_amount, summary, exact)
+        return SalesAggregator(exact).consume(valid), summary
+
+    return _read_shard(path, consume)
+
+def sharded_aggregate(source, region=None, min_amount=None, max_amount=None, workers=None, use_processes=True,
+                      exact=False):
+    """
+    Sharded counterpart of parallel_aggregate: each shard is decompressed,
+    parsed, validated and aggregated by a worker, and the partials are merged
+    in shard order.
+    Returns: tuple (SalesAggregator, filter_summary). Raises OSError for a
+    shard that cannot be read.
+    """
+    paths = expand_inputs(source)
+    workers = workers or os.cpu_count() or 1
+    tasks = [(p, region, min_amount, max_amount, exact) for p in paths]
+
+    aggregator = SalesAggregator(exact)
+    summaries = []
+    for partial, summary in _ordered_map(_aggregate_shard, tasks, workers, use_processes):
+        aggregator.merge(partial)
+        summaries.append(summary)
+
+    return aggregator, merge_filter_summaries(summaries)
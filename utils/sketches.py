@@ -0,0 +1,332 @@
+# utils/sketches.py
+import math
+import heapq
+import hashlib
+from array import array
+
+from utils.data_processor import format_region_stats, peak_day
+
+# ==========================================
+# Task 7.1: Probabilistic Sketches
+# ==========================================
+
+def _hash64(value):
+    """Stable 64-bit hash (the same in every process, unlike hash())."""
+    return int.from_bytes(hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest(), 'little')
+
+class HyperLogLog:
+    """
+    Distinct-count estimator using 2**precision one-byte registers.
+
+    Error bound: relative standard error is about 1.04 / sqrt(2**precision)
+    (precision 12 -> 4 KB, ~1.6%; precision 10 -> 1 KB, ~3.3%). Small
+    cardinalities fall back to linear counting and are near exact.
+    Sketches with the same precision merge losslessly.
+    """
+
+    def __init__(self, precision=12):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def add(self, value):
+        h = _hash64(value)
+        index = h & (self.m - 1)
+        rest = h >> self.precision
+        bits = 64 - self.precision
+        # Rank = position of the first 1-bit in the remaining bits
+        rank = bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def count(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+class CountMinSketch:
+    """
+    Frequency estimator for weighted items in a fixed depth x width table.
+
+    Error bound: with width = ceil(e / epsilon) and depth = ceil(ln(1 / delta)),
+    estimate(x) is never below the true total and exceeds it by at most
+    epsilon * (total weight added) with probability at least 1 - delta.
+    """
+
+    def __init__(self, epsilon=0.001, delta=0.01):
+        self.width = int(math.ceil(math.e / epsilon))
+        self.depth = int(math.ceil(math.log(1 / delta)))
+        self.table = [array('d', bytes(8 * self.width)) for _ in range(self.depth)]
+        self.total = 0.0
+
+    def _columns(self, item):
+        # Double hashing: column_i = h1 + i * h2
+        h = _hash64(item)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, item, weight=1):
+        self.total += weight
+        for row, column in zip(self.table, self._columns(item)):
+            row[column] += weight
+
+    def estimate(self, item):
+        return min(row[column] for row, column in zip(self.table, self._columns(item)))
+
+    def merge(self, other):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge sketches with different dimensions")
+        for mine, theirs in zip(self.table, other.table):
+            for i, value in enumerate(theirs):
+                if value:
+                    mine[i] += value
+        self.total += other.total
+        return self
+
+class SpaceSaving:
+    """
+    Weighted heavy-hitters summary holding at most `capacity` items.
+
+    Error bound: each reported weight overestimates the true weight by at
+    most its recorded error, which is at most W / capacity (W = total
+    weight added). Every item whose true weight exceeds W / capacity is
+    guaranteed to be present. Each item also carries a `secondary` total
+    (e.g. revenue alongside quantity), counted only while the item is held.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counters = {} # item -> [weight, error, secondary, count]
+        self._heap = [] # (weight, item); may hold stale entries
+        self.total = 0.0
+
+    def add(self, item, weight=1, secondary=0.0):
+        self.total += weight
+        counter = self.counters.get(item)
+
+        if counter is None:
+            if len(self.counters) < self.capacity:
+                counter = self.counters[item] = [0, 0, 0.0, 0]
+            else:
+                # Replace the current minimum; its weight becomes our error
+                min_weight, min_item = self._pop_min()
+                del self.counters[min_item]
+                counter = self.counters[item] = [min_weight, min_weight, 0.0, 0]
+
+        counter[0] += weight
+        counter[2] += secondary
+        counter[3] += 1
+        heapq.heappush(self._heap, (counter[0], item))
+
+        if len(self._heap) > 4 * self.capacity + 64:
+            self._rebuild_heap()
+
+    def _pop_min(self):
+        while True:
+            weight, item = heapq.heappop(self._heap)
+            counter = self.counters.get(item)
+            if counter is not None and counter[0] == weight:
+                return weight, item
+
+    def _rebuild_heap(self):
+        self._heap = [(c[0], item) for item, c in self.counters.items()]
+        heapq.heapify(self._heap)
+
+    def min_weight(self):
+        """
+        Upper bound on the weight of any item not held: the smallest held
+        weight once the summary is full, 0 while it still has room.
+        """
+        if len(self.counters) < self.capacity or not self.counters:
+            return 0
+        return min(c[0] for c in self.counters.values())
+
+    def merge(self, other):
+        """
+        Combines two summaries (mergeable SpaceSaving). An item held on
+        only one side may still have had up to the other side's min_weight
+        there, so that is added to both its weight and its error; the
+        error bound stays at most (W1 + W2) / capacity.
+        """
+        mine_min, other_min = self.min_weight(), other.min_weight()
+        merged = {}
+        for item in self.counters.keys() | other.counters.keys():
+            mine = self.counters.get(item)
+            theirs = other.counters.get(item)
+            merged[item] = [
+                (mine[0] if mine else mine_min) + (theirs[0] if theirs else other_min),
+                (mine[1] if mine else mine_min) + (theirs[1] if theirs else other_min),
+                (mine[2] if mine else 0.0) + (theirs[2] if theirs else 0.0),
+                (mine[3] if mine else 0) + (theirs[3] if theirs else 0),
+            ]
+        self.counters = merged
+        self.total += other.total
+
+        if len(self.counters) > self.capacity:
+            keep = heapq.nlargest(self.capacity, self.counters.items(), key=lambda kv: kv[1][0])
+            self.counters = dict(keep)
+        self._rebuild_heap()
+        return self
+
+    def top(self, n):
+        """Returns: list of (item, weight, error, secondary, count), heaviest first."""
+        ranked = sorted(self.counters.items(), key=lambda kv: kv[1][0], reverse=True)[:n]
+        return [(item, c[0], c[1], c[2], c[3]) for item, c in ranked]
+
+# ==========================================
+# Task 7.2: Approximate Aggregation Mode
+# ==========================================
+
+class ApproximateAggregator:
+    """
+    Opt-in, fixed-memory counterpart of data_processor.SalesAggregator.
+
+    Exact: total revenue, region totals, and per-day revenue and
+    transaction counts (these are small keyed sums).
+    Approximate, with memory independent of cardinality:
+    - daily unique_customers: one HyperLogLog per day (see HyperLogLog
+      for the error bound)
+    - top_selling_products: SpaceSaving on quantity, with a
+      Count-Min Sketch for point queries on any product
+    - top customers by spend: SpaceSaving on amount
+    """
+
+    def __init__(self, hll_precision=10, product_capacity=1000, customer_capacity=1000,
+                 cms_epsilon=0.001, cms_delta=0.01):
+        self.hll_precision = hll_precision
+        self.total_revenue = 0.0
+        self.transaction_count = 0
+        self.region_stats = {}
+        self.daily_stats = {} # date -> [revenue, count, HyperLogLog]
+        self.all_customers = HyperLogLog(hll_precision)
+        self.products = SpaceSaving(product_capacity)
+        self.product_quantities = CountMinSketch(cms_epsilon, cms_delta)
+        self.customers = SpaceSaving(customer_capacity)
+
+    def add(self, t):
+        qty = t['Quantity']
+        amount = qty * t['UnitPrice']
+        c_id = t['CustomerID']
+
+        self.total_revenue += amount
+        self.transaction_count += 1
+
+        region = self.region_stats.get(t['Region'])
+        if region is None:
+            region = self.region_stats[t['Region']] = {'total_sales': 0.0, 'transaction_count': 0}
+        region['total_sales'] += amount
+        region['transaction_count'] += 1
+
+        day = self.daily_stats.get(t['Date'])
+        if day is None:
+            day = self.daily_stats[t['Date']] = [0.0, 0, HyperLogLog(self.hll_precision)]
+        day[0] += amount
+        day[1] += 1
+        day[2].add(c_id)
+
+        self.all_customers.add(c_id)
+        self.products.add(t['ProductName'], qty, amount)
+        self.product_quantities.add(t['ProductName'], qty)
+        self.customers.add(c_id, amount, amount)
+
+    def consume(self, transactions):
+        add = self.add
+        for t in transactions:
+            add(t)
+        return self
+
+    def merge(self, other):
+        self.total_revenue += other.total_revenue
+        self.transaction_count += other.transaction_count
+
+        for key, stats in other.region_stats.items():
+            mine = self.region_stats.setdefault(key, {'total_sales': 0.0, 'transaction_count': 0})
+            mine['total_sales'] += stats['total_sales']
+            mine['transaction_count'] += stats['transaction_count']
+
+        for date, (revenue, count, hll) in other.daily_stats.items():
+            mine = self.daily_stats.get(date)
+            if mine is None:
+                mine = self.daily_stats[date] = [0.0, 0, HyperLogLog(self.hll_precision)]
+            mine[0] += revenue
+            mine[1] += count
+            mine[2].merge(hll)
+
+        self.all_customers.merge(other.all_customers)
+        self.products.merge(other.products)
+        self.product_quantities.merge(other.product_quantities)
+        self.customers.merge(other.customers)
+        return self
+
+    # --- Results ---
+
+    def calculate_total_revenue(self):
+        return round(self.total_revenue, 2)
+
+    def region_wise_sales(self):
+        return format_region_stats(self.region_stats, self.calculate_total_revenue())
+
+    def daily_sales_trend(self):
+        """Same shape as daily_sales_trend; unique_customers is a HyperLogLog estimate."""
+        final_daily = {}
+        for date in sorted(self.daily_stats):
+            revenue, count, hll = self.daily_stats[date]
+            final_daily[date] = {
+                'revenue': round(revenue, 2),
+                'transaction_count': count,
+                'unique_customers': hll.count()
+            }
+        return final_daily
+
+    def find_peak_sales_day(self):
+        return peak_day(self.daily_sales_trend())
+
+    def unique_customers(self):
+        """Estimated number of distinct customers overall."""
+        return self.all_customers.count()
+
+    def top_selling_products(self, n=5):
+        """
+        Same shape as top_selling_products: (name, qty, revenue). qty may
+        overestimate by up to the item's SpaceSaving error; revenue only
+        covers the period the product was tracked.
+        """
+        return [(name, qty, round(revenue, 2)) for name, qty, _, revenue, _ in self.products.top(n)]
+
+    def estimate_product_quantity(self, product_name):
+        """Count-Min estimate of any product's total quantity (never an underestimate)."""
+        return int(self.product_quantities.estimate(product_name))
+
+    def top_customers(self, n=10):
+        """
+        Highest-spending customers in the customer_analysis shape (without
+        products_bought), plus 'max_error' on total_spent.
+
+        total_spent is the SpaceSaving estimate (true spend is between
+        total_spent - max_error and total_spent). purchase_count and
+        avg_order_value only cover the period the customer was tracked, so
+        the average is taken over tracked spend, not the estimate.
+        """
+        final_stats = {}
+        for c_id, spent, error, tracked_spent, count in self.customers.top(n):
+            final_stats[c_id] = {
+                'total_spent': round(spent, 2),
+                'purchase_count': count,
+                'avg_order_value': round(tracked_spent / count, 2) if count else 0.0,
+                'max_error': round(error, 2)
+            }
+        return final_stats